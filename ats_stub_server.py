@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+ATS Stub Server - Local stand-in for ATS job APIs that serves responses recorded in HAR files
+
+Record a run with `python main.py --har record`, start this server on the har/ directory and
+point the connectors at it with ROTIFER_ATS_BASE_URL=http://127.0.0.1:8765 (requests arrive
+as /<original host>/<original path>).
+"""
+
+import argparse
+import base64
+import json
+from pathlib import Path
+from typing import Dict, Any, Tuple
+from urllib.parse import urlparse
+
+from aiohttp import web
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def load_fixtures(directory: str) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """Recorded responses keyed by (method, host + path + query), last recording wins"""
+    fixtures = {}
+    for path in sorted(Path(directory).glob("*.har")):
+        with open(path, "r", encoding="utf-8") as f:
+            for entry in json.load(f)["log"]["entries"]:
+                url = urlparse(entry["request"]["url"])
+                key = f"/{url.netloc}{url.path}" + (f"?{url.query}" if url.query else "")
+                fixtures[(entry["request"]["method"], key)] = entry["response"]
+    return fixtures
+
+
+def create_app(directory: str) -> web.Application:
+    fixtures = load_fixtures(directory)
+    logger.info(f"Serving {len(fixtures)} recorded responses from {directory}")
+
+    async def handle(request: web.Request) -> web.Response:
+        response = fixtures.get((request.method, request.path_qs))
+        if not response:
+            logger.warning(f"No fixture for {request.method} {request.path_qs}")
+            return web.json_response({"error": "no fixture recorded"}, status=404)
+
+        content = response["content"]
+        body = base64.b64decode(content["text"]) if content.get("encoding") == "base64" \
+            else content.get("text", "").encode("utf-8")
+        return web.Response(status=response["status"], body=body,
+                            content_type=(content.get("mimeType") or "application/json").split(";")[0])
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handle)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded ATS API responses locally")
+    parser.add_argument("--har-dir", default="har", help="Directory of HAR files to serve")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    web.run_app(create_app(args.har_dir), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Profile Benchmark - Cost per page of each browser launch profile
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Dict, Any, List
+
+from tools.browser_watchdog import BrowserWatchdog
+from tools.launch_profiles import LAUNCH_PROFILES
+from tools.web_navigation_tool import WebNavigationTool
+from utils.politeness import configure_politeness
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_URLS = [
+    "https://www.python.org/jobs/",
+    "https://jobs.lever.co/",
+    "https://boards.greenhouse.io/"
+]
+
+
+async def benchmark_profile(profile: str, urls: List[str]) -> Dict[str, Any]:
+    """Launch a profile, load every URL once and measure each load"""
+    # Every run starts cold: no saved cookies/consent from earlier runs and no host pacing left over
+    configure_politeness()
+    web_nav_tool = WebNavigationTool(profile=profile, prewarm_pages=1, state_dir=None)
+
+    started = time.monotonic()
+    await web_nav_tool.initialize()
+    launch_seconds = time.monotonic() - started
+
+    page_seconds = []
+    failures = 0
+    peak_rss_mb = None
+
+    try:
+        for url in urls:
+            async with web_nav_tool.lease_page():
+                started = time.monotonic()
+                result = await web_nav_tool.navigate_to_url(url)
+                if result.get("success"):
+                    await web_nav_tool.get_page_html()
+                    page_seconds.append(time.monotonic() - started)
+                else:
+                    failures += 1
+
+            rss_mb = BrowserWatchdog.rss_mb()
+            if rss_mb is not None:
+                peak_rss_mb = max(peak_rss_mb or 0, rss_mb)
+
+        blocking = web_nav_tool.request_blocker.get_stats() if web_nav_tool.request_blocker else {}
+    finally:
+        await web_nav_tool.cleanup()
+
+    return {
+        "launch_seconds": launch_seconds,
+        "page_seconds": page_seconds,
+        "failures": failures,
+        "blocked_requests": blocking.get("blocked", 0),
+        "estimated_mb_saved": blocking.get("estimated_mb_saved", 0.0),
+        "peak_browser_rss_mb": peak_rss_mb
+    }
+
+
+def summarize(profile: str, runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine one profile's runs into the reported figures"""
+    page_seconds = [seconds for run in runs for seconds in run["page_seconds"]]
+    peaks = [run["peak_browser_rss_mb"] for run in runs if run["peak_browser_rss_mb"] is not None]
+
+    return {
+        "profile": profile,
+        "runs": len(runs),
+        "launch_seconds": round(statistics.mean(run["launch_seconds"] for run in runs), 2),
+        "pages": len(page_seconds),
+        "failures": sum(run["failures"] for run in runs),
+        "mean_page_seconds": round(statistics.mean(page_seconds), 2) if page_seconds else None,
+        "p90_page_seconds": round(sorted(page_seconds)[int(0.9 * (len(page_seconds) - 1))], 2) if page_seconds else None,
+        "blocked_requests": sum(run["blocked_requests"] for run in runs),
+        "estimated_mb_saved": round(sum(run["estimated_mb_saved"] for run in runs), 2),
+        "peak_browser_rss_mb": max(peaks) if peaks else None
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark browser launch profiles")
+    parser.add_argument("--profiles", nargs="+", default=list(LAUNCH_PROFILES), choices=list(LAUNCH_PROFILES))
+    parser.add_argument("--urls", nargs="+", default=DEFAULT_URLS)
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Rounds; each launches every profile once and loads each URL once")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    runs = {profile: [] for profile in args.profiles}
+    for round_index in range(args.repeat):
+        # Alternate the order so no profile always pays for (or profits from) going first
+        order = args.profiles if round_index % 2 == 0 else list(reversed(args.profiles))
+        for profile in order:
+            logger.info(f"Benchmarking profile '{profile}' (round {round_index + 1}/{args.repeat})")
+            runs[profile].append(await benchmark_profile(profile, args.urls))
+
+    results = [summarize(profile, runs[profile]) for profile in args.profiles]
+
+    print(f"\n{'profile':<12} {'launch s':>9} {'mean s/page':>12} {'p90 s/page':>11} {'blocked':>8} {'MB saved':>9} {'peak RSS MB':>12}")
+    for result in results:
+        print(f"{result['profile']:<12} {result['launch_seconds']:>9} {str(result['mean_page_seconds']):>12} "
+              f"{str(result['p90_page_seconds']):>11} {result['blocked_requests']:>8} "
+              f"{result['estimated_mb_saved']:>9} {str(result['peak_browser_rss_mb']):>12}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
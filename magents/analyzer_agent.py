@@ -3,11 +3,13 @@ Analyzer Agent - HTML analysis and decision making using OpenAI Agents SDK
 """
 
 import asyncio
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from agents import Agent, function_tool
 from tools.html_scraping_tool import HTMLScrapingTool
 from tools.job_matching_tool import JobMatchingTool
+from utils.deadline import current_deadline
+from utils.llm_client import get_llm_client
 from utils.logger import setup_logger
 from bs4 import BeautifulSoup
 import re
@@ -131,14 +133,31 @@ class AnalyzerAgent(Agent):
             logger.error(f"Careers link finding failed: {str(e)}")
             return {"success": False, "error": str(e)}
             
-    async def extract_job_links(self, html_content: str, job_params: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract job links using LLM analysis instead of selectors"""
+    async def find_careers_candidates(self, html_content: str, context: Dict[str, Any], top_k: int = 3) -> Dict[str, Any]:
+        """Rank several careers page candidates from homepage HTML"""
+        logger.info(f"Analyzer Agent ranking top {top_k} careers candidates")
+        
+        try:
+            return await self.job_matching_tool.find_careers_candidates(
+                html_content,
+                context.get("base_url", ""),
+                top_k
+            )
+            
+        except Exception as e:
+            logger.error(f"Careers candidate ranking failed: {str(e)}")
+            return {"success": False, "error": str(e)}
+            
+    async def extract_job_links(self, html_content: str, job_params: Dict[str, Any],
+                                seen: Optional[set] = None) -> Dict[str, Any]:
+        """Extract job links using LLM analysis instead of selectors (seen: content already analyzed)"""
         logger.info("Analyzer Agent extracting job links with LLM")
         
         try:
             # Use LLM-powered extraction instead of selectors
             job_listings_result = await self.scraping_tool.extract_job_listings_with_llm(
-                job_params["job_title"]
+                job_params["job_title"],
+                seen
             )
             
             if job_listings_result.get("success") and job_listings_result.get("job_listings"):
@@ -246,9 +265,7 @@ class AnalyzerAgent(Agent):
 
     async def _analyze_careers_page_heuristic(self, data):
         """Use GPT to analyze careers page and decide action"""
-        from openai import AsyncOpenAI
-        
-        client = AsyncOpenAI()
+        client = get_llm_client()
         
         job_title = data['job_title']
         page_preview = data['page_preview']
@@ -281,7 +298,8 @@ class AnalyzerAgent(Agent):
             response = await client.chat.completions.create(
                 model="gpt-5-nano",
                 messages=[{"role": "user", "content": prompt}],
-                temperature=1
+                temperature=1,
+                timeout=current_deadline().timeout(60)
             )
             
             import json
@@ -4,7 +4,8 @@ Lead Agent - Main orchestrator using OpenAI Agents SDK
 
 import asyncio
 import json
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Optional
 
 from agents import Agent, function_tool
 from magents.web_agent import WebAgent
@@ -13,10 +14,24 @@ from tools.web_navigation_tool import WebNavigationTool
 from tools.html_scraping_tool import HTMLScrapingTool
 from tools.search_tool import SearchTool
 from tools.job_matching_tool import JobMatchingTool
+from tools.http_fetch_tool import HTTPFetchTool
+from tools.ats_connector_tool import ATSConnectorTool
+from tools.listing_crawler import ListingCrawler
+from utils.checkpoint_store import CheckpointStore
+from utils.deadline import Deadline, DeadlineExceeded, current_deadline, deadline_scope
+from utils.har_archive import get_har_archive, har_scope
+from utils.hedging import HedgePolicy, hedge_slots
 from utils.logger import setup_logger
+from utils.search_template_store import SearchTemplateStore
 
 logger = setup_logger(__name__)
 
+# A posting page counts as loaded once one of these is present
+POSTING_READY_SELECTORS = [
+    "[class*='job-description']", "[class*='jobDescription']", "[class*='posting']",
+    "[data-automation-id='jobPostingDescription']", "script[type='application/ld+json']"
+]
+
 # Define tools as functions for the Lead Agent
 @function_tool
 def coordinate_company_search(company_name: str) -> str:
@@ -34,7 +49,7 @@ def coordinate_page_analysis(page_type: str, content: str) -> str:
     return f"Analyzing {page_type} page content"
 
 class LeadAgent(Agent):
-    def __init__(self):
+    def __init__(self, shared_browser=None, page_pool_size: Optional[int] = None, browser_host=None):
         super().__init__(
             name="JobScrapingLeadAgent",
             instructions="""
@@ -65,27 +80,98 @@ class LeadAgent(Agent):
         self.scraping_tool = None
         self.search_tool = None
         self.job_matching_tool = None
+        self.http_fetch_tool = None
+        self.ats_tool = None
+        
+        # Browser shared across LeadAgents in batch mode (None = launch our own); its host
+        # WebNavigationTool relaunches it if it crashes
+        self.shared_browser = shared_browser
+        self.browser_host = browser_host
+        
+        # Fan-out limits for scraping matched postings
+        self.max_parallel_postings = 4
+        self.max_parallel_extractions = 8
+        
+        # Careers candidates probed side by side; the first one that validates wins
+        self.max_careers_probes = 3
+        
+        # Postings are fetched over plain HTTP first; JS-rendered domains go to the browser
+        self.http_first = True
+        
+        # Posting fetches slower than the recent p90 get a plain HTTP backup attempt
+        self.hedge_postings = True
+        self.posting_hedge = HedgePolicy(percentile=0.9)
+        # Posting fan-out plus headroom for hedged browser backups, which lease a page of their own
+        self.page_pool_size = page_pool_size or self.max_parallel_postings + hedge_slots(self.max_parallel_postings)
+        
+        # Workflow checkpointing; resume=True picks up where a previous run stopped
+        self.checkpoint_store = None
+        self.resume = False
+        
+        # End-to-end time budget per request in seconds (None = unbounded)
+        self.request_budget_seconds = None
+        
+        # Launch the browser on first navigation instead of in initialize()
+        self.lazy_browser = True
+        
+        # Browser launch profile (None = --profile / ROTIFER_PROFILE / debug); it also decides request blocking
+        self.launch_profile = None
+        self.block_requests = None
+        
+        # Use job lists from the page's XHR/fetch JSON instead of HTML + LLM extraction when present
+        self.use_json_feeds = True
+        
+        # Careers sites on a known ATS (Greenhouse, Lever, Workday, ...) are read through its JSON API
+        self.use_ats_connectors = True
+        
+        # Listing pages followed through pagination, "load more" and infinite scroll (1 = first page only)
+        self.max_listing_pages = 10
+        self.listing_crawler = None
+        
+        # Per-domain cookies, localStorage and consent results kept across runs (None disables)
+        self.browser_state_dir = "browser_state"
+        
+        # On-site search results URL patterns learned per domain, reused for any job title (None disables)
+        self.search_template_file = "search_templates.json"
+        self.startup_timings = {}
         
     async def initialize(self):
         """Initialize all agents and tools using OpenAI Agents SDK"""
         logger.info("Initializing Lead Agent with OpenAI Agents SDK")
         
         # Initialize tools first
-        self.web_nav_tool = WebNavigationTool()
+        self.web_nav_tool = WebNavigationTool(
+            browser=self.shared_browser,
+            browser_host=self.browser_host,
+            pool_size=self.page_pool_size,
+            block_requests=self.block_requests,
+            profile=self.launch_profile,
+            state_dir=self.browser_state_dir
+        )
         self.scraping_tool = HTMLScrapingTool()
         self.search_tool = SearchTool()
         self.job_matching_tool = JobMatchingTool()
-        
-        await self.web_nav_tool.initialize()
-        await self.scraping_tool.initialize()
-        await self.search_tool.initialize()
-        await self.job_matching_tool.initialize()
+        self.http_fetch_tool = HTTPFetchTool()
+        self.ats_tool = ATSConnectorTool()
+        self.listing_crawler = ListingCrawler(self.web_nav_tool, max_steps=self.max_listing_pages - 1)
+        
+        # Tools are independent, so they start concurrently
+        started = time.monotonic()
+        await asyncio.gather(
+            self._timed_init("web_nav_tool", self.web_nav_tool.initialize(lazy=self.lazy_browser)),
+            self._timed_init("scraping_tool", self.scraping_tool.initialize()),
+            self._timed_init("search_tool", self.search_tool.initialize()),
+            self._timed_init("job_matching_tool", self.job_matching_tool.initialize()),
+            self._timed_init("http_fetch_tool", self.http_fetch_tool.initialize()),
+            self._timed_init("ats_tool", self.ats_tool.initialize())
+        )
         
         # Initialize sub-agents with tools
         self.web_agent = WebAgent(
             web_nav_tool=self.web_nav_tool,
             scraping_tool=self.scraping_tool,
-            search_tool=self.search_tool
+            search_tool=self.search_tool,
+            search_templates=SearchTemplateStore(self.search_template_file) if self.search_template_file else None
         )
         
         self.analyzer_agent = AnalyzerAgent(
@@ -96,32 +182,107 @@ class LeadAgent(Agent):
         await self.web_agent.initialize()
         await self.analyzer_agent.initialize()
         
-        logger.info("All agents and tools initialized successfully")
+        self.startup_timings["total"] = round(time.monotonic() - started, 2)
+        logger.info(f"All agents and tools initialized successfully (startup timings: {self.startup_timings})")
+        
+    async def _timed_init(self, name: str, init):
+        """Await a tool's initialize() and record how long it took"""
+        started = time.monotonic()
+        await init
+        self.startup_timings[name] = round(time.monotonic() - started, 2)
+        
+    def get_startup_timings(self) -> Dict[str, Any]:
+        """Startup timings in seconds, including the browser launch once it has happened"""
+        timings = dict(self.startup_timings)
+        if self.web_nav_tool and self.web_nav_tool.startup_seconds is not None:
+            timings["browser"] = self.web_nav_tool.startup_seconds
+        return timings
         
-    async def process_job_request(self, job_params: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_job_request(self, job_params: Dict[str, Any],
+                                  budget_seconds: Optional[float] = None) -> Dict[str, Any]:
         """Process job scraping request by coordinating agents"""
         logger.info(f"Lead Agent processing job request: {job_params}")
         
-        try:
-            # Step 1: Determine company URL
-            logger.info("Step 1: Determining company URL")
-            company_url = await self._get_company_url(job_params)
+        checkpoint = self._start_checkpoint(job_params)
+        if checkpoint.get("result"):
+            logger.info("Request already completed in a previous run, returning checkpointed result")
+            return checkpoint["result"]
             
-            # Step 2: Find careers page
-            logger.info("Step 2: Finding careers page")
-            careers_url = await self._find_careers_page(company_url)
+        deadline = Deadline(budget_seconds if budget_seconds is not None else self.request_budget_seconds)
+        har_key = CheckpointStore.request_key(job_params)
+        try:
+            with deadline_scope(deadline), har_scope(har_key):
+                return await self._run_workflow(job_params, checkpoint, deadline)
+        finally:
+            self._save_har(har_key)
             
-            # Step 3: Navigate to careers and analyze page structure
-            logger.info("Step 3: Analyzing careers page structure")
-            careers_analysis = await self._analyze_careers_page(careers_url, job_params)
+    def _save_har(self, har_key: str):
+        """Write the request's recorded traffic and release what the archive held for it"""
+        har_archive = get_har_archive()
+        if har_archive:
+            har_archive.finish(har_key)
             
-            # Step 4: Find job listings
-            logger.info("Step 4: Finding job listings")
-            job_listings_url = await self._find_job_listings(careers_analysis, job_params)
+    async def _run_workflow(self, job_params: Dict[str, Any], checkpoint: Dict[str, Any],
+                            deadline: Deadline) -> Dict[str, Any]:
+        """Run workflow steps 1-5 within the request's deadline"""
+        steps = checkpoint["workflow_steps"]
+        
+        try:
+            if steps.get("job_listings_url"):
+                logger.info("Resuming from checkpoint: skipping steps 1-4")
+                company_url = steps.get("company_url")
+                careers_url = steps.get("careers_url")
+                job_listings_url = steps["job_listings_url"]
+                
+                # Matches are re-collected from the listings page unless they were checkpointed too
+                if checkpoint.get("matches") is None:
+                    await deadline.run(self.web_agent.navigate_to_url(job_listings_url), "job listings navigation")
+            else:
+                # Step 1: Determine company URL
+                if steps.get("company_url"):
+                    logger.info("Step 1: Using checkpointed company URL")
+                    company_url = steps["company_url"]
+                else:
+                    logger.info("Step 1: Determining company URL")
+                    company_url = await deadline.run(self._get_company_url(job_params), "company URL lookup")
+                    self._record_step(checkpoint, "company_url", company_url)
+                
+                # Step 2: Find careers page
+                if steps.get("careers_url"):
+                    logger.info("Step 2: Using checkpointed careers URL")
+                    careers_url = steps["careers_url"]
+                else:
+                    logger.info("Step 2: Finding careers page")
+                    careers_url = await deadline.run(self._find_careers_page(company_url), "careers page search")
+                    self._record_step(checkpoint, "careers_url", careers_url)
+                    
+                # ATS-backed careers sites are matched straight from the platform API, skipping steps 3-4
+                job_listings_url = None
+                if self.use_ats_connectors:
+                    job_listings_url = await deadline.run(self._match_via_ats(careers_url, job_params, checkpoint), "ATS lookup")
+                    
+                if job_listings_url:
+                    self._record_step(checkpoint, "job_listings_url", job_listings_url)
+                else:
+                    # Step 3: Navigate to careers and analyze page structure
+                    logger.info("Step 3: Analyzing careers page structure")
+                    careers_analysis = await deadline.run(
+                        self._analyze_careers_page(careers_url, job_params, checkpoint), "careers page analysis"
+                    )
+                    
+                    if careers_analysis.get("ats_board_url"):
+                        job_listings_url = careers_analysis["ats_board_url"]
+                    else:
+                        # Step 4: Find job listings
+                        logger.info("Step 4: Finding job listings")
+                        job_listings_url = await deadline.run(
+                            self._find_job_listings(careers_analysis, job_params), "job listings search"
+                        )
+                    self._record_step(checkpoint, "job_listings_url", job_listings_url)
             
             # Step 5: Find specific job match
             logger.info("Step 5: Finding all specific job matches")
-            scraped_jobs = await self._find_and_scrape_all_jobs(job_listings_url, job_params)
+            scraped_jobs = await self._find_and_scrape_all_jobs(job_listings_url, job_params, checkpoint)
             
             # Compile final results
             result = {
@@ -137,10 +298,18 @@ class LeadAgent(Agent):
                 "timestamp": asyncio.get_event_loop().time()
             }
             
+            checkpoint["result"] = result
+            self._save_checkpoint(checkpoint)
+            
             logger.info("Job scraping workflow completed successfully")
             return result
             
         except Exception as e:
+            # Steps swallow their own errors, so an expired deadline may surface as any exception
+            if isinstance(e, DeadlineExceeded) or deadline.expired:
+                logger.warning(f"Request ran out of time after {deadline.elapsed():.1f}s: {str(e)}")
+                return self._partial_result(job_params, checkpoint, str(e))
+                
             logger.error(f"Lead Agent error: {str(e)}")
             return {
                 "success": False,
@@ -149,6 +318,50 @@ class LeadAgent(Agent):
                 "timestamp": asyncio.get_event_loop().time()
             }
             
+    def _partial_result(self, job_params: Dict[str, Any], checkpoint: Dict[str, Any], error: str) -> Dict[str, Any]:
+        """Result for a request that ran out of budget, with whatever it scraped so far"""
+        scraped_jobs = sorted(checkpoint["postings"].values(), key=lambda job_data: job_data["scrape_order"])
+        return {
+            "success": False,
+            "partial": True,
+            "error": error,
+            "job_params": job_params,
+            "workflow_steps": dict(checkpoint["workflow_steps"]),
+            "jobs_found": len(scraped_jobs),
+            "all_job_data": scraped_jobs,
+            "timestamp": asyncio.get_event_loop().time()
+        }
+        
+    def _start_checkpoint(self, job_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Load the request's checkpoint when resuming, otherwise start a fresh one"""
+        if not self.checkpoint_store:
+            return {"workflow_steps": {}, "matches": None, "postings": {}, "result": None}
+            
+        checkpoint = self.checkpoint_store.load(job_params) if self.resume else None
+        if checkpoint:
+            logger.info(f"Resuming request from checkpoint {checkpoint['key']} "
+                        f"({len(checkpoint['postings'])} postings already scraped)")
+            return checkpoint
+            
+        checkpoint = self.checkpoint_store.new_checkpoint(job_params)
+        self.checkpoint_store.save(checkpoint)
+        return checkpoint
+        
+    def _save_checkpoint(self, checkpoint: Dict[str, Any]):
+        """Persist a checkpoint if checkpointing is enabled"""
+        if self.checkpoint_store and "key" in checkpoint:
+            self.checkpoint_store.save(checkpoint)
+            
+    def _record_step(self, checkpoint: Dict[str, Any], step: str, value: Any):
+        """Record a completed workflow step"""
+        checkpoint["workflow_steps"][step] = value
+        self._save_checkpoint(checkpoint)
+        
+    def _record_posting(self, checkpoint: Dict[str, Any], job_data: Dict[str, Any]):
+        """Record a scraped posting so a resumed run skips it"""
+        checkpoint["postings"][job_data["job_url"]] = job_data
+        self._save_checkpoint(checkpoint)
+            
     async def _get_company_url(self, job_params: Dict[str, Any]) -> str:
         """Get company URL using Web Agent"""
         if job_params.get("company_domain"):
@@ -170,6 +383,23 @@ class LeadAgent(Agent):
         # Get page content using Web Agent
         page_content = await self.web_agent.scrape_current_page()
         
+        # Rank several candidates instead of committing to the single best link
+        candidates_result = await self.analyzer_agent.find_careers_candidates(
+            page_content["html_content"],
+            {"base_url": company_url},
+            self.max_careers_probes
+        )
+        candidates = candidates_result.get("candidates") or []
+        
+        if len(candidates) > 1:
+            careers_url = await self._probe_careers_candidates(candidates)
+            if careers_url:
+                return careers_url
+            logger.warning("No careers candidate validated, using the best ranked one")
+            
+        if candidates:
+            return candidates[0]["url"]
+            
         # Analyze content to find careers link using Analyzer Agent
         careers_analysis = await self.analyzer_agent.find_careers_link(
             page_content["html_content"], 
@@ -178,14 +408,90 @@ class LeadAgent(Agent):
         
         return careers_analysis["careers_url"]
         
-    async def _analyze_careers_page(self, careers_url: str, job_params: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze careers page structure"""
+    async def _probe_careers_candidates(self, candidates: List[Dict[str, Any]]) -> Optional[str]:
+        """Load careers candidates concurrently and return the first that looks like a careers page"""
+        logger.info(f"Probing {len(candidates)} careers candidates: {[c['url'] for c in candidates]}")
+        
+        async def probe(candidate: Dict[str, Any]):
+            async with self.web_nav_tool.lease_page():
+                nav_result = await self.web_agent.navigate_to_url(candidate["url"])
+                if not nav_result.get("success"):
+                    return candidate, False
+                page_content = await self.web_agent.scrape_current_page()
+                
+            if not page_content.get("success"):
+                return candidate, False
+                
+            validation = await self.analyzer_agent.is_job_listings_page(page_content["html_content"])
+            return candidate, validation.get("contains_job_listings", False)
+            
+        probes = [asyncio.ensure_future(probe(candidate)) for candidate in candidates]
+        try:
+            for finished in asyncio.as_completed(probes):
+                try:
+                    candidate, valid = await finished
+                except Exception as e:
+                    logger.warning(f"Careers candidate probe failed: {str(e)}")
+                    continue
+                    
+                if valid:
+                    logger.info(f"Careers candidate validated: {candidate['url']} (score {candidate['score']})")
+                    return candidate["url"]
+                logger.info(f"Careers candidate rejected: {candidate['url']}")
+        finally:
+            # Losers are cancelled; their leased pages go back to the pool
+            for task in probes:
+                task.cancel()
+            await asyncio.gather(*probes, return_exceptions=True)
+            
+        return None
+        
+    async def _match_via_ats(self, careers_url: str, job_params: Dict[str, Any], checkpoint: Dict[str, Any],
+                             html_content: Optional[str] = None, final_url: Optional[str] = None) -> Optional[str]:
+        """Match postings through the careers site's ATS API; returns the board URL, or None to use the browser
+        
+        Without html_content only the careers URL is fingerprinted (no request is made).
+        """
+        detection = await self.ats_tool.detect_platform(careers_url, html_content, final_url)
+        if not detection.get("success"):
+            return None
+            
+        listing = await self.ats_tool.search_jobs(detection["platform_info"], job_params["job_title"])
+        if not listing.get("success") or not listing["jobs"]:
+            logger.info(f"{detection['platform']} API gave no jobs ({listing.get('error')}), using the browser")
+            return None
+            
+        all_matches = await self.analyzer_agent.find_all_job_matches(listing["jobs"], job_params)
+        if not all_matches.get("matches"):
+            logger.info(f"None of the {len(listing['jobs'])} {detection['platform']} API jobs matched, using the browser")
+            return None
+            
+        logger.info(f"Found {len(all_matches['matches'])} matching jobs through the {detection['platform']} API")
+        checkpoint["matches"] = all_matches["matches"]
+        self._save_checkpoint(checkpoint)
+        return listing["board_url"]
+        
+    async def _analyze_careers_page(self, careers_url: str, job_params: Dict[str, Any],
+                                    checkpoint: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Analyze careers page structure
+        
+        With a checkpoint, an ATS embedded in the loaded page is tried first; its board URL is
+        returned as "ats_board_url" with the matches stored in the checkpoint.
+        """
         # Navigate to careers page
         await self.web_agent.navigate_to_url(careers_url)
         
         # Scrape careers page
         page_content = await self.web_agent.scrape_current_page()
         
+        # The careers URL alone was fingerprinted already; a hosted board it maps to is not retried here
+        if checkpoint is not None and self.use_ats_connectors and page_content.get("success") \
+                and not self.ats_tool.url_platform(careers_url):
+            board_url = await self._match_via_ats(careers_url, job_params, checkpoint,
+                                                  page_content["html_content"], self.web_nav_tool.current_url)
+            if board_url:
+                return {"ats_board_url": board_url, "careers_url": careers_url}
+        
         # Analyze page structure
         analysis = await self.analyzer_agent.analyze_page_structure(
             page_content["html_content"],
@@ -234,87 +540,215 @@ class LeadAgent(Agent):
             # Fallback: analyze all links
             return await self._fallback_link_analysis(page_content, job_params)
             
-    async def _find_and_scrape_all_jobs(self, job_listings_url: str, job_params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def _find_and_scrape_all_jobs(self, job_listings_url: str, job_params: Dict[str, Any],
+                                        checkpoint: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Find and scrape ALL matching job postings"""
-
-        scraped_jobs = []
-        visited_urls = set()  # Track visited pages
+        checkpoint = checkpoint or {"matches": None, "postings": {}}
         
-        # Get current page content
-        current_url = self.web_nav_tool.current_url
-        if current_url in visited_urls:
-            logger.warning(f"Already scraped {current_url}, skipping")
-            return scraped_jobs
+        if checkpoint.get("matches") is not None:
+            matches = checkpoint["matches"]
+        else:
+            matches = await self._collect_job_matches(job_params)
+            checkpoint["matches"] = matches
+            self._save_checkpoint(checkpoint)
             
-        visited_urls.add(current_url)
+        postings = self._plan_postings(matches, checkpoint["postings"])
+            
+        # Pages are only held while fetching, so the next posting's navigation
+        # overlaps with the previous posting's LLM extraction
+        page_slots = asyncio.Semaphore(self.max_parallel_postings)
+        extraction_slots = asyncio.Semaphore(self.max_parallel_extractions)
         
-        # Get current page content
+        deadline = current_deadline()
+        cut_off = []
+        
+        async def scrape_posting(scrape_order: int, job_match: Dict[str, Any]):
+            try:
+                async with page_slots:
+                    # Postings still waiting for a page when the budget runs out are skipped
+                    if deadline.expired:
+                        cut_off.append(scrape_order)
+                        return None
+                        
+                    logger.info(f"Scraping job {scrape_order}/{len(matches)}: {job_match['title']}")
+                    html_content = await self._fetch_job_posting(job_match)
+                    
+                async with extraction_slots:
+                    job_data = await self._extract_job_posting(job_match, html_content, scrape_order, job_params)
+                    
+                if job_data:
+                    self._record_posting(checkpoint, job_data)
+                return job_data
+                    
+            except Exception as e:
+                if deadline.expired:
+                    cut_off.append(scrape_order)
+                logger.error(f"Error scraping job {job_match['title']}: {str(e)}")
+                return None
+                
+        await asyncio.gather(*(scrape_posting(order, match) for order, match in postings))
+        
+        # Postings cut off by the deadline make this a partial result
+        if cut_off:
+            raise DeadlineExceeded(f"Request budget exhausted with {len(cut_off)} of {len(postings)} postings not scraped")
+        
+        # Checkpointed postings include the ones scraped by earlier runs
+        scraped_jobs = list(checkpoint["postings"].values())
+        scraped_jobs.sort(key=lambda job_data: job_data["scrape_order"])
+        return scraped_jobs
+        
+    def _plan_postings(self, matches: List[Dict[str, Any]], scraped: Optional[Dict[str, Any]] = None) -> List[tuple]:
+        """Drop duplicate and already-scraped postings, keeping each match's original position as its scrape_order"""
+        visited_urls = {self.web_nav_tool.current_url}
+        postings = []
+        for i, job_match in enumerate(matches):
+            if scraped and job_match["url"] in scraped:
+                logger.info(f"Posting {job_match['url']} restored from checkpoint, skipping")
+                continue
+            if job_match["url"] in visited_urls:
+                logger.info(f"Already scraped {job_match['url']}, skipping")
+                continue
+            visited_urls.add(job_match["url"])
+            postings.append((i + 1, job_match))
+        return postings
+        
+    async def _collect_job_matches(self, job_params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Extract job links from every page of the listings and fuzzy match them"""
+        listings_url = self.web_nav_tool.current_url
+        job_links, all_matches = await self._crawl_and_match(job_params, self.use_json_feeds)
+        
+        # A JSON feed that is not the job list (offices, CMS entries) must not hide the page's real listings
+        if not all_matches.get("matches") and any(link.get("source") == "json_feed" for link in job_links):
+            logger.info("JSON feed listings gave no matches, extracting from the page HTML instead")
+            await self.web_agent.navigate_to_url(listings_url)
+            job_links, all_matches = await self._crawl_and_match(job_params, use_json_feeds=False)
+            
+        if not job_links:
+            raise Exception("No job listings found on the page")
+        if not all_matches.get("matches"):
+            raise Exception("No matching jobs found")
+        
+        logger.info(f"Found {len(all_matches['matches'])} matching jobs to scrape")
+        return all_matches["matches"]
+        
+    async def _crawl_and_match(self, job_params: Dict[str, Any], use_json_feeds: bool) -> tuple:
+        """(job links of every listings page state, fuzzy matches among them)"""
+        # Page content already sent to the LLM in earlier steps of this crawl
+        seen = set()
+        crawl = await self.listing_crawler.crawl(lambda: self._extract_listing_links(job_params, seen, use_json_feeds))
+        job_links = crawl["items"]
+        if not job_links:
+            return job_links, {}
+        logger.info(f"Collected {len(job_links)} job links over {len(crawl['steps']) + 1} listing page states")
+            
+        # Find ALL matches (not just best)
+        return job_links, await self.analyzer_agent.find_all_job_matches(job_links, job_params)
+        
+    async def _extract_listing_links(self, job_params: Dict[str, Any], seen: Optional[set] = None,
+                                     use_json_feeds: bool = True) -> List[Dict[str, Any]]:
+        """Job links in the current listings page state, from its JSON feed or the HTML"""
+        job_links = await self._json_feed_listings() if use_json_feeds else []
+        if job_links:
+            logger.info(f"Using {len(job_links)} listings from the page's JSON feed, skipping HTML/LLM extraction")
+            return job_links
+            
         page_content = await self.web_agent.scrape_current_page()
         
         # Extract job links
         job_links_result = await self.analyzer_agent.extract_job_links(
             page_content["html_content"],
-            job_params
+            job_params,
+            seen
         )
+        return job_links_result.get("job_links") or []
         
-        if not job_links_result.get("job_links"):
-            raise Exception("No job listings found on the page")
+    async def _json_feed_listings(self) -> List[Dict[str, Any]]:
+        """Job listings from JSON responses captured while the current page loaded"""
+        try:
+            return await self.web_nav_tool.json_feeds.job_listings(
+                self.web_nav_tool.page,
+                self.web_nav_tool.current_url or "",
+                await self.web_nav_tool.get_page_html()
+            )
+        except Exception as e:
+            logger.warning(f"JSON feed lookup failed: {str(e)}")
+            return []
             
-        # Find ALL matches (not just best)
-        all_matches = await self.analyzer_agent.find_all_job_matches(
-            job_links_result["job_links"],
-            job_params
+    async def _fetch_job_posting(self, job_match: Dict[str, Any]) -> str:
+        """Fetch a job posting's HTML over HTTP when the domain allows it, else in the browser"""
+        if job_match.get("ats"):
+            fetch_result = await self.ats_tool.fetch_posting_html(job_match)
+            if fetch_result.get("success"):
+                return fetch_result["html_content"]
+            logger.info(f"ATS posting fetch failed for {job_match['url']}, loading the page instead")
+            
+        browser_only = self.http_fetch_tool.preferred_mode(job_match["url"]) == "browser"
+        http_usable = not browser_only
+        
+        if self.http_first and http_usable:
+            fetch_result = await self.http_fetch_tool.fetch_rendered_html(job_match["url"], job_match.get("title"))
+            if fetch_result.get("success"):
+                return fetch_result["html_content"]
+            logger.info(f"HTTP fetch not usable for {job_match['url']} ({fetch_result.get('error')}), using the browser")
+            http_usable = False
+            
+        if not self.hedge_postings:
+            return await self._fetch_job_posting_browser(job_match)
+            
+        # The backup is a plain HTTP fetch, unless the domain needs JS or HTTP already failed: then it
+        # is a second page load on another leased page that waits for the page to settle instead of
+        # for posting selectors
+        if http_usable:
+            backup = lambda: self._fetch_job_posting_http(job_match)
+        else:
+            backup = lambda: self._fetch_job_posting_browser(job_match, ready_selectors=None)
+            
+        return await self.posting_hedge.run(
+            lambda: self._fetch_job_posting_browser(job_match),
+            backup,
+            job_match["url"]
         )
         
-        if not all_matches.get("matches"):
-            raise Exception("No matching jobs found")
+    async def _fetch_job_posting_http(self, job_match: Dict[str, Any]) -> str:
+        """Fetch a job posting without the browser"""
+        fetch_result = await self.http_fetch_tool.fetch_rendered_html(job_match["url"], job_match.get("title"))
         
-        logger.info(f"Found {len(all_matches['matches'])} matching jobs to scrape")
+        if not fetch_result.get("success"):
+            raise Exception(fetch_result.get("error", "HTTP fetch failed"))
+            
+        return fetch_result["html_content"]
+        
+    async def _fetch_job_posting_browser(self, job_match: Dict[str, Any],
+                                         ready_selectors: Optional[List[str]] = POSTING_READY_SELECTORS) -> str:
+        """Load a job posting on its own leased page and return its HTML"""
+        async with self.web_nav_tool.lease_page():
+            nav_result = await self.web_agent.navigate_to_url(job_match["url"], ready_selectors)
+            if not nav_result.get("success"):
+                raise Exception(nav_result.get("error", "Failed to load job posting"))
+                
+            job_page_content = await self.web_agent.scrape_current_page()
+            
+        if not job_page_content.get("success"):
+            raise Exception(job_page_content.get("error", "Failed to scrape job posting"))
+            
+        return job_page_content["html_content"]
         
-        # Scrape each matching job
-        scraped_jobs = []
+    async def _extract_job_posting(self, job_match: Dict[str, Any], html_content: str, scrape_order: int,
+                                   job_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Extract structured job data from a fetched posting"""
+        job_data_result = await self.analyzer_agent.extract_enhanced_job_data(html_content, job_params)
         
-        for i, job_match in enumerate(all_matches["matches"]):
-            try:
-                job_url = job_match["url"]
-                
-                # Skip if already scraped this job URL
-                if job_url in visited_urls:
-                    logger.info(f"Already scraped {job_url}, skipping")
-                    continue
-                    
-                visited_urls.add(job_url)
-                logger.info(f"Scraping job {i+1}/{len(all_matches['matches'])}: {job_match['title']}")
-                
-                # Navigate to job posting
-                await self.web_agent.navigate_to_url(job_match["url"])
-                await asyncio.sleep(2)  # Wait for page load
-                
-                # Scrape job content
-                job_page_content = await self.web_agent.scrape_current_page()
-                
-                # Extract enhanced job data
-                job_data_result = await self.analyzer_agent.extract_enhanced_job_data(
-                    job_page_content["html_content"],
-                    job_params
-                )
-                
-                if job_data_result.get("success"):
-                    job_data = job_data_result["job_data"]
-                    job_data["match_score"] = job_match["match_score"]
-                    job_data["job_url"] = job_match["url"]
-                    job_data["scrape_order"] = i + 1
-                    
-                    scraped_jobs.append(job_data)
-                    logger.info(f"Successfully scraped job: {job_data.get('title', 'Unknown')}")
-                else:
-                    logger.warning(f"Failed to extract data from: {job_match['title']}")
-                    
-            except Exception as e:
-                logger.error(f"Error scraping job {job_match['title']}: {str(e)}")
-                continue
+        if not job_data_result.get("success"):
+            logger.warning(f"Failed to extract data from: {job_match['title']}")
+            return None
+            
+        job_data = job_data_result["job_data"]
+        job_data["match_score"] = job_match["match_score"]
+        job_data["job_url"] = job_match["url"]
+        job_data["scrape_order"] = scrape_order
         
-        return scraped_jobs
+        logger.info(f"Successfully scraped job: {job_data.get('title', 'Unknown')}")
+        return job_data
         
     async def _extract_job_data(self, job_url: str, job_params: Dict[str, Any]) -> Dict[str, Any]:
         """Extract job data using Analyzer Agent"""
@@ -344,7 +778,11 @@ class LeadAgent(Agent):
             await self.analyzer_agent.cleanup()
             
         # Cleanup tools
-        for tool in [self.web_nav_tool, self.scraping_tool, self.search_tool, self.job_matching_tool]:
+        if self.hedge_postings:
+            logger.info(f"Posting fetch hedging stats: {self.posting_hedge.get_stats()}")
+            
+        for tool in [self.web_nav_tool, self.scraping_tool, self.search_tool, self.job_matching_tool, self.http_fetch_tool,
+                     self.ats_tool]:
             if tool and hasattr(tool, 'cleanup'):
                 await tool.cleanup()
                 
@@ -3,13 +3,17 @@ Web Agent - Handles web navigation and scraping using OpenAI Agents SDK
 """
 
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from agents import Agent, function_tool
 from tools.web_navigation_tool import WebNavigationTool
 from tools.html_scraping_tool import HTMLScrapingTool
 from tools.search_tool import SearchTool
+from utils.deadline import current_deadline
+from utils.llm_client import get_llm_client
 from utils.logger import setup_logger
+from utils.search_template_store import SearchTemplateStore
+from utils.storage_state_store import url_domain
 
 logger = setup_logger(__name__)
 
@@ -50,7 +54,8 @@ def check_page_iframes_tool() -> str:
     return "Checking for iframes"
 
 class WebAgent(Agent):
-    def __init__(self, web_nav_tool: WebNavigationTool, scraping_tool: HTMLScrapingTool, search_tool: SearchTool):
+    def __init__(self, web_nav_tool: WebNavigationTool, scraping_tool: HTMLScrapingTool, search_tool: SearchTool,
+                 search_templates: Optional[SearchTemplateStore] = None):
         super().__init__(
             name="WebNavigationAgent",
             instructions="""
@@ -84,6 +89,9 @@ class WebAgent(Agent):
         self.scraping_tool = scraping_tool
         self.search_tool = search_tool
         
+        # Results URL patterns of past on-site searches, per domain (None disables)
+        self.search_templates = search_templates
+        
     async def initialize(self):
         """Initialize the Web Agent with tools"""
         logger.info("Initializing Web Agent with OpenAI Agents SDK")
@@ -120,18 +128,13 @@ class WebAgent(Agent):
             logger.error(f"Company search failed: {str(e)}")
             return {"success": False, "error": str(e)}
             
-    async def navigate_to_url(self, url: str) -> Dict[str, Any]:
+    async def navigate_to_url(self, url: str, ready_selectors: Optional[List[str]] = None) -> Dict[str, Any]:
         """Navigate to specific URL"""
         logger.info(f"Web Agent navigating to: {url}")
         
         try:
-            result = await self.web_nav_tool.navigate_to_url(url)
-            
-            if result.get("success"):
-                # Wait for page to stabilize
-                await asyncio.sleep(2)
-                
-            return result
+            # The navigation tool waits until the page is ready
+            return await self.web_nav_tool.navigate_to_url(url, ready_selectors)
             
         except Exception as e:
             logger.error(f"Navigation failed: {str(e)}")
@@ -155,15 +158,31 @@ class WebAgent(Agent):
             return {"success": False, "error": str(e)}
             
     async def search_jobs_on_page(self, job_title: str) -> Dict[str, Any]:
-        """Use GPT to find and use search functionality"""
-        from openai import AsyncOpenAI
+        """Search the site for a job title
         
+        Tried in order: the search URL learned on this domain before, the page's GET search form
+        submitted as a URL, and finally GPT finding the search box and the browser filling it in.
+        """
+        start_url = self.web_nav_tool.current_url or ""
+        domain = url_domain(start_url)
+        # Job links already on the start page; a results page must bring its own
+        start_links = await self.scraping_tool.job_link_urls()
+        
+        templated = await self._search_with_template(domain, start_url, job_title, start_links)
+        if templated:
+            return templated
+            
+        submitted = await self._search_with_get_form(domain, start_url, job_title, start_links)
+        if submitted:
+            return submitted
+            
         try:
             # Get page HTML
-            page_content = await self.scraping_tool.scrape_page()
+            # Frame content is left out: the selectors returned must work on the top page
+            page_content = await self.scraping_tool.scrape_page(include_frames=False)
             html_content = page_content["html_content"]
             
-            client = AsyncOpenAI()
+            client = get_llm_client()
             
             prompt = f"""Analyze this HTML and find the best way to search for jobs: "{job_title}"
 
@@ -176,7 +195,8 @@ class WebAgent(Agent):
             response = await client.chat.completions.create(
                 model="gpt-5-nano",
                 messages=[{"role": "user", "content": prompt[:200000]}],
-                temperature=1
+                temperature=1,
+                timeout=current_deadline().timeout(60)
             )
             
             import json
@@ -193,7 +213,11 @@ class WebAgent(Agent):
                     else:
                         submit_result = await self.web_nav_tool.interact_with_element("submit", selector)
                         
-                    await asyncio.sleep(3)
+                    if self.search_templates and domain and self.web_nav_tool.current_url != start_url:
+                        check = await self.scraping_tool.check_search_results(job_title, start_links)
+                        if check["looks_like_results"]:
+                            self.search_templates.learn(domain, self.web_nav_tool.current_url, job_title, start_url)
+                        
                     return {"success": True, "current_url": self.web_nav_tool.current_url}
             
             return {"success": False, "error": "GPT couldn't find search functionality"}
@@ -201,25 +225,59 @@ class WebAgent(Agent):
         except Exception as e:
             return {"success": False, "error": str(e)}
             
+    async def _search_with_template(self, domain: str, start_url: str, job_title: str,
+                                    start_links: set) -> Optional[Dict[str, Any]]:
+        """Open the results URL built from the domain's learned template; None if there is none or it failed"""
+        if not self.search_templates or not domain:
+            return None
+            
+        search_url = self.search_templates.build_url(domain, job_title)
+        if not search_url:
+            return None
+            
+        logger.info(f"Searching {domain} through its learned URL template: {search_url}")
+        result = await self.web_nav_tool.navigate_to_url(search_url)
+        if result.get("success"):
+            # A page that loads is not necessarily a results page (moved search, soft 404, home redirect)
+            check = await self.scraping_tool.check_search_results(job_title, start_links)
+            if check["looks_like_results"]:
+                return {"success": True, "current_url": self.web_nav_tool.current_url, "method": "search_template"}
+            logger.info(f"Templated search URL for {domain} did not load a results page")
+            
+        self.search_templates.forget(domain)
+        await self.web_nav_tool.navigate_to_url(start_url)
+        return None
+        
+    async def _search_with_get_form(self, domain: str, start_url: str, job_title: str,
+                                    start_links: set) -> Optional[Dict[str, Any]]:
+        """Open the results URL of the page's GET search form; None if it has none or no results page loaded"""
+        form_result = await self.scraping_tool.build_search_form_url(job_title)
+        if not form_result.get("success"):
+            return None
+            
+        result = await self.web_nav_tool.navigate_to_url(form_result["url"])
+        # Forms driven by JavaScript may ignore their query string and show the unsearched page
+        if not result.get("success") or not (
+                await self.scraping_tool.check_search_results(job_title, start_links))["looks_like_results"]:
+            logger.info(f"Search form URL {form_result['url']} did not load a results page, using the browser")
+            await self.web_nav_tool.navigate_to_url(start_url)
+            return None
+            
+        if self.search_templates and domain:
+            self.search_templates.learn(domain, self.web_nav_tool.current_url, job_title, start_url)
+        return {"success": True, "current_url": self.web_nav_tool.current_url, "method": "get_form"}
+        
     async def handle_iframe_content(self) -> Dict[str, Any]:
         """Handle content inside iframes"""
         logger.info("Web Agent handling iframe content")
         
         try:
-            iframe_result = await self.scraping_tool.check_for_iframes()
+            # Frames are read in place and merged into the page snapshot, so the page stays where it is
+            result = await self.scraping_tool.scrape_page(include_links=True)
             
-            if iframe_result.get("has_iframes"):
-                iframes = iframe_result["iframes"]
+            if result.get("success") and result.get("frames"):
+                return result
                 
-                # Try to interact with the first meaningful iframe
-                for iframe in iframes:
-                    if iframe.get("src"):
-                        # Navigate to iframe source if it's a full URL
-                        if iframe["src"].startswith(("http://", "https://")):
-                            nav_result = await self.web_nav_tool.navigate_to_url(iframe["src"])
-                            if nav_result.get("success"):
-                                return nav_result
-                                
             return {"success": False, "error": "No actionable iframes found"}
             
         except Exception as e:
@@ -229,4 +287,6 @@ class WebAgent(Agent):
     async def cleanup(self):
         """Cleanup Web Agent resources"""
         logger.info("Cleaning up Web Agent resources")
+        if self.search_templates:
+            logger.info(f"Search template stats: {self.search_templates.get_stats()}")
         # Cleanup handled by tools
\ No newline at end of file
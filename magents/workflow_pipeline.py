@@ -0,0 +1,284 @@
+"""
+Workflow Pipeline - Runs the LeadAgent workflow as stages connected by bounded queues
+"""
+
+import asyncio
+import time
+from typing import Dict, Any, List, Callable, Awaitable, Optional
+
+from magents.lead_agent import LeadAgent
+from utils.checkpoint_store import CheckpointStore
+from utils.deadline import Deadline, DeadlineExceeded, deadline_scope
+from utils.har_archive import har_scope
+from utils.hedging import hedge_slots
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Workers per stage; browser stages each hold one pooled page per worker
+DEFAULT_STAGE_WORKERS = {
+    "company": 2,
+    "careers": 4,
+    "listings": 4,
+    "fetch": 8,
+    "extract": 8
+}
+
+BROWSER_STAGES = ["company", "careers", "listings", "fetch"]
+
+class RequestState:
+    """Progress of one job request as it moves through the pipeline"""
+
+    def __init__(self, request_id: str, job_params: Dict[str, Any], checkpoint: Dict[str, Any],
+                 budget_seconds: Optional[float] = None):
+        self.request_id = request_id
+        self.job_params = job_params
+        self.checkpoint = checkpoint
+        self.workflow_steps = checkpoint["workflow_steps"]
+        self.pending_postings = 0
+        self.error = None
+        self.timed_out = False
+        self.started_at = time.monotonic()
+        # The budget starts when the request is fed in, so queueing time counts against it
+        self.deadline = Deadline(budget_seconds)
+        # Traffic of every stage is recorded/replayed under the request's HAR key
+        self.har_key = CheckpointStore.request_key(job_params)
+
+class WorkflowPipeline:
+    def __init__(self, lead_agent: LeadAgent, stage_workers: Optional[Dict[str, int]] = None,
+                 queue_size: int = 16):
+        unknown = set(stage_workers or {}) - set(DEFAULT_STAGE_WORKERS)
+        if unknown:
+            raise ValueError(f"Unknown pipeline stages: {', '.join(sorted(unknown))}")
+            
+        self.lead_agent = lead_agent
+        self.stage_workers = {**DEFAULT_STAGE_WORKERS, **(stage_workers or {})}
+        self.queue_size = queue_size
+
+        self.queues = {}
+        self.on_result = None
+        self._done = None
+        self._outstanding = 0
+
+        self.stage_stats = {stage: {"processed": 0, "failed": 0, "busy_seconds": 0.0} for stage in self.stage_workers}
+
+    @staticmethod
+    def required_pages(stage_workers: Optional[Dict[str, int]] = None, careers_probes: int = 3) -> int:
+        """Pages needed so every browser stage worker can hold a lease at once"""
+        workers = {**DEFAULT_STAGE_WORKERS, **{k: v for k, v in (stage_workers or {}).items() if k in DEFAULT_STAGE_WORKERS}}
+        # Careers workers also lease a page per candidate they probe, and hedged posting fetches
+        # start their browser backup on a page of its own
+        return (sum(workers[stage] for stage in BROWSER_STAGES) + workers["careers"] * careers_probes
+                + hedge_slots(workers["fetch"]))
+
+    async def run(self, requests: List[Dict[str, Any]],
+                  on_result: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None) -> Dict[str, Dict[str, Any]]:
+        """Push every request through the pipeline and return results keyed by request_id"""
+        results = {}
+
+        async def collect(request_id: str, result: Dict[str, Any]):
+            results[request_id] = result
+            if on_result:
+                await on_result(request_id, result)
+
+        self.on_result = collect
+        self._done = asyncio.Event()
+        self._outstanding = len(requests)
+        self.queues = {stage: asyncio.Queue(maxsize=self.queue_size) for stage in self.stage_workers}
+
+        handlers = {
+            "company": self._company_stage,
+            "careers": self._careers_stage,
+            "listings": self._listings_stage,
+            "fetch": self._fetch_stage,
+            "extract": self._extract_stage
+        }
+
+        workers = [
+            asyncio.create_task(self._worker(stage, handlers[stage]))
+            for stage, count in self.stage_workers.items()
+            for _ in range(max(1, count))
+        ]
+
+        try:
+            if requests:
+                # Feeding blocks when the first queue is full, which is the backpressure point
+                for request in requests:
+                    checkpoint = self.lead_agent._start_checkpoint(request["job_params"])
+                    await self.queues["company"].put(RequestState(
+                        request["request_id"], request["job_params"], checkpoint,
+                        self.lead_agent.request_budget_seconds
+                    ))
+                await self._done.wait()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        logger.info(f"Pipeline stage stats: {self.get_stats()}")
+        return results
+
+    async def _worker(self, stage: str, handler):
+        """Consume one stage's queue forever"""
+        queue = self.queues[stage]
+        while True:
+            item = await queue.get()
+            state = item if isinstance(item, RequestState) else item["state"]
+            started = time.monotonic()
+            try:
+                with deadline_scope(state.deadline), har_scope(state.har_key):
+                    await state.deadline.run(handler(item), f"{stage} stage")
+                self.stage_stats[stage]["processed"] += 1
+            except Exception as e:
+                self.stage_stats[stage]["failed"] += 1
+                if isinstance(e, DeadlineExceeded) or state.deadline.expired:
+                    state.timed_out = True
+                logger.error(f"Pipeline stage '{stage}' failed for request {state.request_id}: {str(e)}")
+                if isinstance(item, RequestState):
+                    state.error = str(e)
+                    await self._finish(state)
+                else:
+                    await self._posting_done(state)
+            finally:
+                self.stage_stats[stage]["busy_seconds"] += time.monotonic() - started
+                queue.task_done()
+
+    async def _company_stage(self, state: RequestState):
+        """Resolve the company URL"""
+        if state.checkpoint.get("result"):
+            logger.info(f"Request {state.request_id} already completed in a previous run")
+            await self._finish(state)
+            return
+
+        # Checkpointed steps pass straight through
+        if not state.workflow_steps.get("company_url") and not state.workflow_steps.get("job_listings_url"):
+            async with self.lead_agent.web_nav_tool.lease_page():
+                company_url = await self.lead_agent._get_company_url(state.job_params)
+            self.lead_agent._record_step(state.checkpoint, "company_url", company_url)
+
+        await self.queues["careers"].put(state)
+
+    async def _careers_stage(self, state: RequestState):
+        """Find the careers page on the company site"""
+        if not state.workflow_steps.get("careers_url") and not state.workflow_steps.get("job_listings_url"):
+            async with self.lead_agent.web_nav_tool.lease_page():
+                careers_url = await self.lead_agent._find_careers_page(state.workflow_steps["company_url"])
+            self.lead_agent._record_step(state.checkpoint, "careers_url", careers_url)
+
+        await self.queues["listings"].put(state)
+
+    async def _listings_stage(self, state: RequestState):
+        """Reach the listings page and match postings; fans out one item per posting"""
+        checkpoint = state.checkpoint
+
+        # ATS-backed careers sites are matched from the platform API without a page
+        if checkpoint.get("matches") is None and not state.workflow_steps.get("job_listings_url") \
+                and self.lead_agent.use_ats_connectors:
+            job_listings_url = await self.lead_agent._match_via_ats(
+                state.workflow_steps["careers_url"], state.job_params, checkpoint
+            )
+            if job_listings_url:
+                self.lead_agent._record_step(checkpoint, "job_listings_url", job_listings_url)
+
+        if checkpoint.get("matches") is None:
+            async with self.lead_agent.web_nav_tool.lease_page():
+                if state.workflow_steps.get("job_listings_url"):
+                    await self.lead_agent.web_agent.navigate_to_url(state.workflow_steps["job_listings_url"])
+                else:
+                    careers_analysis = await self.lead_agent._analyze_careers_page(
+                        state.workflow_steps["careers_url"], state.job_params, checkpoint
+                    )
+                    job_listings_url = careers_analysis.get("ats_board_url") or \
+                        await self.lead_agent._find_job_listings(careers_analysis, state.job_params)
+                    self.lead_agent._record_step(checkpoint, "job_listings_url", job_listings_url)
+
+                # An ATS embedded in the careers page has filled in the matches already
+                if checkpoint.get("matches") is None:
+                    checkpoint["matches"] = await self.lead_agent._collect_job_matches(state.job_params)
+                    self.lead_agent._save_checkpoint(checkpoint)
+                postings = self.lead_agent._plan_postings(checkpoint["matches"], checkpoint["postings"])
+        else:
+            postings = self.lead_agent._plan_postings(checkpoint["matches"], checkpoint["postings"])
+
+        if not postings:
+            await self._finish(state)
+            return
+
+        state.pending_postings = len(postings)
+        for scrape_order, job_match in postings:
+            await self.queues["fetch"].put({"state": state, "scrape_order": scrape_order, "job_match": job_match})
+
+    async def _fetch_stage(self, item: Dict[str, Any]):
+        """Load one posting's HTML"""
+        item["html_content"] = await self.lead_agent._fetch_job_posting(item["job_match"])
+        await self.queues["extract"].put(item)
+
+    async def _extract_stage(self, item: Dict[str, Any]):
+        """Run LLM extraction on one fetched posting"""
+        state = item["state"]
+        job_data = await self.lead_agent._extract_job_posting(
+            item["job_match"], item["html_content"], item["scrape_order"], state.job_params
+        )
+        if job_data:
+            self.lead_agent._record_posting(state.checkpoint, job_data)
+        await self._posting_done(state)
+
+    async def _posting_done(self, state: RequestState):
+        """Finish the request once its last posting is through"""
+        state.pending_postings -= 1
+        if state.pending_postings <= 0:
+            await self._finish(state)
+
+    async def _finish(self, state: RequestState):
+        """Build the request's result and report it"""
+        if state.checkpoint.get("result"):
+            result = dict(state.checkpoint["result"])
+        elif state.timed_out:
+            result = self.lead_agent._partial_result(
+                state.job_params, state.checkpoint,
+                state.error or f"Request budget of {state.deadline.budget_seconds}s exhausted"
+            )
+        elif state.error:
+            result = {
+                "success": False,
+                "error": state.error,
+                "job_params": state.job_params,
+                "workflow_steps": dict(state.workflow_steps),
+                "timestamp": asyncio.get_event_loop().time()
+            }
+        else:
+            scraped_jobs = sorted(state.checkpoint["postings"].values(), key=lambda job_data: job_data["scrape_order"])
+            result = {
+                "success": True,
+                "job_params": state.job_params,
+                "workflow_steps": dict(state.workflow_steps),
+                "jobs_found": len(scraped_jobs),
+                "all_job_data": scraped_jobs,
+                "timestamp": asyncio.get_event_loop().time()
+            }
+            state.checkpoint["result"] = result
+            self.lead_agent._save_checkpoint(state.checkpoint)
+
+        result["duration_seconds"] = round(time.monotonic() - state.started_at, 2)
+        self.lead_agent._save_har(state.har_key)
+
+        try:
+            await self.on_result(state.request_id, result)
+        except Exception as e:
+            logger.error(f"Failed to report result for request {state.request_id}: {str(e)}")
+        finally:
+            self._outstanding -= 1
+            if self._outstanding <= 0:
+                self._done.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-stage throughput and current queue depth"""
+        return {
+            stage: {
+                **stats,
+                "busy_seconds": round(stats["busy_seconds"], 2),
+                "workers": self.stage_workers[stage],
+                "queued": self.queues[stage].qsize() if stage in self.queues else 0
+            }
+            for stage, stats in self.stage_stats.items()
+        }
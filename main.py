@@ -3,16 +3,27 @@
 Job Scraper Main Script - Using OpenAI Agents SDK
 """
 
+import argparse
 import asyncio
 import json
 import sys
 import io
 import os
+import time
 from pathlib import Path
 from dotenv import load_dotenv
 
 from agents import Agent
 from magents.lead_agent import LeadAgent
+from magents.workflow_pipeline import WorkflowPipeline
+from tools.web_navigation_tool import WebNavigationTool
+from sharded_runner import run_sharded
+from tools.launch_profiles import LAUNCH_PROFILES, PROFILE_ENV_VAR, get_launch_profile
+from utils.batch_io import load_job_requests, append_result, read_completed_request_ids
+from utils.checkpoint_store import CheckpointStore
+from utils.har_archive import HAR_MODES, configure_har_archive, get_har_archive
+from utils.llm_client import close_llm_client
+from utils.politeness import configure_politeness
 from utils.logger import setup_logger
 
 
@@ -26,17 +37,45 @@ sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8")
 logger = setup_logger(__name__)
 
 class JobScraperSystem:
-    def __init__(self):
+    def __init__(self, checkpoint_dir: str = "checkpoints", resume: bool = False,
+                 request_budget_seconds: float = None, launch_profile: str = None,
+                 har_mode: str = None, har_dir: str = "har",
+                 host_rate: float = 2.0, host_concurrency: int = 4, host_limits: dict = None):
         self.lead_agent = None
         self.output_file = "output.json"
+        self.batch_output_file = "batch_results.jsonl"
+        
+        # Batch mode: one browser shared by several worker LeadAgents
+        self.browser_host = None
+        self.batch_agents = []
+        
+        # Workflow checkpoints let an interrupted run pick up where it stopped
+        self.checkpoint_store = CheckpointStore(checkpoint_dir)
+        self.resume = resume
+        
+        # End-to-end time budget per request (None = unbounded)
+        self.request_budget_seconds = request_budget_seconds
+        
+        # Browser launch profile name (None = ROTIFER_PROFILE env var, then debug)
+        self.launch_profile = launch_profile
+        
+        # HAR record/replay of all browser and aiohttp traffic, one file per request (None = live network)
+        configure_har_archive(har_mode, har_dir)
+        
+        # Per-host rate and concurrency limits shared by every navigation and HTTP request (0 = no rate limit);
+        # host_limits overrides them for single hosts, e.g. the shares of shared hosts in a sharded batch
+        self.politeness = configure_politeness(host_rate or None, host_concurrency, host_limits=host_limits)
         
     async def initialize(self):
         """Initialize the lead agent using OpenAI Agents SDK"""
         logger.info("Initializing Job Scraper System with OpenAI Agents SDK")
         
-        self.lead_agent = LeadAgent()
+        self.lead_agent = self._configure_agent(LeadAgent())
         await self.lead_agent.initialize()
         
+        # The browser launches in the background while the user types the job details
+        self.lead_agent.web_nav_tool.warm_up()
+        
         logger.info("Job Scraper System initialized successfully")
         
     def get_user_input(self):
@@ -82,6 +121,7 @@ class JobScraperSystem:
                 json.dump(result, f, indent=2, ensure_ascii=False)
                 
             logger.info(f"Job scraping completed. Results saved to {self.output_file}")
+            logger.info(f"Startup timings: {self.lead_agent.get_startup_timings()}")
             return result
             
         except Exception as e:
@@ -97,21 +137,218 @@ class JobScraperSystem:
                 
             raise
             
+    async def run_batch(self, input_file: str, output_file: str = None, concurrency: int = 4,
+                        pipeline: bool = False, stage_workers: dict = None):
+        """Run many job requests concurrently against one shared browser"""
+        requests = load_job_requests(input_file)
+        return await self.run_requests(requests, output_file, concurrency, pipeline, stage_workers)
+        
+    async def run_requests(self, requests: list, output_file: str = None, concurrency: int = 4,
+                           pipeline: bool = False, stage_workers: dict = None):
+        """Run already-loaded job requests and append each result to output_file"""
+        output_file = output_file or self.batch_output_file
+        
+        if self.resume:
+            completed = read_completed_request_ids(output_file)
+            requests = [request for request in requests if request["request_id"] not in completed]
+            logger.info(f"Resuming batch: {len(completed)} requests already completed, {len(requests)} remaining")
+        
+        started_at = time.monotonic()
+        write_lock = asyncio.Lock()
+        stats = {"total": len(requests), "succeeded": 0, "failed": 0, "jobs_found": 0}
+        
+        async def record_result(request_id: str, result: dict):
+            record = {"request_id": request_id, **result}
+            async with write_lock:
+                append_result(output_file, record)
+                stats["succeeded" if result.get("success") else "failed"] += 1
+                stats["jobs_found"] += result.get("jobs_found", 0)
+                done = stats["succeeded"] + stats["failed"]
+                logger.info(f"Batch progress: {done}/{stats['total']} (request {request_id})")
+                
+        if pipeline:
+            await self._run_batch_pipeline(requests, stage_workers, record_result)
+        else:
+            await self._run_batch_workers(requests, concurrency, record_result)
+        
+        stats["elapsed_seconds"] = round(time.monotonic() - started_at, 2)
+        stats["output_file"] = output_file
+        logger.info(f"Batch completed: {stats}")
+        return stats
+        
+    async def _run_batch_workers(self, requests, concurrency, record_result):
+        """Run whole workflows side by side, one LeadAgent per worker"""
+        concurrency = max(1, min(concurrency, len(requests) or 1))
+        logger.info(f"Starting batch of {len(requests)} requests with concurrency {concurrency}")
+        
+        # Launch a single browser; every worker gets its own context and page on it
+        self.browser_host = WebNavigationTool(profile=self.launch_profile)
+        await self.browser_host.initialize()
+        
+        self.batch_agents = [
+            self._configure_agent(LeadAgent(shared_browser=self.browser_host.browser, browser_host=self.browser_host))
+            for _ in range(concurrency)
+        ]
+        await asyncio.gather(*(agent.initialize() for agent in self.batch_agents))
+        
+        queue = asyncio.Queue()
+        for request in requests:
+            queue.put_nowait(request)
+        
+        async def worker(agent: LeadAgent):
+            while True:
+                try:
+                    request = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                    
+                request_started = time.monotonic()
+                try:
+                    result = await agent.process_job_request(request["job_params"])
+                except Exception as e:
+                    logger.error(f"Batch request {request['request_id']} failed: {str(e)}")
+                    result = {"success": False, "error": str(e), "job_params": request["job_params"]}
+                    
+                result["duration_seconds"] = round(time.monotonic() - request_started, 2)
+                await record_result(request["request_id"], result)
+                    
+        await asyncio.gather(*(worker(agent) for agent in self.batch_agents))
+        
+    async def _run_batch_pipeline(self, requests, stage_workers, record_result):
+        """Run the workflow as a staged pipeline on a single LeadAgent"""
+        logger.info(f"Starting pipelined batch of {len(requests)} requests (stage workers: {stage_workers or 'default'})")
+        
+        self.lead_agent = self._configure_agent(LeadAgent(page_pool_size=WorkflowPipeline.required_pages(stage_workers)))
+        await self.lead_agent.initialize()
+        
+        pipeline = WorkflowPipeline(self.lead_agent, stage_workers)
+        await pipeline.run(requests, on_result=record_result)
+            
+    def _configure_agent(self, agent: LeadAgent) -> LeadAgent:
+        """Attach checkpointing, the request budget and the launch profile to a LeadAgent"""
+        agent.checkpoint_store = self.checkpoint_store
+        agent.resume = self.resume
+        agent.request_budget_seconds = self.request_budget_seconds
+        agent.launch_profile = self.launch_profile
+        return agent
+        
     async def cleanup(self):
         """Cleanup resources"""
         if self.lead_agent:
             await self.lead_agent.cleanup()
+            
+        for agent in self.batch_agents:
+            await agent.cleanup()
+            
+        if self.browser_host:
+            await self.browser_host.cleanup()
+            
+        har_archive = get_har_archive()
+        if har_archive:
+            har_archive.save_all()
+            logger.info(f"HAR archive stats: {har_archive.get_stats()}")
+            
+        logger.info(f"Per-host politeness stats: {self.politeness.get_stats()}")
+        
+        await close_llm_client()
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Rotifer job scraper")
+    parser.add_argument("--batch", help="JSONL or CSV file of job requests to run in batch mode")
+    parser.add_argument("--output", help="Batch output file (JSONL, one result per request)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Number of requests processed at once in batch mode")
+    parser.add_argument("--processes", type=int, default=1, help="Shard the batch across this many worker processes")
+    parser.add_argument("--resume", action="store_true", help="Skip completed requests and resume partial ones from checkpoints")
+    parser.add_argument("--checkpoint-dir", default="checkpoints", help="Directory for workflow checkpoints")
+    parser.add_argument("--pipeline", action="store_true", help="Run the batch as a staged pipeline instead of whole-workflow workers")
+    parser.add_argument("--stage-workers", help="Pipeline workers per stage, e.g. company=2,careers=4,listings=4,fetch=8,extract=8")
+    parser.add_argument("--profile", choices=sorted(LAUNCH_PROFILES),
+                        help=f"Browser launch profile (default: ${PROFILE_ENV_VAR}, else debug interactively and production in batch mode)")
+    parser.add_argument("--budget", type=float, help="Time budget per request in seconds; requests that run out return partial results")
+    parser.add_argument("--har", choices=HAR_MODES, help="Record all network traffic to HAR files per request, or replay them with no network access")
+    parser.add_argument("--har-dir", default="har", help="Directory for HAR files")
+    parser.add_argument("--host-rate", type=float, default=2.0, help="Requests per second allowed to any one host (0 = unlimited)")
+    parser.add_argument("--host-concurrency", type=int, default=4, help="Requests in flight allowed to any one host")
+    return parser.parse_args()
+
+def parse_stage_workers(value: str) -> dict:
+    """Parse 'stage=count,...' into a dict"""
+    if not value:
+        return None
+        
+    stage_workers = {}
+    for part in value.split(","):
+        stage, _, count = part.partition("=")
+        stage_workers[stage.strip()] = int(count)
+    return stage_workers
+
+async def run_batch_mode(args):
+    """Batch entry point"""
+    launch_profile = get_launch_profile(args.profile, fallback="production")["name"]
+    scraper_system = JobScraperSystem(args.checkpoint_dir, args.resume, args.budget, launch_profile,
+                                      args.har, args.har_dir, args.host_rate, args.host_concurrency)
+    
+    try:
+        if args.processes > 1:
+            stats = await asyncio.to_thread(
+                run_sharded,
+                load_job_requests(args.batch),
+                args.output or scraper_system.batch_output_file,
+                args.processes,
+                args.concurrency,
+                args.pipeline,
+                parse_stage_workers(args.stage_workers),
+                args.resume,
+                args.checkpoint_dir,
+                args.budget,
+                launch_profile,
+                args.har,
+                args.har_dir,
+                args.host_rate,
+                args.host_concurrency
+            )
+        else:
+            stats = await scraper_system.run_batch(
+                args.batch,
+                args.output,
+                args.concurrency,
+                pipeline=args.pipeline,
+                stage_workers=parse_stage_workers(args.stage_workers)
+            )
+        
+        print(f"\nBatch completed!")
+        print(f"Succeeded: {stats['succeeded']}/{stats['total']} in {stats['elapsed_seconds']}s")
+        print(f"Results saved to: {stats['output_file']}")
+        
+    except KeyboardInterrupt:
+        print("\nBatch interrupted by user")
+        logger.info("Batch interrupted by user")
+        
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        logger.error(f"Batch execution error: {str(e)}")
+        
+    finally:
+        await scraper_system.cleanup()
 
 async def main():
     """Main function"""
-    scraper_system = JobScraperSystem()
+    args = parse_args()
+    
+    if args.batch:
+        await run_batch_mode(args)
+        return
+        
+    scraper_system = JobScraperSystem(args.checkpoint_dir, args.resume, args.budget, args.profile,
+                                      args.har, args.har_dir, args.host_rate, args.host_concurrency)
     
     try:
         # Initialize the system
         await scraper_system.initialize()
         
-        # Get user input
-        job_params = scraper_system.get_user_input()
+        # Get user input (in a thread so the browser warm-up keeps running)
+        job_params = await asyncio.to_thread(scraper_system.get_user_input)
         
         # Perform scraping
         result = await scraper_system.scrape_job(job_params)
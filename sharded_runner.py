@@ -0,0 +1,167 @@
+"""
+Sharded Runner - Splits a batch of job requests across worker processes
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+from utils.batch_io import append_result, read_completed_request_ids
+from utils.logger import setup_logger
+from utils.politeness import split_shared_host_limits
+
+logger = setup_logger(__name__)
+
+
+def _company_key(job_params: Dict[str, Any]) -> str:
+    """Requests for the same company go to the same shard"""
+    return (job_params.get("company_domain") or job_params.get("company_name") or "").lower()
+
+
+def shard_requests(requests: List[Dict[str, Any]], shard_count: int) -> List[List[Dict[str, Any]]]:
+    """Split requests into balanced shards, keeping each company's requests together"""
+    groups = {}
+    for request in requests:
+        groups.setdefault(_company_key(request["job_params"]), []).append(request)
+
+    shards = [[] for _ in range(shard_count)]
+
+    # Largest groups first, each to the currently smallest shard
+    for group in sorted(groups.values(), key=len, reverse=True):
+        min(shards, key=len).extend(group)
+
+    return [shard for shard in shards if shard]
+
+
+def _run_shard(shard_index: int, requests: List[Dict[str, Any]], output_file: str, concurrency: int,
+               pipeline: bool, stage_workers: Dict[str, int], resume: bool, checkpoint_dir: str,
+               request_budget_seconds: float = None, launch_profile: str = None,
+               har_mode: str = None, har_dir: str = "har", host_rate: float = 2.0, host_concurrency: int = 4,
+               host_limits: Dict[str, Dict[str, Any]] = None):
+    """Worker process entry point: own browser, own LeadAgent(s), own event loop"""
+    from main import JobScraperSystem
+
+    async def run():
+        scraper_system = JobScraperSystem(checkpoint_dir, resume, request_budget_seconds, launch_profile,
+                                          har_mode, har_dir, host_rate, host_concurrency, host_limits)
+        try:
+            return await scraper_system.run_requests(requests, output_file, concurrency, pipeline, stage_workers)
+        finally:
+            await scraper_system.cleanup()
+
+    logger.info(f"Shard {shard_index} (pid {os.getpid()}) starting with {len(requests)} requests")
+    asyncio.run(run())
+
+
+def _read_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """Read a shard's JSONL output keyed by request_id"""
+    results = {}
+    if not Path(path).exists():
+        return results
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                results[record["request_id"]] = record
+            except (json.JSONDecodeError, KeyError):
+                continue
+
+    return results
+
+
+def run_sharded(requests: List[Dict[str, Any]], output_file: str, processes: int, concurrency: int = 4,
+                pipeline: bool = False, stage_workers: Dict[str, int] = None, resume: bool = False,
+                checkpoint_dir: str = "checkpoints", request_budget_seconds: float = None,
+                launch_profile: str = None, har_mode: str = None, har_dir: str = "har",
+                host_rate: float = 2.0, host_concurrency: int = 4) -> Dict[str, Any]:
+    """Run requests across worker processes and merge their results into output_file"""
+    started_at = time.monotonic()
+
+    if resume:
+        completed = read_completed_request_ids(output_file)
+        requests = [request for request in requests if request["request_id"] not in completed]
+        logger.info(f"Resuming sharded batch: {len(completed)} requests already completed, {len(requests)} remaining")
+    shards = shard_requests(requests, max(1, processes))
+
+    logger.info(f"Running {len(requests)} requests across {len(shards)} processes "
+                f"(shard sizes: {[len(shard) for shard in shards]})")
+
+    # Company hosts stay within one shard and keep the full limits; the search engine and ATS APIs
+    # are hit by all of them, so each shard gets an equal share of their rate and concurrency
+    host_limits = split_shared_host_limits(host_rate or None, host_concurrency, len(shards))
+
+    # spawn gives every shard a clean interpreter for its own Playwright driver
+    mp_context = multiprocessing.get_context("spawn")
+    workers = []
+    for shard_index, shard in enumerate(shards):
+        shard_output = f"{output_file}.shard{shard_index}"
+        if Path(shard_output).exists():
+            os.remove(shard_output)
+
+        process = mp_context.Process(
+            target=_run_shard,
+            args=(shard_index, shard, shard_output, concurrency, pipeline, stage_workers, resume, checkpoint_dir,
+                  request_budget_seconds, launch_profile, har_mode, har_dir, host_rate, host_concurrency,
+                  host_limits),
+            name=f"rotifer-shard-{shard_index}"
+        )
+        process.start()
+        workers.append((shard_index, shard, shard_output, process))
+
+    shard_stats = []
+    merged = {}
+    for shard_index, shard, shard_output, process in workers:
+        process.join()
+
+        results = _read_results(shard_output)
+        missing = [request for request in shard if request["request_id"] not in results]
+
+        # A crashed shard still reports every request it was given
+        for request in missing:
+            results[request["request_id"]] = {
+                "request_id": request["request_id"],
+                "success": False,
+                "error": f"Shard {shard_index} exited with code {process.exitcode} before finishing this request",
+                "job_params": request["job_params"]
+            }
+
+        merged.update(results)
+        shard_stats.append({
+            "shard": shard_index,
+            "requests": len(shard),
+            "succeeded": sum(1 for record in results.values() if record.get("success")),
+            "missing": len(missing),
+            "exit_code": process.exitcode
+        })
+
+        if Path(shard_output).exists():
+            os.remove(shard_output)
+
+    # Single output in the original request order
+    for request in requests:
+        append_result(output_file, merged[request["request_id"]])
+
+    records = list(merged.values())
+    elapsed = time.monotonic() - started_at
+    stats = {
+        "total": len(requests),
+        "succeeded": sum(1 for record in records if record.get("success")),
+        "failed": sum(1 for record in records if not record.get("success")),
+        "jobs_found": sum(record.get("jobs_found", 0) for record in records),
+        "processes": len(shards),
+        "elapsed_seconds": round(elapsed, 2),
+        "requests_per_minute": round(len(requests) * 60 / elapsed, 2) if elapsed else 0.0,
+        "shards": shard_stats,
+        "output_file": output_file
+    }
+
+    logger.info(f"Sharded batch completed: {stats}")
+    return stats
@@ -0,0 +1,20 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture(autouse=True)
+def scratch_dir(tmp_path, monkeypatch):
+    """Run each test from its own temporary directory
+
+    Tools keep state files (checkpoints, browser state, search templates) relative to the
+    working directory, so tests leave nothing behind in the checkout.
+    """
+    monkeypatch.chdir(tmp_path)
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+import utils.politeness as politeness
+from ats_stub_server import create_app
+from magents.lead_agent import LeadAgent
+from tests.conftest import FIXTURES_DIR
+from tools.ats_connector_tool import ATSConnectorTool
+
+ATS_FIXTURES = FIXTURES_DIR / "ats"
+
+
+@pytest.fixture(autouse=True)
+def unthrottled(monkeypatch):
+    # Every stub request goes to 127.0.0.1; the default per-host rate limit would only slow the tests down
+    monkeypatch.setattr(politeness, "_scheduler", politeness.PolitenessScheduler(None, max_concurrency=16))
+
+
+def run_against_stub(test):
+    """Run test(tool) with an ATSConnectorTool pointed at the stub server serving the recorded fixtures"""
+    async def run():
+        runner = web.AppRunner(create_app(str(ATS_FIXTURES)))
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        tool = ATSConnectorTool(base_url=f"http://127.0.0.1:{port}")
+        try:
+            return await test(tool)
+        finally:
+            await tool.cleanup()
+            await runner.cleanup()
+
+    return asyncio.run(run())
+
+
+CASES = [
+    ("greenhouse", "https://www.acme.com/careers", None,
+     '<a href="https://boards.greenhouse.io/othercorp">Our partner is hiring</a>'
+     '<iframe src="https://boards.greenhouse.io/embed/job_board?for=acme"></iframe>'),
+    ("lever", "https://jobs.lever.co/acme", None, None),
+    ("smartrecruiters", "https://careers.smartrecruiters.com/Acme", None, None),
+    ("workday", "https://acme.wd5.myworkdayjobs.com/en-US/External", None, None),
+    ("successfactors", "https://www.acme.com/careers", "https://acme.jobs2web.com/", None),
+    ("phenom", "https://careers.acme.com/global/en/home", None,
+     '<html><head><script src="https://cdn.phenompeople.com/CareerConnectResources/app.js"></script></head></html>'),
+]
+
+
+@pytest.mark.parametrize("platform, careers_url, final_url, html_content", CASES, ids=[case[0] for case in CASES])
+def test_connector_against_recorded_fixtures(platform, careers_url, final_url, html_content):
+    async def test(tool):
+        detection = await tool.detect_platform(careers_url, html_content, final_url)
+        assert detection["success"], detection
+        assert detection["platform"] == platform
+
+        listing = await tool.search_jobs(detection["platform_info"], "Data Engineer")
+        assert listing["success"], listing
+        titles = [job["title"] for job in listing["jobs"]]
+        assert "Data Engineer" in titles
+        job = listing["jobs"][titles.index("Data Engineer")]
+        assert job["url"].startswith("https://") and job["ats"]["platform"] == platform
+
+        posting = await tool.fetch_posting_html(job)
+        assert posting["success"], posting
+        assert "Data Engineer" in posting["html_content"]
+        assert "data pipelines" in posting["html_content"]
+
+    run_against_stub(test)
+
+
+def test_plain_links_to_other_boards_are_not_detected():
+    html_content = '<a href="https://boards.greenhouse.io/othercorp">Jobs at our partner</a>' \
+                   '<a href="https://jobs.lever.co/someone-else">More</a>'
+
+    async def test(tool):
+        detection = await tool.detect_platform("https://www.acme.com/careers", html_content)
+        assert not detection["success"]
+        # The loaded page is used as given; nothing is fetched again
+        assert tool.stats["api_calls"] == 0
+
+    run_against_stub(test)
+
+
+def test_unmatched_ats_jobs_fall_back_to_the_browser():
+    class FakeATSTool:
+        async def detect_platform(self, careers_url, html_content=None, final_url=None):
+            return {"success": True, "platform": "lever", "platform_info": {"platform": "lever"}}
+
+        async def search_jobs(self, platform_info, keywords=""):
+            return {"success": True, "jobs": [{"title": "Account Executive", "url": "https://x"}],
+                    "board_url": "https://jobs.lever.co/acme"}
+
+    class FakeAnalyzer:
+        async def find_all_job_matches(self, jobs, job_params):
+            return {"matches": []}
+
+    agent = LeadAgent()
+    agent.ats_tool = FakeATSTool()
+    agent.analyzer_agent = FakeAnalyzer()
+    checkpoint = {"matches": None, "postings": {}}
+
+    board_url = asyncio.run(agent._match_via_ats("https://jobs.lever.co/acme", {"job_title": "Data Engineer"}, checkpoint))
+    assert board_url is None
+    assert checkpoint["matches"] is None
@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from tools.consent_handler import ConsentHandler
+
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+        self.first = self
+
+    async def is_visible(self):
+        self.page.checked.append(self.selector)
+        return self.selector in self.page.visible
+
+    async def click(self, timeout=None):
+        self.page.clicked.append(self.selector)
+
+
+class FakePage:
+    def __init__(self, visible=()):
+        self.visible = set(visible)
+        self.checked = []
+        self.clicked = []
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+
+def test_recent_negative_result_is_skipped_and_expires():
+    handler = ConsentHandler(negative_ttl=60)
+    page = FakePage(visible=["#onetrust-accept-btn-handler"])
+
+    recent = asyncio.run(handler.dismiss(page, {"selector": None, "checked_at": time.time()}))
+    assert recent["cached"] and not recent["dismissed"] and page.checked == []
+
+    expired = asyncio.run(handler.dismiss(page, {"selector": None, "checked_at": time.time() - 120}))
+    assert expired["dismissed"] and expired["selector"] == "#onetrust-accept-btn-handler"
+
+
+def test_stale_cached_selector_falls_back_to_full_detection():
+    handler = ConsentHandler()
+    page = FakePage(visible=[".cky-btn-accept"])
+
+    result = asyncio.run(handler.dismiss(page, {"selector": "#didomi-notice-agree-button", "checked_at": 0}))
+
+    assert page.checked[0] == "#didomi-notice-agree-button"
+    assert result["dismissed"] and result["selector"] == ".cky-btn-accept"
+    assert handler.stats["redetected"] == 1
+
+
+def test_nothing_visible_becomes_a_timestamped_negative_result():
+    handler = ConsentHandler()
+
+    result = asyncio.run(handler.dismiss(FakePage(), {"selector": "#onetrust-accept-btn-handler", "checked_at": 0}))
+
+    assert result["selector"] is None and not result["dismissed"]
+    assert time.time() - result["checked_at"] < 5
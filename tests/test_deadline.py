@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from tools.page_pool import PagePool
+from tools.web_navigation_tool import WebNavigationTool
+from utils.deadline import Deadline, DeadlineExceeded, current_deadline, deadline_scope
+
+
+class FakePage:
+    def is_closed(self):
+        return False
+
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    async def new_page(self):
+        return FakePage()
+
+
+class FakeBrowser:
+    async def new_context(self, **options):
+        return FakeContext()
+
+
+async def noop(page):
+    pass
+
+
+def test_zero_budget_fails_fast_and_none_is_unbounded():
+    assert Deadline(0).expired
+    with pytest.raises(DeadlineExceeded):
+        Deadline(0).check("search")
+
+    unbounded = Deadline(None)
+    assert unbounded.remaining() == float("inf") and not unbounded.expired
+
+
+def test_waiting_for_a_page_past_the_deadline_raises_deadline_exceeded():
+    tool = WebNavigationTool(state_dir=None)
+
+    async def run():
+        tool._start_task = asyncio.ensure_future(asyncio.sleep(0))
+        tool.page_pool = PagePool(FakeBrowser(), {}, noop, size=1, prewarm=0)
+        async with tool.lease_page():
+            with deadline_scope(Deadline(0.05)):
+                async with tool.lease_page():
+                    pass
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(run())
+
+
+def test_deadline_scope_reaches_tasks_started_within_it():
+    async def remaining_in_task():
+        return await asyncio.create_task(asyncio.sleep(0, current_deadline().remaining()))
+
+    async def run():
+        outside = await remaining_in_task()
+        with deadline_scope(Deadline(30)):
+            inside = await remaining_in_task()
+        return outside, inside
+
+    outside, inside = asyncio.run(run())
+    assert outside == float("inf")
+    assert 29 < inside <= 30
+
+
+def test_steps_are_clipped_and_cancelled_at_the_deadline():
+    deadline = Deadline(0.05)
+    assert deadline.timeout(10) <= 0.05
+    assert 1 <= deadline.timeout_ms(10_000) <= 50
+
+    cancelled = []
+
+    async def slow_step():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(DeadlineExceeded, match="during fetch"):
+        asyncio.run(deadline.run(slow_step(), "fetch"))
+    assert cancelled == [True]
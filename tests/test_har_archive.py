@@ -0,0 +1,202 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+from openai.types.chat import ChatCompletion
+
+import utils.llm_client as llm_client
+import utils.politeness as politeness
+from utils.har_archive import ReplayMiss, configure_har_archive, har_scope, http_get
+from utils.llm_client import get_llm_client
+
+KEY = "req-1"
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        question = kwargs["messages"][-1]["content"]
+        return ChatCompletion.model_validate({
+            "id": f"chatcmpl-{self.calls}", "object": "chat.completion", "created": 0, "model": kwargs["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": f"answer {self.calls} to {question}"}}]
+        })
+
+
+class FakeOpenAI:
+    def __init__(self):
+        self.chat = type("Chat", (), {})()
+        self.chat.completions = FakeCompletions()
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    monkeypatch.setattr(politeness, "_scheduler", politeness.PolitenessScheduler(None))
+    monkeypatch.setattr(llm_client, "_client", None)
+    yield
+    configure_har_archive(None)
+
+
+async def workflow(url: str):
+    """Fetch a page and ask the LLM about it twice, the way a request does"""
+    async with aiohttp.ClientSession() as session:
+        page = await http_get(session, url)
+    client = get_llm_client()
+    answers = []
+    for question in ("title?", "location?"):
+        response = await client.chat.completions.create(
+            model="gpt-5-nano", temperature=1, timeout=30,
+            messages=[{"role": "system", "content": page.text}, {"role": "user", "content": question}]
+        )
+        answers.append(response.choices[0].message.content)
+    return page.status, page.text, answers
+
+
+def record(har_dir, monkeypatch):
+    async def page(request):
+        return web.Response(text="<h1>Data Engineer</h1>", content_type="text/html")
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/job", page)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            with har_scope(KEY):
+                return f"http://127.0.0.1:{port}/job", await workflow(f"http://127.0.0.1:{port}/job")
+        finally:
+            await runner.cleanup()
+
+    fake = FakeOpenAI()
+    monkeypatch.setattr(llm_client, "_client", fake)
+    archive = configure_har_archive("record", str(har_dir))
+    url, result = asyncio.run(run())
+    archive.finish(KEY)
+    return archive, fake, url, result
+
+
+def test_finish_writes_and_releases_recorded_entries(tmp_path, monkeypatch):
+    archive, fake, _, _ = record(tmp_path, monkeypatch)
+
+    assert fake.chat.completions.calls == 2
+    assert (tmp_path / f"{KEY}.har").exists()
+    assert archive.stats["recorded"] == 3
+    assert KEY not in archive._recorded
+
+    # A response finishing after the request was released is appended, not written over the HAR
+    archive.record(KEY, "GET", "http://127.0.0.1/late.css", 200, {"content-type": "text/css"}, b"", 0.0, "browser")
+    archive.finish(KEY)
+    assert len(archive._load(tmp_path / f"{KEY}.har")) == 4
+
+
+def test_replay_is_deterministic_without_network_or_api_key(tmp_path, monkeypatch):
+    _, _, url, recorded = record(tmp_path, monkeypatch)
+
+    # The stub server is gone and no OpenAI client may be created
+    monkeypatch.setattr(llm_client, "_client", None)
+    monkeypatch.setattr(llm_client, "_openai_client", lambda: pytest.fail("replay reached the OpenAI client"))
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    for _ in range(2):
+        archive = configure_har_archive("replay", str(tmp_path))
+
+        async def run():
+            with har_scope(KEY):
+                return await workflow(url)
+
+        assert asyncio.run(run()) == recorded
+        assert archive.stats == {"recorded": 0, "replayed": 3, "misses": 0}
+
+
+def test_replay_misses_a_prompt_that_was_never_recorded(tmp_path, monkeypatch):
+    record(tmp_path, monkeypatch)
+    configure_har_archive("replay", str(tmp_path))
+
+    async def run():
+        with har_scope(KEY):
+            await get_llm_client().chat.completions.create(
+                model="gpt-5-nano", messages=[{"role": "user", "content": "something else"}]
+            )
+
+    with pytest.raises(ReplayMiss):
+        asyncio.run(run())
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type="document", page=None):
+        self.url = url
+        self.method = "GET"
+        self.resource_type = resource_type
+        self.frame = type("Frame", (), {"page": page})()
+
+    def is_navigation_request(self):
+        return self.resource_type == "document"
+
+
+class FakeRoute:
+    def __init__(self, request):
+        self.request = request
+        self.outcome = None
+
+    async def fallback(self):
+        self.outcome = "fallback"
+
+    async def abort(self, error_code=None):
+        self.outcome = "abort"
+
+    async def fulfill(self, **kwargs):
+        self.outcome = "fulfill"
+
+
+class FakePage:
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+
+def test_replay_hands_blocked_requests_back_to_the_blocker(tmp_path):
+    from tools.request_blocker import RequestBlocker
+
+    archive = configure_har_archive("replay", str(tmp_path))
+    blocker = RequestBlocker()
+    image = FakeRoute(FakeRequest("https://acme.com/logo.png", "image"))
+    script = FakeRoute(FakeRequest("https://acme.com/app.js", "script"))
+
+    asyncio.run(archive._replay_route(image, blocker.blocks))
+    asyncio.run(archive._replay_route(script, blocker.blocks))
+
+    assert image.outcome == "fallback"
+    assert script.outcome == "abort" and archive.stats["misses"] == 1
+
+
+def test_other_requests_hars_are_only_searched_when_opted_in(tmp_path, monkeypatch):
+    _, _, url, _ = record(tmp_path, monkeypatch)
+
+    archive = configure_har_archive("replay", str(tmp_path))
+    assert archive._lookup("other-request", "GET", url) is None
+    assert archive._replay_all is None
+
+    archive = configure_har_archive("replay", str(tmp_path), match_any_request=True)
+    assert archive._lookup("other-request", "GET", url) is not None
+
+
+def test_page_keys_are_dropped_when_the_page_closes(tmp_path):
+    archive = configure_har_archive("record", str(tmp_path))
+    page = FakePage()
+
+    with har_scope(KEY):
+        archive.bind_page(page)
+        archive.bind_page(page)
+    assert archive._page_keys == {id(page): KEY}
+
+    page.handlers["close"](page)
+    assert archive._page_keys == {}
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from magents.lead_agent import LeadAgent
+from tools.json_feed_capture import JSONFeedCapture
+
+BASE_URL = "https://careers.acme.com/jobs"
+
+OFFICES = [{"name": "Berlin office", "location": "Berlin", "url": "/offices/berlin"},
+           {"name": "Paris office", "location": "Paris", "url": "/offices/paris"}]
+NAVIGATION = {"menu": [{"title": "Blog", "category": "news", "url": "/blog"},
+                       {"title": "Events", "category": "news", "url": "/events"}]}
+GREENHOUSE = {"jobs": [{"id": 1, "title": "Data Engineer", "location": {"name": "Berlin"},
+                        "absolute_url": "https://boards.greenhouse.io/acme/jobs/1"}]}
+LEVER = [{"id": "a1", "text": "Data Engineer", "hostedUrl": "https://jobs.lever.co/acme/a1",
+          "applyUrl": "https://jobs.lever.co/acme/a1/apply", "categories": {"location": "Remote"}}]
+
+
+@pytest.mark.parametrize("payload, titles", [
+    (OFFICES, []),
+    (NAVIGATION, []),
+    ({"data": {"offices": OFFICES}}, []),
+    (GREENHOUSE, ["Data Engineer"]),
+    (LEVER, ["Data Engineer"]),
+    # One hint is enough inside an array named like a job list
+    ({"jobPostings": [{"title": "Data Engineer", "team": "Data", "url": "/jobs/7"}]}, ["Data Engineer"]),
+], ids=["offices", "navigation", "nested-offices", "greenhouse", "lever", "job-container"])
+def test_only_job_feeds_are_taken_as_listings(payload, titles):
+    capture = JSONFeedCapture()
+    page = object()
+    capture._payloads[id(page)] = [{"url": "https://careers.acme.com/api/feed", "payload": payload}]
+
+    listings = asyncio.run(capture.job_listings(page, BASE_URL))
+
+    assert [listing["title"] for listing in listings] == titles
+
+
+class FakeCrawler:
+    async def crawl(self, extract):
+        items = await extract()
+        return {"items": items, "steps": []}
+
+
+def test_feed_listings_without_matches_fall_back_to_html_extraction():
+    agent = LeadAgent()
+    agent.listing_crawler = FakeCrawler()
+    agent.web_nav_tool = type("Nav", (), {"current_url": BASE_URL})()
+    navigations = []
+
+    async def navigate_to_url(url, ready_selectors=None):
+        navigations.append(url)
+        return {"success": True}
+
+    async def json_feed_listings():
+        return [{"title": "Berlin office", "url": "https://careers.acme.com/offices/berlin", "source": "json_feed"}]
+
+    async def scrape_current_page():
+        return {"html_content": "<a href='/jobs/1'>Data Engineer</a>"}
+
+    async def extract_job_links(html_content, job_params, seen=None):
+        return {"job_links": [{"title": "Data Engineer", "url": "https://careers.acme.com/jobs/1"}]}
+
+    async def find_all_job_matches(job_links, job_params):
+        return {"matches": [link for link in job_links if link["title"] == job_params["job_title"]]}
+
+    agent.web_agent = type("WebAgent", (), {"navigate_to_url": staticmethod(navigate_to_url),
+                                            "scrape_current_page": staticmethod(scrape_current_page)})()
+    agent.analyzer_agent = type("Analyzer", (), {"extract_job_links": staticmethod(extract_job_links),
+                                                 "find_all_job_matches": staticmethod(find_all_job_matches)})()
+    agent._json_feed_listings = json_feed_listings
+
+    matches = asyncio.run(agent._collect_job_matches({"job_title": "Data Engineer"}))
+
+    assert [match["url"] for match in matches] == ["https://careers.acme.com/jobs/1"]
+    assert navigations == [BASE_URL]
+
+
+class FakePage:
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+
+def test_closed_pages_are_forgotten():
+    capture = JSONFeedCapture()
+    page = FakePage()
+    capture.attach(page)
+
+    async def run():
+        pending = asyncio.ensure_future(asyncio.sleep(10))
+        capture._pending[id(page)] = {pending}
+        capture._payloads[id(page)] = [{"url": "https://careers.acme.com/api/feed", "payload": GREENHOUSE}]
+        page.handlers["close"](page)
+        await asyncio.sleep(0)
+        return pending
+
+    assert asyncio.run(run()).cancelled()
+    assert capture._payloads == {} and capture._pending == {}
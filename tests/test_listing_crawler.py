@@ -0,0 +1,59 @@
+import asyncio
+import json
+
+import pytest
+
+import tools.html_scraping_tool as html_scraping_tool
+from tools.html_scraping_tool import HTMLScrapingTool
+from tools.listing_crawler import ListingCrawler
+
+BASE_URL = "https://careers.acme.com/jobs"
+
+
+@pytest.mark.parametrize("html_content, expected", [
+    ('<a rel="next" href="/jobs?page=2">Next</a>', "https://careers.acme.com/jobs?page=2"),
+    ('<a rel="next" href="https://www.careers.acme.com/jobs?page=2">Next</a>', "https://www.careers.acme.com/jobs?page=2"),
+    ('<a rel="next" href="https://blog.othercorp.com/page/2">Next</a>', None),
+    ('<a href="https://partner.example.org/jobs?page=2">Next</a><a href="/jobs?page=2">next</a>',
+     "https://careers.acme.com/jobs?page=2"),
+])
+def test_next_link_stays_on_the_listing_host(html_content, expected):
+    assert ListingCrawler._next_link(html_content, BASE_URL) == expected
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.prompts = []
+
+    async def create(self, **kwargs):
+        self.prompts.append(kwargs["messages"][0]["content"])
+        content = json.dumps({"jobs_found": [], "total_jobs": 0, "analysis_notes": ""})
+        return type("Response", (), {"choices": [type("Choice", (), {
+            "message": type("Message", (), {"content": content})()
+        })()]})()
+
+
+def cards(count):
+    return "".join(f'<div class="card"><a href="/jobs/{i}">Job {i}</a><p>Team {i}</p></div>' for i in range(count))
+
+
+def test_later_steps_send_only_new_content_to_the_llm(monkeypatch):
+    completions = FakeCompletions()
+    client = type("Client", (), {"chat": type("Chat", (), {"completions": completions})()})()
+    monkeypatch.setattr(html_scraping_tool, "get_llm_client", lambda: client)
+
+    tool = HTMLScrapingTool()
+    seen = set()
+
+    async def run():
+        # Step 1, a "load more" click (cards 0-3 stay on the page), then a step that added nothing
+        for html_content in (cards(2), cards(4), cards(4)):
+            await tool._llm_analyze_jobs_heuristic(f"<nav>Acme careers</nav>{html_content}", "Job", seen)
+
+    asyncio.run(run())
+
+    assert len(completions.prompts) == 2
+    first, second = completions.prompts
+    assert "/jobs/0" in first and "Acme careers" in first
+    assert "/jobs/2" in second and "/jobs/3" in second
+    assert "/jobs/0" not in second and "Team 1" not in second and "Acme careers" not in second
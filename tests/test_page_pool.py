@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from tools.page_pool import PagePool
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def new_page(self):
+        return FakePage(self)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    async def new_context(self, **options):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+
+async def noop(page):
+    pass
+
+
+def make_pool(browser, **kwargs):
+    return PagePool(browser, {}, noop, **{"size": 2, "pages_per_context": 2, "prewarm": 1, **kwargs})
+
+
+def test_leases_are_bounded_by_size_and_pages_are_reused():
+    async def run():
+        pool = make_pool(FakeBrowser())
+        await pool.start()
+        first = await pool.acquire()
+        second = await pool.acquire()
+
+        # Full pool: the next lease waits, and gives up at its timeout
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.acquire(timeout=0.05)
+
+        await pool.release(first)
+        third = await pool.acquire()
+        await pool.release(second)
+        await pool.release(third)
+        return pool, first, third
+
+    pool, first, third = asyncio.run(run())
+    stats = pool.get_stats()
+    assert third.page is first.page
+    assert stats["pages_created"] == 2 and stats["contexts"] == 1
+    assert stats["acquisitions"] == 3 and stats["waits"] == 1 and stats["peak_in_use"] == 2
+    assert stats["in_use"] == 0 and stats["idle"] == 2 and stats["open_pages"] == 2
+
+
+def test_recycle_swaps_the_page_and_closes_the_emptied_context():
+    async def run():
+        pool = make_pool(FakeBrowser(), size=1, max_navigations_per_context=2)
+        lease = await pool.acquire()
+        old_page, old_context = lease.page, lease.context
+        pool.note_navigation(lease)
+        assert not pool.needs_recycle(lease)
+        pool.note_navigation(lease)
+        assert pool.needs_recycle(lease)
+
+        await pool.recycle(lease)
+        return pool, lease, old_page, old_context
+
+    pool, lease, old_page, old_context = asyncio.run(run())
+    assert old_page.closed and old_context.closed
+    assert lease.page is not old_page and lease.context is not old_context
+    assert pool.contexts == [lease.context]
+    stats = pool.get_stats()
+    assert stats["open_pages"] == 1 and stats["pages_discarded"] == 1 and stats["contexts_recycled"] == 1
+
+
+def test_rebind_moves_pages_to_the_new_browser_as_they_come_back():
+    old_browser, new_browser = FakeBrowser(), FakeBrowser()
+
+    async def run():
+        pool = make_pool(old_browser)
+        held = await pool.acquire()
+        idle = await pool.acquire()
+        await pool.release(idle)
+
+        await pool.rebind(new_browser)
+        # The idle page is discarded right away; the held one when it is returned
+        assert idle.page.closed and not held.page.closed
+        await pool.release(held)
+
+        lease = await pool.acquire()
+        return pool, held, lease
+
+    pool, held, lease = asyncio.run(run())
+    assert held.page.closed and old_browser.contexts[0].closed
+    assert lease.context.browser is new_browser
+    assert pool.get_stats()["open_pages"] == 1
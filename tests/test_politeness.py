@@ -0,0 +1,40 @@
+from utils.politeness import SHARED_HOSTS, PolitenessScheduler, split_shared_host_limits
+
+
+def test_only_shared_hosts_are_split_across_processes():
+    scheduler = PolitenessScheduler(2.0, max_concurrency=4, host_limits=split_shared_host_limits(2.0, 4, 8))
+
+    shared = scheduler._state("api.lever.co")
+    assert "api.lever.co" in SHARED_HOSTS
+    assert shared.bucket.rate == 0.25 and shared.bucket.capacity == 1
+    assert shared.slots._value == 1
+
+    company = scheduler._state("careers.acme.com")
+    assert company.bucket.rate == 2.0 and company.slots._value == 4
+
+
+def test_unlimited_rate_stays_unlimited():
+    limits = split_shared_host_limits(None, 4, 2)
+    assert all(limit["rate_per_second"] is None and limit["max_concurrency"] == 2 for limit in limits.values())
+
+
+def test_token_bucket_allows_a_burst_then_paces_at_its_rate():
+    import asyncio
+    import time
+
+    from utils.politeness import TokenBucket
+
+    async def timestamps(bucket, count):
+        started = time.monotonic()
+        stamps = []
+        for _ in range(count):
+            await bucket.acquire()
+            stamps.append(time.monotonic() - started)
+        return stamps
+
+    paced = asyncio.run(timestamps(TokenBucket(20.0, burst=2), 4))
+    assert paced[1] < 0.02
+    assert 0.04 < paced[2] < 0.1 and 0.09 < paced[3] < 0.15
+
+    unlimited = asyncio.run(timestamps(TokenBucket(None), 20))
+    assert unlimited[-1] < 0.02
@@ -0,0 +1,136 @@
+import asyncio
+
+from magents.lead_agent import LeadAgent, POSTING_READY_SELECTORS
+from utils.hedging import HedgePolicy
+
+
+class FakeHTTPFetchTool:
+    def __init__(self, mode="http", succeed=False):
+        self.mode = mode
+        self.succeed = succeed
+        self.calls = 0
+
+    def preferred_mode(self, url):
+        return self.mode
+
+    async def fetch_rendered_html(self, url, title=None):
+        self.calls += 1
+        if self.succeed:
+            return {"success": True, "html_content": "<html>http</html>"}
+        return {"success": False, "error": "needs JS"}
+
+
+def make_agent(http_fetch_tool, primary_delay=0.0):
+    agent = LeadAgent()
+    agent.http_fetch_tool = http_fetch_tool
+    agent.posting_hedge = HedgePolicy(initial_delay=0.05)
+    agent.browser_loads = []
+
+    async def fake_browser(job_match, ready_selectors=POSTING_READY_SELECTORS):
+        agent.browser_loads.append(ready_selectors)
+        if ready_selectors is POSTING_READY_SELECTORS:
+            await asyncio.sleep(primary_delay)
+            return "<html>primary</html>"
+        return "<html>backup</html>"
+
+    agent._fetch_job_posting_browser = fake_browser
+    return agent
+
+
+JOB = {"url": "https://jobs.example.com/1", "title": "Engineer"}
+
+
+def test_http_first_success_skips_browser():
+    agent = make_agent(FakeHTTPFetchTool(succeed=True))
+    assert asyncio.run(agent._fetch_job_posting(JOB)) == "<html>http</html>"
+    assert agent.browser_loads == []
+
+
+def test_browser_fallback_after_http_failure_is_hedged():
+    agent = make_agent(FakeHTTPFetchTool(), primary_delay=1.0)
+    assert asyncio.run(agent._fetch_job_posting(JOB)) == "<html>backup</html>"
+    assert agent.posting_hedge.stats["calls"] == 1
+    assert agent.posting_hedge.stats["backup_wins"] == 1
+    assert agent.browser_loads == [POSTING_READY_SELECTORS, None]
+
+
+def test_browser_only_domain_is_hedged_without_http():
+    http_fetch_tool = FakeHTTPFetchTool(mode="browser")
+    agent = make_agent(http_fetch_tool)
+    assert asyncio.run(agent._fetch_job_posting(JOB)) == "<html>primary</html>"
+    assert http_fetch_tool.calls == 0
+    assert agent.posting_hedge.stats["calls"] == 1
+
+
+def test_http_backup_is_used_when_http_first_is_off():
+    agent = make_agent(FakeHTTPFetchTool(succeed=True), primary_delay=1.0)
+    agent.http_first = False
+    assert asyncio.run(agent._fetch_job_posting(JOB)) == "<html>http</html>"
+    assert agent.posting_hedge.stats["backup_wins"] == 1
+    assert agent.browser_loads == [POSTING_READY_SELECTORS]
+
+
+class FakeBrowserPage:
+    def is_closed(self):
+        return False
+
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    async def new_page(self):
+        return FakeBrowserPage()
+
+
+class FakeBrowser:
+    async def new_context(self, **options):
+        return FakeContext()
+
+
+async def noop(page):
+    pass
+
+
+def test_saturated_pool_still_lets_backups_overlap_primaries():
+    from contextlib import asynccontextmanager
+    import time
+
+    from tools.page_pool import PagePool
+
+    agent = LeadAgent()
+    agent.http_fetch_tool = FakeHTTPFetchTool(mode="browser")
+    agent.posting_hedge = HedgePolicy(initial_delay=0.05)
+    pool = PagePool(FakeBrowser(), {}, noop, size=agent.page_pool_size, prewarm=0)
+    assert agent.page_pool_size == agent.max_parallel_postings + 1
+
+    @asynccontextmanager
+    async def lease_page():
+        lease = await pool.acquire()
+        try:
+            yield lease
+        finally:
+            await pool.release(lease)
+
+    async def navigate_to_url(url, ready_selectors=None):
+        # Primaries hang on their ready selectors; backups only wait for the page to settle
+        await asyncio.sleep(1.0 if ready_selectors is POSTING_READY_SELECTORS else 0.01)
+        return {"success": True}
+
+    async def scrape_current_page():
+        return {"success": True, "html_content": "<html>posting</html>"}
+
+    agent.web_nav_tool = type("Nav", (), {"lease_page": staticmethod(lease_page)})()
+    agent.web_agent = type("WebAgent", (), {"navigate_to_url": staticmethod(navigate_to_url),
+                                            "scrape_current_page": staticmethod(scrape_current_page)})()
+
+    async def run():
+        # The fan-out holds every posting page; backups run on the hedge headroom
+        jobs = [{"url": f"https://jobs.example.com/{i}", "title": "Engineer"} for i in range(agent.max_parallel_postings)]
+        return await asyncio.gather(*(agent._fetch_job_posting(job) for job in jobs))
+
+    started = time.monotonic()
+    asyncio.run(run())
+
+    assert time.monotonic() - started < 0.9
+    assert agent.posting_hedge.stats["backup_wins"] == agent.max_parallel_postings
@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from magents.web_agent import WebAgent
+from tools.html_scraping_tool import HTMLScrapingTool
+from utils.search_template_store import SearchTemplateStore, derive_template
+
+START_URL = "https://acme.com/jobs/"
+NAV = '<nav><a href="/jobs/">Jobs</a><a href="/careers/life">Life at Acme</a></nav>'
+
+
+class FakePage:
+    frames = []
+    main_frame = None
+
+
+class FakeNavigator:
+    """Serves fixed HTML per URL; unknown URLs load the site's soft-404 page"""
+
+    def __init__(self, pages, current_url=START_URL):
+        self.pages = pages
+        self.current_url = current_url
+        self.page = FakePage()
+
+    async def navigate_to_url(self, url, ready_selectors=None):
+        self.current_url = url
+        return {"success": True, "url": url}
+
+    async def get_page_html(self):
+        return self.pages.get(self.current_url, f"<html>{NAV}<h1>Page not found</h1></html>")
+
+
+def make_agent(tmp_path, pages):
+    navigator = FakeNavigator(pages)
+    scraping_tool = HTMLScrapingTool()
+    scraping_tool.set_web_navigator(navigator)
+    templates = SearchTemplateStore(str(tmp_path / "search_templates.json"))
+    templates.learn("acme.com", "https://acme.com/jobs/search?q=data+engineer", "data engineer")
+    return WebAgent(navigator, scraping_tool, None, templates), navigator, templates
+
+
+def search_with_template(agent, navigator):
+    async def run():
+        start_links = await agent.scraping_tool.job_link_urls()
+        return await agent._search_with_template("acme.com", START_URL, "Data Engineer", start_links)
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("search_url, job_title, expected", [
+    ("https://acme.com/jobs/search?q=jobs", "jobs", "https://acme.com/jobs/search?q={query}"),
+    ("https://acme.com/jobs/jobs", "jobs", "https://acme.com/jobs/{query}"),
+    ("https://acme.com/jobs/?team=jobs", "jobs", None),
+])
+def test_derive_template_leaves_route_segments_from_the_start_url_alone(search_url, job_title, expected):
+    # "jobs" as the title: the /jobs/ route and the team=jobs filter were already on the start page
+    start_url = "https://acme.com/jobs/?team=jobs"
+    derived = derive_template(search_url, job_title, start_url)
+    assert (derived["template"] if derived else None) == expected
+
+
+def test_template_that_opens_a_results_page_is_used(tmp_path):
+    results = (f'<html>{NAV}<p>2 jobs found for "Data Engineer"</p>'
+               '<a href="/jobs/101">Data Engineer</a><a href="/jobs/102">Senior Data Engineer</a></html>')
+    agent, navigator, templates = make_agent(tmp_path, {
+        START_URL: f"<html>{NAV}</html>",
+        "https://acme.com/jobs/search?q=Data+Engineer": results
+    })
+
+    result = search_with_template(agent, navigator)
+
+    assert result["success"] and result["method"] == "search_template"
+    assert templates.get_stats()["templates"] == 1
+
+
+def test_template_that_opens_a_non_results_page_is_forgotten(tmp_path):
+    agent, navigator, templates = make_agent(tmp_path, {START_URL: f"<html>{NAV}</html>"})
+
+    assert search_with_template(agent, navigator) is None
+    assert navigator.current_url == START_URL
+    assert templates.get_stats()["forgotten"] == 1 and templates.build_url("acme.com", "x") is None
+
+
+def build_search_form_url(html_content, page_url=START_URL):
+    scraping_tool = HTMLScrapingTool()
+    scraping_tool.set_web_navigator(FakeNavigator({page_url: html_content}, page_url))
+    return asyncio.run(scraping_tool.build_search_form_url("Data Engineer"))
+
+
+def test_form_without_action_submits_to_the_page_itself():
+    result = build_search_form_url('<form><input type="search" name="q"></form>', "https://acme.com/jobs/?page=3#top")
+    assert result["url"] == "https://acme.com/jobs/?q=Data+Engineer"
+
+
+def test_checked_boxes_radios_and_selects_are_submitted_with_their_values():
+    result = build_search_form_url("""
+        <form action="/jobs/search">
+          <input type="text" name="keywords" placeholder="Search jobs">
+          <input type="hidden" name="lang" value="en">
+          <input type="checkbox" name="remote" checked>
+          <input type="checkbox" name="intern" value="1">
+          <input type="radio" name="sort" value="relevance">
+          <input type="radio" name="sort" value="date" checked>
+          <select name="country"><option value="">Any</option><option value="de" selected>Germany</option></select>
+          <select name="team"><option>All teams</option><option>Data</option></select>
+          <button type="submit" name="go">Search</button>
+        </form>""")
+    assert result["search_input"] == "keywords"
+    assert result["url"] == ("https://acme.com/jobs/search?keywords=Data+Engineer&lang=en&remote=on"
+                             "&sort=date&country=de&team=All+teams")
+
+
+def test_action_query_string_is_replaced_like_a_browser_does():
+    result = build_search_form_url('<form action="/search?source=nav#results"><input name="q"></form>')
+    assert result["url"] == "https://acme.com/search?q=Data+Engineer"
+
+
+@pytest.mark.parametrize("html_content", [
+    '<form method="post" action="/search"><input type="search" name="q"></form>',
+    '<form action="/login"><input name="query"><input type="password" name="pw"></form>',
+    '<form action="/search" onsubmit="return runSearch()"><input type="search" name="q"></form>',
+    '<form action="javascript:void(0)"><input type="search" name="q"></form>',
+])
+def test_post_password_and_script_forms_are_left_to_the_browser(html_content):
+    assert build_search_form_url(html_content)["status"] == "search_form_not_found"
+
+
+def test_form_url_that_does_not_change_the_results_falls_back_to_the_browser(tmp_path):
+    # A form handled by a script listener: its URL just reloads the unsearched listing
+    listing = f'<html>{NAV}<form action="/jobs/"><input name="q"></form><a href="/jobs/1">Designer</a></html>'
+    agent, navigator, templates = make_agent(tmp_path, {
+        START_URL: listing,
+        "https://acme.com/jobs/?q=Data+Engineer": listing
+    })
+    templates.forget("acme.com")
+
+    async def run():
+        start_links = await agent.scraping_tool.job_link_urls()
+        return await agent._search_with_get_form("acme.com", START_URL, "Data Engineer", start_links)
+
+    assert asyncio.run(run()) is None
+    assert navigator.current_url == START_URL
+    assert templates.get_stats()["templates"] == 0
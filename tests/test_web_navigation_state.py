@@ -0,0 +1,47 @@
+import asyncio
+
+from tools.web_navigation_tool import WebNavigationTool
+
+
+class FakeContext:
+    def __init__(self):
+        self.cookies = []
+        self.init_scripts = []
+
+    async def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+    async def add_init_script(self, script=None):
+        self.init_scripts.append(script)
+
+
+class FakePage:
+    def __init__(self):
+        self.context = FakeContext()
+
+
+SAVED_STATE = {
+    "cookies": [{"name": "session", "value": "abc", "domain": ".example.com", "path": "/"}],
+    "origins": [{"origin": "https://www.example.com", "localStorage": [{"name": "consent", "value": "yes"}]}]
+}
+
+
+def test_restores_saved_domain_state_into_fresh_context(tmp_path):
+    tool = WebNavigationTool(state_dir=str(tmp_path))
+    tool.state_store.save("example.com", SAVED_STATE, {"selector": "#accept"})
+
+    tool.page = FakePage()
+    asyncio.run(tool._restore_domain_state("https://www.example.com/careers"))
+
+    context = tool.page.context
+    assert [cookie["name"] for cookie in context.cookies] == ["session"]
+    assert len(context.init_scripts) == 1
+    assert '"consent"' in context.init_scripts[0]
+
+    # Restored once per context, again for a new one
+    asyncio.run(tool._restore_domain_state("https://www.example.com/jobs"))
+    assert len(context.cookies) == 1
+
+    tool.page = FakePage()
+    asyncio.run(tool._restore_domain_state("https://www.example.com/jobs"))
+    assert len(tool.page.context.cookies) == 1
@@ -0,0 +1,114 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from magents.lead_agent import LeadAgent
+from magents.workflow_pipeline import WorkflowPipeline
+from utils.checkpoint_store import CheckpointStore
+
+MATCHES = [{"title": "Data Engineer", "url": f"https://careers.acme.com/jobs/{i}"} for i in (1, 2)]
+
+
+class FakeNav:
+    current_url = None
+
+    @asynccontextmanager
+    async def lease_page(self):
+        yield
+
+
+class FakePipelineAgent(LeadAgent):
+    """LeadAgent whose workflow steps are canned and counted"""
+
+    def __init__(self, company_gate=None):
+        super().__init__()
+        self.web_nav_tool = FakeNav()
+        self.use_ats_connectors = False
+        self.company_gate = company_gate
+        self.calls = {"company": 0, "careers": 0, "matches": 0, "fetch": 0}
+
+    async def _get_company_url(self, job_params):
+        self.calls["company"] += 1
+        if self.company_gate:
+            await self.company_gate.wait()
+        return "https://acme.com"
+
+    async def _find_careers_page(self, company_url):
+        self.calls["careers"] += 1
+        return "https://careers.acme.com"
+
+    async def _analyze_careers_page(self, careers_url, job_params, checkpoint):
+        return {}
+
+    async def _find_job_listings(self, careers_analysis, job_params):
+        return "https://careers.acme.com/jobs"
+
+    async def _collect_job_matches(self, job_params):
+        self.calls["matches"] += 1
+        return list(MATCHES)
+
+    async def _fetch_job_posting(self, job_match):
+        self.calls["fetch"] += 1
+        return f"<html>{job_match['url']}</html>"
+
+    async def _extract_job_posting(self, job_match, html_content, scrape_order, job_params):
+        return {"job_url": job_match["url"], "title": job_match["title"], "scrape_order": scrape_order}
+
+
+def request(i=0):
+    return {"request_id": str(i), "job_params": {"company_name": f"Acme {i}", "job_title": "Data Engineer"}}
+
+
+@pytest.mark.parametrize("stage_workers, pages", [
+    (None, 2 + 4 + 4 + 8 + 4 * 3 + 1),
+    ({"fetch": 20, "extract": 99}, 2 + 4 + 4 + 20 + 4 * 3 + 2),
+    ({"careers": 1, "unknown": 5}, 2 + 1 + 4 + 8 + 1 * 3 + 1),
+])
+def test_required_pages_covers_every_browser_worker_and_hedge_headroom(stage_workers, pages):
+    assert WorkflowPipeline.required_pages(stage_workers) == pages
+
+
+def test_feeding_blocks_on_a_full_first_queue():
+    async def run():
+        gate = asyncio.Event()
+        agent = FakePipelineAgent(company_gate=gate)
+        pipeline = WorkflowPipeline(agent, {"company": 1}, queue_size=2)
+        task = asyncio.create_task(pipeline.run([request(i) for i in range(6)]))
+
+        await asyncio.sleep(0.05)
+        # One request held by the company worker, the queue full, the rest not fed yet
+        queued = pipeline.queues["company"].qsize()
+        fed = agent.calls["company"]
+        gate.set()
+        return queued, fed, await task, agent
+
+    queued, fed, results, agent = asyncio.run(run())
+    assert queued == 2 and fed == 1
+    assert len(results) == 6 and all(result["jobs_found"] == 2 for result in results.values())
+    assert agent.calls["company"] == 6
+
+
+def test_checkpointed_requests_skip_finished_steps_and_postings():
+    completed, partial = request(0), request(1)
+    store = CheckpointStore("checkpoints")
+
+    done = store.new_checkpoint(completed["job_params"])
+    done["result"] = {"success": True, "jobs_found": 7}
+    store.save(done)
+
+    resumed = store.new_checkpoint(partial["job_params"])
+    resumed["workflow_steps"].update(company_url="https://acme.com", careers_url="https://careers.acme.com",
+                                     job_listings_url="https://careers.acme.com/jobs")
+    resumed["matches"] = list(MATCHES)
+    resumed["postings"][MATCHES[0]["url"]] = {"job_url": MATCHES[0]["url"], "title": "Data Engineer", "scrape_order": 1}
+    store.save(resumed)
+
+    agent = FakePipelineAgent()
+    agent.checkpoint_store = store
+    agent.resume = True
+    results = asyncio.run(WorkflowPipeline(agent).run([completed, partial]))
+
+    assert results["0"]["jobs_found"] == 7
+    assert results["1"]["jobs_found"] == 2
+    assert agent.calls == {"company": 0, "careers": 0, "matches": 0, "fetch": 1}
@@ -0,0 +1,430 @@
+"""
+ATS Connector Tool - Detects applicant tracking systems and reads their public job APIs
+"""
+
+import html
+import os
+import re
+from typing import Dict, Any, List, Optional
+from urllib.parse import urljoin, urlparse, urlencode, quote
+import aiohttp
+from bs4 import BeautifulSoup
+from utils.deadline import current_deadline
+from utils.har_archive import http_request
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Points every connector at one host (e.g. a local stand-in serving recorded fixtures)
+ATS_BASE_URL_ENV_VAR = "ROTIFER_ATS_BASE_URL"
+
+ATS_URL_PATTERNS = {
+    "greenhouse": [
+        r"(?:boards|job-boards)(?:\.eu)?\.greenhouse\.io/(?:embed/job_board(?:/js)?\?for=)?([\w-]+)",
+        r"boards-api\.greenhouse\.io/v1/boards/([\w-]+)"
+    ],
+    "lever": [r"jobs(\.eu)?\.lever\.co/([\w.-]+)"],
+    "smartrecruiters": [r"(?:jobs|careers)\.smartrecruiters\.com/([\w-]+)"],
+    "workday": [r"([\w-]+)\.(wd\d+)\.myworkdayjobs\.com/(?:[a-z]{2}-[A-Z]{2}/)?([\w-]+)"],
+    "successfactors": [r"([\w-]+\.jobs2web\.com)", r"(career\d*\.successfactors\.(?:com|eu))"]
+}
+
+# Platforms that serve the careers site from the company's own host, recognised by their markup
+ATS_HTML_MARKERS = {
+    "phenom": ["cdn.phenompeople.com", "phApp.ddo", "data-ph-at-id"],
+    "successfactors": ["rmkcdn.successfactors.com", "sfsf-jobs"]
+}
+
+GREENHOUSE_API = "https://boards-api.greenhouse.io/v1/boards"
+SMARTRECRUITERS_API = "https://api.smartrecruiters.com/v1/companies"
+
+class ATSConnectorTool:
+    def __init__(self, timeout: float = 20, max_jobs: int = 200, base_url: Optional[str] = None):
+        self.session = None
+        self.timeout = timeout
+        self.max_jobs = max_jobs
+        self.base_url = (base_url or os.getenv(ATS_BASE_URL_ENV_VAR) or "").rstrip("/") or None
+        self.stats = {"detected": 0, "searches": 0, "postings": 0, "api_calls": 0}
+
+    async def initialize(self):
+        """Initialize ATS Connector Tool for OpenAI Agents SDK"""
+        logger.info("Initializing ATS Connector Tool for OpenAI Agents SDK")
+        if self.base_url:
+            logger.info(f"ATS API calls go to {self.base_url}")
+        logger.info("ATS Connector Tool initialized")
+
+    async def _get_session(self):
+        """Get aiohttp session for the JSON APIs (created on first use)"""
+        if not self.session:
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+                'Accept': 'application/json, text/html;q=0.9, */*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.5'
+            }
+            self.session = aiohttp.ClientSession(headers=headers, connector=aiohttp.TCPConnector(limit=20))
+        return self.session
+
+    def _api_url(self, url: str) -> str:
+        """Rewrite a platform URL onto the configured stand-in host, if any"""
+        if not self.base_url:
+            return url
+        parsed = urlparse(url)
+        return f"{self.base_url}/{parsed.netloc}{parsed.path}" + (f"?{parsed.query}" if parsed.query else "")
+
+    async def _request(self, method: str, url: str, payload: Optional[Dict[str, Any]] = None, as_json: bool = True) -> Any:
+        """Call a platform endpoint; returns parsed JSON (or text) and raises on HTTP errors"""
+        deadline = current_deadline()
+        deadline.check("ATS API call")
+
+        session = await self._get_session()
+        timeout = aiohttp.ClientTimeout(total=max(0.001, deadline.timeout(self.timeout)))
+        self.stats["api_calls"] += 1
+
+        response = await http_request(session, method, self._api_url(url), json=payload, timeout=timeout)
+        if response.status >= 400:
+            raise Exception(f"HTTP {response.status} from {url}")
+        return response.json() if as_json else response.text
+
+    # --- detection ---
+
+    async def detect_platform(self, careers_url: str, html_content: Optional[str] = None,
+                              final_url: Optional[str] = None) -> Dict[str, Any]:
+        """Fingerprint the ATS behind a careers page - OpenAI Agents SDK compatible
+
+        The careers URL and the URL it redirected to are checked first. With the already loaded
+        page's HTML, the boards it embeds (iframe/script/embed sources) and platform markup are
+        checked too; plain links are ignored since they may point at another company's board.
+        """
+        logger.info(f"Detecting ATS platform for: {careers_url}")
+
+        try:
+            platform_info = None
+            for url in filter(None, [careers_url, final_url]):
+                platform_info = platform_info or self.url_platform(url)
+
+            if not platform_info and html_content:
+                for source in self._embedded_sources(html_content, final_url or careers_url):
+                    platform_info = platform_info or self.url_platform(source)
+                platform_info = platform_info or self._match_markup(final_url or careers_url, html_content)
+
+            if not platform_info:
+                return {"success": False, "error": "No known ATS platform detected", "status": "ats_not_detected"}
+
+            self.stats["detected"] += 1
+            logger.info(f"Detected ATS platform {platform_info['platform']}: {platform_info}")
+            return {
+                "success": True,
+                "platform": platform_info["platform"],
+                "platform_info": platform_info,
+                "status": "ats_detected"
+            }
+
+        except Exception as e:
+            logger.error(f"ATS detection failed for {careers_url}: {str(e)}")
+            return {"success": False, "error": str(e), "status": "ats_detection_failed"}
+
+    @staticmethod
+    def _embedded_sources(html_content: str, base_url: str) -> List[str]:
+        """URLs the page embeds or loads scripts from"""
+        soup = BeautifulSoup(html_content, 'html.parser')
+        sources = []
+        for element in soup.find_all(['iframe', 'script', 'embed', 'object']):
+            source = element.get('src') or element.get('data')
+            if source:
+                sources.append(urljoin(base_url, source))
+        # Frames merged into the page snapshot keep their URL on the wrapping section
+        for section in soup.find_all('section', attrs={'data-frame-url': True}):
+            sources.append(section['data-frame-url'])
+        return sources
+
+    @staticmethod
+    def url_platform(url: str) -> Optional[Dict[str, Any]]:
+        """Platform info when a URL is itself on a hosted board"""
+        for platform, patterns in ATS_URL_PATTERNS.items():
+            for pattern in patterns:
+                match = re.search(pattern, url)
+                if not match:
+                    continue
+
+                if platform == "greenhouse":
+                    token = match.group(1)
+                    if token in ("embed", "v1"):
+                        continue
+                    return {"platform": platform, "token": token, "board_url": f"https://boards.greenhouse.io/{token}"}
+                if platform == "lever":
+                    region, company = match.group(1) or "", match.group(2)
+                    return {"platform": platform, "company": company, "region": region,
+                            "board_url": f"https://jobs{region}.lever.co/{company}"}
+                if platform == "smartrecruiters":
+                    company = match.group(1)
+                    return {"platform": platform, "company": company,
+                            "board_url": f"https://jobs.smartrecruiters.com/{company}"}
+                if platform == "workday":
+                    tenant, instance, site = match.groups()
+                    host = f"{tenant}.{instance}.myworkdayjobs.com"
+                    return {"platform": platform, "host": host, "tenant": tenant, "site": site,
+                            "board_url": f"https://{host}/{site}"}
+                if platform == "successfactors":
+                    host = match.group(1)
+                    return {"platform": platform, "host": host, "board_url": f"https://{host}/search/"}
+        return None
+
+    @staticmethod
+    def _match_markup(careers_url: str, html_content: str) -> Optional[Dict[str, Any]]:
+        """Platform info for careers sites served from the company's own host"""
+        parsed = urlparse(careers_url)
+        for platform, markers in ATS_HTML_MARKERS.items():
+            if not any(marker in html_content for marker in markers):
+                continue
+
+            if platform == "phenom":
+                # Phenom paths start with /<country>/<language>, e.g. /global/en or /us/en
+                segments = [segment for segment in parsed.path.split("/") if segment][:2]
+                if len(segments) == 2 and len(segments[1]) == 2:
+                    country, language = segments
+                else:
+                    country, language = "global", "en"
+                return {"platform": platform, "host": parsed.netloc, "country": country, "language": language,
+                        "board_url": f"{parsed.scheme}://{parsed.netloc}/{country}/{language}/search-results"}
+            return {"platform": platform, "host": parsed.netloc, "board_url": f"{parsed.scheme}://{parsed.netloc}/search/"}
+        return None
+
+    # --- listings ---
+
+    async def search_jobs(self, platform_info: Dict[str, Any], keywords: str = "") -> Dict[str, Any]:
+        """List a board's open jobs through the platform API - OpenAI Agents SDK compatible"""
+        platform = platform_info["platform"]
+        logger.info(f"Listing {platform} jobs for '{keywords}'")
+
+        search = {
+            "greenhouse": self._greenhouse_search,
+            "lever": self._lever_search,
+            "smartrecruiters": self._smartrecruiters_search,
+            "workday": self._workday_search,
+            "successfactors": self._successfactors_search,
+            "phenom": self._phenom_search
+        }.get(platform)
+        if not search:
+            return {"success": False, "error": f"No connector for {platform}", "status": "ats_search_failed"}
+
+        try:
+            jobs = (await search(platform_info, keywords))[:self.max_jobs]
+            self.stats["searches"] += 1
+            logger.info(f"{platform} API returned {len(jobs)} jobs")
+            return {
+                "success": True,
+                "platform": platform,
+                "jobs": jobs,
+                "total_found": len(jobs),
+                "board_url": platform_info["board_url"],
+                "status": "ats_search_completed"
+            }
+        except Exception as e:
+            logger.error(f"{platform} job search failed: {str(e)}")
+            return {"success": False, "error": str(e), "platform": platform, "status": "ats_search_failed"}
+
+    @staticmethod
+    def _listing(title: str, url: str, location: Optional[str], ats: Dict[str, Any],
+                 description: str = "") -> Dict[str, Any]:
+        """A job link shaped like the ones extracted from listings pages"""
+        return {
+            "title": (title or "").strip(),
+            "url": url,
+            "location": location or None,
+            "description": description,
+            "source": "ats_api",
+            "ats": ats
+        }
+
+    async def _greenhouse_search(self, info: Dict[str, Any], keywords: str) -> List[Dict[str, Any]]:
+        data = await self._request("GET", f"{GREENHOUSE_API}/{info['token']}/jobs")
+        return [
+            self._listing(job.get("title"), job.get("absolute_url"), (job.get("location") or {}).get("name"),
+                          {"platform": "greenhouse", "token": info["token"], "id": job.get("id")})
+            for job in data.get("jobs", [])
+        ]
+
+    async def _lever_search(self, info: Dict[str, Any], keywords: str) -> List[Dict[str, Any]]:
+        data = await self._request("GET", f"https://api{info['region']}.lever.co/v0/postings/{info['company']}?mode=json")
+        return [
+            self._listing(job.get("text"), job.get("hostedUrl"), (job.get("categories") or {}).get("location"),
+                          {"platform": "lever", "company": info["company"], "region": info["region"], "id": job.get("id")},
+                          (job.get("descriptionPlain") or "")[:500])
+            for job in data
+        ]
+
+    async def _smartrecruiters_search(self, info: Dict[str, Any], keywords: str) -> List[Dict[str, Any]]:
+        jobs = []
+        offset = 0
+        while len(jobs) < self.max_jobs:
+            query = urlencode({"q": keywords, "limit": 100, "offset": offset})
+            data = await self._request("GET", f"{SMARTRECRUITERS_API}/{info['company']}/postings?{query}")
+            content = data.get("content", [])
+            for job in content:
+                location = job.get("location") or {}
+                jobs.append(self._listing(
+                    job.get("name"),
+                    f"https://jobs.smartrecruiters.com/{info['company']}/{job.get('id')}",
+                    ", ".join(part for part in (location.get("city"), location.get("country")) if part),
+                    {"platform": "smartrecruiters", "company": info["company"], "id": job.get("id")}
+                ))
+            offset += len(content)
+            if not content or offset >= data.get("totalFound", 0):
+                break
+        return jobs
+
+    async def _workday_search(self, info: Dict[str, Any], keywords: str) -> List[Dict[str, Any]]:
+        jobs = []
+        offset = 0
+        api = f"https://{info['host']}/wday/cxs/{info['tenant']}/{info['site']}"
+        while len(jobs) < self.max_jobs:
+            data = await self._request("POST", f"{api}/jobs", {
+                "appliedFacets": {}, "limit": 20, "offset": offset, "searchText": keywords
+            })
+            postings = data.get("jobPostings", [])
+            for job in postings:
+                path = job.get("externalPath", "")
+                jobs.append(self._listing(
+                    job.get("title"),
+                    f"https://{info['host']}/{info['site']}{path}",
+                    job.get("locationsText"),
+                    {"platform": "workday", "host": info["host"], "tenant": info["tenant"],
+                     "site": info["site"], "path": path}
+                ))
+            offset += len(postings)
+            if not postings or offset >= data.get("total", 0):
+                break
+        return jobs
+
+    async def _successfactors_search(self, info: Dict[str, Any], keywords: str) -> List[Dict[str, Any]]:
+        # Career Site Builder search endpoint; postings themselves are server-rendered pages
+        data = await self._request("POST", f"https://{info['host']}/services/recruiting/v1/jobs", {
+            "locale": "en_US", "pageNumber": 0, "sortBy": "", "keywords": keywords, "location": "",
+            "facetFilters": {}, "brand": "", "skills": [], "categoryId": 0, "alertId": "", "rcmCandidateId": ""
+        })
+        jobs = []
+        for result in data.get("jobSearchResult", []):
+            job = result.get("response", {})
+            locations = job.get("jobLocationShort") or []
+            jobs.append(self._listing(
+                job.get("unifiedStandardTitle") or job.get("title"),
+                f"https://{info['host']}/job/{quote(job.get('urlTitle') or '')}/{job.get('id')}/",
+                ", ".join(locations) if isinstance(locations, list) else locations,
+                {"platform": "successfactors", "host": info["host"], "id": job.get("id")}
+            ))
+        return jobs
+
+    async def _phenom_search(self, info: Dict[str, Any], keywords: str) -> List[Dict[str, Any]]:
+        data = await self._request("POST", f"https://{info['host']}/widgets", {
+            "lang": f"{info['language']}_{info['country']}", "deviceType": "desktop", "country": info["country"],
+            "pageName": "search-results", "ddoKey": "refineSearch", "sortBy": "", "subsearch": "",
+            "from": 0, "jobs": True, "counts": True, "all_fields": [], "size": min(self.max_jobs, 100),
+            "clearAll": False, "jdsource": "facets", "isSliderEnable": False, "pageId": "page20",
+            "siteType": "external", "keywords": keywords, "global": True, "selected_fields": {}
+        })
+        jobs = []
+        for job in ((data.get("refineSearch") or {}).get("data") or {}).get("jobs", []):
+            job_id = job.get("jobSeqNo") or job.get("jobId")
+            jobs.append(self._listing(
+                job.get("title"),
+                f"https://{info['host']}/{info['country']}/{info['language']}/job/{job_id}",
+                job.get("location") or job.get("cityStateCountry"),
+                {"platform": "phenom", "host": info["host"], "id": job_id},
+                re.sub(r"<[^>]+>", " ", job.get("descriptionTeaser") or "")[:500].strip()
+            ))
+        return jobs
+
+    # --- postings ---
+
+    async def fetch_posting_html(self, job_match: Dict[str, Any]) -> Dict[str, Any]:
+        """Posting content from the platform's detail endpoint, as HTML - OpenAI Agents SDK compatible"""
+        ats = job_match.get("ats") or {}
+        platform = ats.get("platform")
+
+        try:
+            detail = {
+                "greenhouse": self._greenhouse_detail,
+                "lever": self._lever_detail,
+                "smartrecruiters": self._smartrecruiters_detail,
+                "workday": self._workday_detail
+            }.get(platform)
+
+            if detail:
+                html_content = await detail(ats)
+            else:
+                # Phenom and SuccessFactors render postings on the server
+                html_content = await self._request("GET", job_match["url"], as_json=False)
+
+            self.stats["postings"] += 1
+            return {
+                "success": True,
+                "url": job_match["url"],
+                "html_content": html_content,
+                "html_length": len(html_content),
+                "status": "ats_posting_fetched"
+            }
+        except Exception as e:
+            logger.error(f"{platform} posting fetch failed for {job_match.get('url')}: {str(e)}")
+            return {"success": False, "error": str(e), "url": job_match.get("url"), "status": "ats_posting_failed"}
+
+    @staticmethod
+    def _posting_html(title: str, location: Optional[str], body_html: str, extra: Optional[Dict[str, str]] = None) -> str:
+        """Minimal posting page for the job data extraction step"""
+        details = "".join(f"<p><strong>{html.escape(name)}:</strong> {html.escape(str(value))}</p>"
+                          for name, value in (extra or {}).items() if value)
+        return (f"<html><head><title>{html.escape(title or '')}</title></head><body>"
+                f"<h1>{html.escape(title or '')}</h1>"
+                f"<p class=\"location\">{html.escape(location or '')}</p>{details}"
+                f"<div class=\"description\">{body_html}</div></body></html>")
+
+    async def _greenhouse_detail(self, ats: Dict[str, Any]) -> str:
+        job = await self._request("GET", f"{GREENHOUSE_API}/{ats['token']}/jobs/{ats['id']}")
+        return self._posting_html(job.get("title"), (job.get("location") or {}).get("name"),
+                                  html.unescape(job.get("content") or ""))
+
+    async def _lever_detail(self, ats: Dict[str, Any]) -> str:
+        job = await self._request("GET", f"https://api{ats['region']}.lever.co/v0/postings/{ats['company']}/{ats['id']}")
+        categories = job.get("categories") or {}
+        sections = "".join(f"<h3>{html.escape(section.get('text', ''))}</h3><ul>{section.get('content', '')}</ul>"
+                           for section in job.get("lists", []))
+        return self._posting_html(
+            job.get("text"), categories.get("location"),
+            (job.get("description") or "") + sections + (job.get("additional") or ""),
+            {"Commitment": categories.get("commitment"), "Team": categories.get("team")}
+        )
+
+    async def _smartrecruiters_detail(self, ats: Dict[str, Any]) -> str:
+        job = await self._request("GET", f"{SMARTRECRUITERS_API}/{ats['company']}/postings/{ats['id']}")
+        location = job.get("location") or {}
+        sections = ((job.get("jobAd") or {}).get("sections") or {}).values()
+        body = "".join(f"<h3>{html.escape(section.get('title') or '')}</h3>{section.get('text') or ''}"
+                       for section in sections if isinstance(section, dict))
+        return self._posting_html(
+            job.get("name"),
+            location.get("fullLocation") or ", ".join(part for part in (location.get("city"), location.get("country")) if part),
+            body,
+            {"Employment type": (job.get("typeOfEmployment") or {}).get("label")}
+        )
+
+    async def _workday_detail(self, ats: Dict[str, Any]) -> str:
+        data = await self._request("GET", f"https://{ats['host']}/wday/cxs/{ats['tenant']}/{ats['site']}{ats['path']}")
+        job = data.get("jobPostingInfo") or {}
+        return self._posting_html(
+            job.get("title"), job.get("location"), job.get("jobDescription") or "",
+            {"Time type": job.get("timeType"), "Posted": job.get("postedOn")}
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Platforms detected, searches, postings and API calls made"""
+        return dict(self.stats)
+
+    async def cleanup(self):
+        """Cleanup ATS connector resources"""
+        logger.info("Cleaning up ATS Connector Tool resources")
+        logger.info(f"ATS connector stats: {self.stats}")
+
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+        logger.info("ATS Connector Tool cleanup completed")
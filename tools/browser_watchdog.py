@@ -0,0 +1,65 @@
+"""
+Browser Watchdog - Tracks resident memory of the browser processes this process started
+"""
+
+import os
+import time
+from typing import Dict, Any, Optional
+from utils.logger import setup_logger
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = setup_logger(__name__)
+
+_warned_missing_psutil = False
+
+class BrowserWatchdog:
+    def __init__(self, rss_limit_mb: Optional[float] = None, check_interval: float = 10.0):
+        # None disables the limit; without psutil (see requirements.txt) memory cannot be read
+        self.rss_limit_mb = rss_limit_mb if psutil else None
+        self.check_interval = check_interval
+        self._last_check = 0.0
+        self.stats = {"checks": 0, "over_limit": 0, "last_rss_mb": None, "peak_rss_mb": None}
+
+        global _warned_missing_psutil
+        if rss_limit_mb and not psutil and not _warned_missing_psutil:
+            _warned_missing_psutil = True
+            logger.warning("psutil is not installed; browser memory limit is not enforced")
+
+    @staticmethod
+    def rss_mb() -> Optional[float]:
+        """Resident memory of all child processes (Playwright driver, Chromium and its renderers) in MB"""
+        if not psutil:
+            return None
+
+        total = 0
+        for child in psutil.Process(os.getpid()).children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return round(total / 1_000_000, 1)
+
+    def over_limit(self) -> bool:
+        """Whether the browser tree is above the limit (measured at most once per check_interval)"""
+        if not self.rss_limit_mb or time.monotonic() - self._last_check < self.check_interval:
+            return False
+        self._last_check = time.monotonic()
+
+        rss = self.rss_mb()
+        self.stats["checks"] += 1
+        self.stats["last_rss_mb"] = rss
+        self.stats["peak_rss_mb"] = max(self.stats["peak_rss_mb"] or 0, rss or 0)
+
+        if rss is not None and rss > self.rss_limit_mb:
+            self.stats["over_limit"] += 1
+            logger.warning(f"Browser processes use {rss} MB (limit {self.rss_limit_mb} MB); recycling contexts")
+            return True
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Memory checks and how often the limit was exceeded"""
+        return {"rss_limit_mb": self.rss_limit_mb, **self.stats}
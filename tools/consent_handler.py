@@ -0,0 +1,76 @@
+"""
+Consent Handler - Dismisses cookie/consent overlays from common consent frameworks
+"""
+
+import time
+from typing import Dict, Any, Optional
+from playwright.async_api import Page
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Accept buttons of common consent management platforms, most widespread first
+CONSENT_ACCEPT_SELECTORS = [
+    "#onetrust-accept-btn-handler",                                 # OneTrust
+    "#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll",       # Cookiebot
+    "#CybotCookiebotDialogBodyButtonAccept",                        # Cookiebot (legacy)
+    "#truste-consent-button",                                       # TrustArc
+    "#didomi-notice-agree-button",                                  # Didomi
+    "[data-testid='uc-accept-all-button']",                         # Usercentrics
+    ".qc-cmp2-summary-buttons button[mode='primary']",              # Quantcast
+    ".osano-cm-accept-all",                                         # Osano
+    ".cky-btn-accept",                                              # CookieYes
+    "[data-tid='banner-accept']",                                   # Termly
+    ".cmplz-accept",                                                # Complianz
+    ".iubenda-cs-accept-btn",                                       # iubenda
+    "#hs-eu-confirmation-button",                                   # HubSpot
+    ".cc-allow",                                                    # Cookie Consent (Osano OSS)
+    "[aria-label='Accept all cookies']",
+    "button:has-text('Accept all cookies')",
+    "button:has-text('Accept All')",
+    "button:has-text('Allow all')"
+]
+
+class ConsentHandler:
+    def __init__(self, timeout_ms: int = 1500, negative_ttl: float = 900.0):
+        self.timeout_ms = timeout_ms
+        # How long "no banner on this domain" is trusted before looking again
+        self.negative_ttl = negative_ttl
+        self.stats = {"checks": 0, "dismissed": 0, "skipped_cached": 0, "redetected": 0}
+
+    async def dismiss(self, page: Page, cached: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Click the consent accept button if one is visible
+
+        cached is this domain's previous result: a domain where no banner was found is skipped
+        until negative_ttl passes, and a known selector is tried first, then every other one.
+        """
+        if cached and not cached.get("selector") and time.time() - cached.get("checked_at", 0) < self.negative_ttl:
+            self.stats["skipped_cached"] += 1
+            return {"dismissed": False, "selector": None, "checked_at": cached["checked_at"], "cached": True}
+
+        self.stats["checks"] += 1
+        known = cached.get("selector") if cached else None
+        selectors = [known] + [selector for selector in CONSENT_ACCEPT_SELECTORS if selector != known] \
+            if known else CONSENT_ACCEPT_SELECTORS
+
+        for selector in selectors:
+            try:
+                button = page.locator(selector).first
+                if not await button.is_visible():
+                    continue
+                await button.click(timeout=self.timeout_ms)
+                self.stats["dismissed"] += 1
+                if known and selector != known:
+                    self.stats["redetected"] += 1
+                logger.info(f"Dismissed consent banner via {selector}")
+                return {"dismissed": True, "selector": selector, "checked_at": time.time(),
+                        "cached": selector == known}
+            except Exception as e:
+                logger.debug(f"Consent selector {selector} failed: {str(e)}")
+
+        # Nothing visible (the saved cookies may already hold the consent); cached as a negative result
+        return {"dismissed": False, "selector": None, "checked_at": time.time(), "cached": False}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Consent banner checks and dismissals"""
+        return dict(self.stats)
@@ -3,13 +3,30 @@ HTML Scraping Tool - Content extraction for OpenAI Agents SDK
 """
 
 import asyncio
-from typing import Dict, Any, List
+import re
+from typing import Dict, Any, List, Optional, Tuple
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlencode, urlparse, urlunparse
+from utils.deadline import current_deadline
+from utils.llm_client import get_llm_client
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Child frames collected per page, and how long one frame may take
+MAX_FRAMES = 10
+FRAME_TIMEOUT = 5
+
+# Name, id or placeholder of a text input that takes search terms
+SEARCH_INPUT_PATTERN = re.compile(r"search|keyword|query|^q$|^k$|^kw$|^term|^text$|job.?title|what", re.IGNORECASE)
+
+# Text of a search results page, including one that found nothing ("0 jobs", "No results for ...")
+RESULTS_MARKER_PATTERN = re.compile(
+    r"\b(?:\d[\d,.]*|no)\s+(?:jobs?|results?|positions?|openings?|vacancies|matches)\b"
+    r"|search results|results for|showing \d+",
+    re.IGNORECASE
+)
+
 class HTMLScrapingTool:
     def __init__(self):
         self.web_navigator = None
@@ -23,8 +40,12 @@ class HTMLScrapingTool:
         """Set the web navigator instance for the tool"""
         self.web_navigator = web_navigator
         
-    async def scrape_page(self, include_links: bool = False, clean_text: bool = False) -> Dict[str, Any]:
-        """Scrape current page content - OpenAI Agents SDK compatible"""
+    async def scrape_page(self, include_links: bool = False, clean_text: bool = False,
+                          include_frames: bool = True) -> Dict[str, Any]:
+        """Scrape current page content - OpenAI Agents SDK compatible
+        
+        With include_frames, the content of child frames is merged into the HTML.
+        """
         if not self.web_navigator or not self.web_navigator.page:
             return {"success": False, "error": "No active web navigator or page"}
             
@@ -32,13 +53,17 @@ class HTMLScrapingTool:
         
         try:
             # Get HTML content
-            html_content = await self.web_navigator.get_page_html()
+            if include_frames:
+                html_content, frames = await self._get_page_content()
+            else:
+                html_content, frames = await self.web_navigator.get_page_html(), []
             
             result = {
                 "success": True,
                 "html_content": html_content,
                 "html_length": len(html_content),
                 "current_url": self.web_navigator.page.url,
+                "frames": [{key: frame[key] for key in ("url", "name", "parent_url", "html_length")} for frame in frames],
                 "status": "scraping_completed"
             }
             
@@ -71,7 +96,7 @@ class HTMLScrapingTool:
         logger.info(f"Finding elements with selectors: {selectors}")
         
         try:
-            html_content = await self.web_navigator.get_page_html()
+            html_content, _ = await self._get_page_content()
             soup = BeautifulSoup(html_content, 'html.parser')
             
             results = {}
@@ -120,7 +145,7 @@ class HTMLScrapingTool:
         logger.info("Extracting job-related links")
         
         try:
-            html_content = await self.web_navigator.get_page_html()
+            html_content, _ = await self._get_page_content()
             current_url = self.web_navigator.page.url
             
             job_links = await self._find_job_links(html_content, current_url)
@@ -151,13 +176,19 @@ class HTMLScrapingTool:
         try:
             html_content = await self.web_navigator.get_page_html()
             soup = BeautifulSoup(html_content, 'html.parser')
+            base_url = self.web_navigator.current_url or ""
             
             forms = []
             
             for form in soup.find_all('form'):
                 form_data = {
                     'action': form.get('action'),
-                    'method': form.get('method', 'GET').upper(),
+                    # Where the browser would submit it (no action = the page itself)
+                    'action_url': urljoin(base_url, form.get('action') or ''),
+                    'method': (form.get('method') or 'GET').upper(),
+                    'id': form.get('id'),
+                    'role': form.get('role'),
+                    'has_onsubmit': form.has_attr('onsubmit'),
                     'inputs': [],
                     'selects': [],
                     'textareas': [],
@@ -172,18 +203,24 @@ class HTMLScrapingTool:
                         'id': input_elem.get('id'),
                         'placeholder': input_elem.get('placeholder'),
                         'required': input_elem.has_attr('required'),
-                        'value': input_elem.get('value')
+                        'value': input_elem.get('value'),
+                        'checked': input_elem.has_attr('checked')
                     }
                     form_data['inputs'].append(input_data)
                     
                 # Extract selects
                 for select_elem in form.find_all('select'):
-                    options = [opt.get_text(strip=True) for opt in select_elem.find_all('option')]
+                    option_elems = select_elem.find_all('option')
+                    options = [opt.get_text(strip=True) for opt in option_elems]
+                    # The value submitted as-is: the selected option, else the first one
+                    selected = next((opt for opt in option_elems if opt.has_attr('selected')),
+                                    option_elems[0] if option_elems else None)
                     select_data = {
                         'name': select_elem.get('name'),
                         'id': select_elem.get('id'),
                         'required': select_elem.has_attr('required'),
-                        'options': options
+                        'options': options,
+                        'value': (selected.get('value', selected.get_text(strip=True)) if selected else None)
                     }
                     form_data['selects'].append(select_data)
                     
@@ -228,6 +265,121 @@ class HTMLScrapingTool:
                 "status": "form_extraction_failed"
             }
             
+    async def build_search_form_url(self, job_title: str) -> Dict[str, Any]:
+        """Results URL of the page's GET search form filled with a job title - OpenAI Agents SDK compatible
+        
+        POST forms and forms marked as JavaScript-driven (onsubmit, javascript: action) are left to the
+        browser; a form wired up by script listeners still gets a URL, so callers confirm with
+        check_search_results that it loaded a results page before skipping the browser.
+        """
+        forms_result = await self.extract_forms()
+        if not forms_result.get("success"):
+            return forms_result
+            
+        best = None
+        for form in forms_result["forms"]:
+            candidate = self._search_form_candidate(form)
+            if candidate and (not best or candidate[0] > best[0]):
+                best = candidate
+                
+        if not best:
+            return {"success": False, "error": "No GET search form found", "status": "search_form_not_found"}
+            
+        _, form, search_input = best
+        fields = []
+        for input_data in form["inputs"]:
+            name = input_data["name"]
+            input_type = (input_data["type"] or "text").lower()
+            if not name or input_type in ("submit", "button", "reset", "image", "file", "password"):
+                continue
+            if input_type in ("checkbox", "radio") and not input_data["checked"]:
+                continue
+            if input_data is search_input:
+                fields.append((name, job_title))
+            elif input_type in ("checkbox", "radio"):
+                fields.append((name, input_data["value"] or "on"))
+            else:
+                fields.append((name, input_data["value"] or ""))
+        for select_data in form["selects"]:
+            if select_data["name"] and select_data["value"] is not None:
+                fields.append((select_data["name"], select_data["value"]))
+                
+        # As in a browser, a GET submission replaces the action's query string
+        action = urlparse(form["action_url"])
+        search_url = urlunparse(action._replace(query=urlencode(fields), fragment=""))
+        logger.info(f"Built search URL from GET form: {search_url}")
+        
+        return {
+            "success": True,
+            "url": search_url,
+            "search_input": search_input["name"],
+            "status": "search_url_built"
+        }
+        
+    async def job_link_urls(self) -> set:
+        """URLs of the job-related links on the current page (empty if it cannot be read)"""
+        try:
+            html_content, _ = await self._get_page_content()
+            return {link["url"] for link in await self._find_job_links(html_content, self.web_navigator.current_url or "")}
+        except Exception as e:
+            logger.debug(f"Job link collection failed: {str(e)}")
+            return set()
+        
+    async def check_search_results(self, job_title: str, start_links: set) -> Dict[str, Any]:
+        """Whether the current page looks like results of a search for job_title - OpenAI Agents SDK compatible
+        
+        start_links are the job links of the page the search started from; a results page adds job
+        links of its own, or at least says how many results the terms gave.
+        """
+        try:
+            html_content, _ = await self._get_page_content()
+            job_links = await self._find_job_links(html_content, self.web_navigator.current_url or "")
+            new_links = {link["url"] for link in job_links} - start_links
+            
+            text = " ".join(BeautifulSoup(html_content, 'html.parser').get_text(" ").split()).lower()
+            has_markers = bool(RESULTS_MARKER_PATTERN.search(text)) and " ".join(job_title.lower().split()) in text
+            
+            return {
+                "success": True,
+                "looks_like_results": bool(new_links) or has_markers,
+                "new_job_links": len(new_links),
+                "has_markers": has_markers,
+                "status": "search_results_checked"
+            }
+            
+        except Exception as e:
+            logger.error(f"Search results check failed: {str(e)}")
+            return {"success": False, "looks_like_results": False, "error": str(e), "status": "search_results_check_failed"}
+            
+    @staticmethod
+    def _search_form_candidate(form: Dict[str, Any]) -> Optional[Tuple[int, Dict[str, Any], Dict[str, Any]]]:
+        """(score, form, search input) for a GET form a browser could submit without JavaScript"""
+        if form["method"] != "GET" or form["has_onsubmit"]:
+            return None
+        if (form["action"] or "").strip().lower().startswith("javascript:"):
+            return None
+        if urlparse(form["action_url"]).scheme not in ("http", "https"):
+            return None
+        if any((input_data["type"] or "").lower() == "password" for input_data in form["inputs"]):
+            return None
+            
+        best = None
+        for input_data in form["inputs"]:
+            input_type = (input_data["type"] or "text").lower()
+            if not input_data["name"] or input_type not in ("text", "search"):
+                continue
+                
+            score = 3 if input_type == "search" else 0
+            hints = " ".join(filter(None, [input_data["name"], input_data["id"], input_data["placeholder"]]))
+            if any(SEARCH_INPUT_PATTERN.search(hint) for hint in hints.split()):
+                score += 2
+            if "search" in " ".join(filter(None, [form["action"], form["id"], form["role"]])).lower():
+                score += 1
+                
+            if score and (not best or score > best[0]):
+                best = (score, form, input_data)
+        return best
+        
     async def check_for_iframes(self) -> Dict[str, Any]:
         """Check for iframes - OpenAI Agents SDK compatible"""
         if not self.web_navigator or not self.web_navigator.page:
@@ -270,6 +422,75 @@ class HTMLScrapingTool:
                 "status": "iframe_check_failed"
             }
             
+    async def collect_frames(self) -> List[Dict[str, Any]]:
+        """Collect the HTML of the page's child frames (cross-origin included) in parallel"""
+        page = self.web_navigator.page
+        frames = [
+            frame for frame in page.frames
+            if frame != page.main_frame and not frame.is_detached() and frame.url not in ("", "about:blank")
+        ][:MAX_FRAMES]
+        if not frames:
+            return []
+            
+        collected = await asyncio.gather(*(self._collect_frame(frame) for frame in frames))
+        collected = [frame for frame in collected if frame]
+        logger.info(f"Collected content from {len(collected)}/{len(frames)} frames")
+        return collected
+        
+    async def _collect_frame(self, frame) -> Optional[Dict[str, Any]]:
+        """One frame's HTML with where it came from, or None if it could not be read in time"""
+        try:
+            html_content = await asyncio.wait_for(
+                self.web_navigator.get_frame_html(frame),
+                current_deadline().timeout(FRAME_TIMEOUT)
+            )
+        except Exception as e:
+            logger.debug(f"Skipping frame {frame.url}: {str(e)}")
+            return None
+            
+        parent = frame.parent_frame
+        return {
+            "url": frame.url,
+            "name": frame.name,
+            "parent_url": parent.url if parent else None,
+            "html": html_content,
+            "html_length": len(html_content)
+        }
+        
+    def _merge_frames(self, html_content: str, frames: List[Dict[str, Any]]) -> str:
+        """Append each frame's body to the page HTML in a <section> tagged with its origin"""
+        if not frames:
+            return html_content
+            
+        soup = BeautifulSoup(html_content, 'html.parser')
+        container = soup.body or soup
+        
+        for frame in frames:
+            frame_soup = BeautifulSoup(frame["html"], 'html.parser')
+            
+            # Frame links are relative to the frame, not the page it is embedded in
+            for tag in frame_soup.find_all(href=True):
+                tag['href'] = urljoin(frame["url"], tag['href'])
+            for tag in frame_soup.find_all('form', action=True):
+                tag['action'] = urljoin(frame["url"], tag['action'])
+                
+            section = soup.new_tag("section", attrs={
+                "data-frame-url": frame["url"],
+                "data-frame-name": frame["name"] or "",
+                "data-frame-parent": frame["parent_url"] or ""
+            })
+            for child in list((frame_soup.body or frame_soup).contents):
+                section.append(child)
+            container.append(section)
+            
+        return str(soup)
+        
+    async def _get_page_content(self) -> Tuple[str, List[Dict[str, Any]]]:
+        """Page HTML with child frame content merged in, and the frames it came from"""
+        html_content = await self.web_navigator.get_page_html()
+        frames = await self.collect_frames()
+        return self._merge_frames(html_content, frames), frames
+        
     async def _extract_all_links(self, html_content: str, base_url: str) -> List[Dict[str, Any]]:
         """Extract all links from HTML content"""
         soup = BeautifulSoup(html_content, 'html.parser')
@@ -424,15 +645,19 @@ class HTMLScrapingTool:
         
         return unique_links
     
-    async def extract_job_listings_with_llm(self, job_title: str) -> Dict[str, Any]:
-        """Use LLM to analyze page and extract job listings intelligently"""
+    async def extract_job_listings_with_llm(self, job_title: str, seen: Optional[set] = None) -> Dict[str, Any]:
+        """Use LLM to analyze page and extract job listings intelligently
+
+        seen collects the text lines and links already sent to the LLM while crawling one listing;
+        only the rest of the page is analyzed, and nothing new means no LLM call at all.
+        """
         if not self.web_navigator or not self.web_navigator.page:
             return {"success": False, "error": "No active web navigator or page"}
             
         logger.info("Using LLM to analyze page for job listings")
         
         try:
-            html_content = await self.web_navigator.get_page_html()
+            html_content, _ = await self._get_page_content()
             print("YES HTMNL CONTENT")
             # Clean HTML for LLM analysis
             soup = BeautifulSoup(html_content, 'html.parser')
@@ -481,7 +706,7 @@ class HTMLScrapingTool:
             # For now, use heuristic analysis (replace with actual LLM call)
             print(html_content[:100])
             print(job_title)
-            analysis_result = await self._llm_analyze_jobs_heuristic(html_content, job_title)
+            analysis_result = await self._llm_analyze_jobs_heuristic(html_content, job_title, seen)
             
             return {
                 "success": True,
@@ -494,11 +719,9 @@ class HTMLScrapingTool:
             logger.error(f"LLM job extraction failed: {str(e)}")
             return {"success": False, "error": str(e)}
 
-    async def _llm_analyze_jobs_heuristic(self, html_content: str, job_title: str) -> Dict[str, Any]:
+    async def _llm_analyze_jobs_heuristic(self, html_content: str, job_title: str,
+                                          seen: Optional[set] = None) -> Dict[str, Any]:
         """Use GPT to find job listings in HTML"""
-        from openai import AsyncOpenAI
-        import os
-        client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         soup = BeautifulSoup(html_content, 'html.parser')
         
         # Remove scripts/styles but keep structure
@@ -527,6 +750,20 @@ class HTMLScrapingTool:
             for link in all_links
         )
 
+        if seen is not None:
+            # Later crawl steps only send what earlier steps did not (new cards, not the ones loaded before)
+            text_lines = [line.strip() for line in soup.get_text("\n").splitlines() if line.strip()]
+            link_lines = [line for line in links_text.splitlines() if line.strip()]
+            new_text = [line for line in dict.fromkeys(text_lines) if line not in seen]
+            new_links = [line for line in dict.fromkeys(link_lines) if line not in seen]
+            seen.update(new_text, new_links)
+            if not new_links:
+                logger.info("No new links since the last listing step, skipping LLM extraction")
+                return {"jobs_found": [], "total_jobs": 0, "analysis_notes": "No new content"}
+            text_content = "\n".join(new_text)
+            links_text = "\n".join(new_links)
+
+        client = get_llm_client()
         
         prompt = f"""Analyze this page content and find job listings/postings for: "{job_title}"
 
@@ -545,7 +782,8 @@ class HTMLScrapingTool:
             response = await client.chat.completions.create(
                 model="gpt-5-nano",
                 messages=[{"role": "user", "content": prompt}],
-                temperature=1
+                temperature=1,
+                timeout=current_deadline().timeout(60)
             )
             
             import json
@@ -0,0 +1,175 @@
+"""
+HTTP Fetch Tool - Plain aiohttp page fetches without a browser
+"""
+
+import asyncio
+import re
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+import aiohttp
+from bs4 import BeautifulSoup
+from utils.deadline import current_deadline
+from utils.har_archive import http_get
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Empty mount points left by client-rendered apps
+SPA_MARKERS = [
+    r'<div[^>]+id=["\'](root|app|__next|__nuxt)["\'][^>]*>\s*</div>',
+    r'<app-root[^>]*>\s*</app-root>',
+    r'ng-version=',
+    r'data-reactroot'
+]
+
+JOB_TEXT_MARKERS = ['responsibilit', 'qualification', 'requirement', 'apply', 'experience', 'job description']
+
+class HTTPFetchTool:
+    def __init__(self, timeout: float = 30):
+        self.session = None
+        self.timeout = timeout
+
+        # Per-domain fetch mode learned from earlier pages: "http" or "browser"
+        self.domain_modes = {}
+        self.stats = {"http_served": 0, "escalated": 0}
+
+    async def initialize(self):
+        """Initialize HTTP Fetch Tool for OpenAI Agents SDK"""
+        logger.info("Initializing HTTP Fetch Tool for OpenAI Agents SDK")
+        logger.info("HTTP Fetch Tool initialized")
+
+    async def _get_session(self):
+        """Get aiohttp session with browser-like headers (created on first use)"""
+        if not self.session:
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.5'
+            }
+
+            connector = aiohttp.TCPConnector(limit=20)
+            self.session = aiohttp.ClientSession(headers=headers, connector=connector)
+        return self.session
+
+    async def fetch_html(self, url: str) -> Dict[str, Any]:
+        """Fetch a page's HTML over plain HTTP - OpenAI Agents SDK compatible"""
+        logger.info(f"HTTP fetching: {url}")
+
+        try:
+            deadline = current_deadline()
+            deadline.check("HTTP fetch")
+
+            session = await self._get_session()
+            timeout = aiohttp.ClientTimeout(total=max(0.001, deadline.timeout(self.timeout)))
+
+            response = await http_get(session, url, timeout=timeout, allow_redirects=True)
+            html_content = response.text
+
+            if response.status >= 400:
+                return {
+                    "success": False,
+                    "error": f"HTTP {response.status}",
+                    "status_code": response.status,
+                    "url": response.url,
+                    "status": "http_fetch_failed"
+                }
+
+            return {
+                "success": True,
+                "url": response.url,
+                "status_code": response.status,
+                "content_type": response.headers.get("Content-Type", ""),
+                "html_content": html_content,
+                "html_length": len(html_content),
+                "status": "http_fetch_completed"
+            }
+
+        except asyncio.TimeoutError:
+            logger.error(f"HTTP fetch timeout for: {url}")
+            return {"success": False, "error": "Timeout", "url": url, "status": "http_fetch_failed"}
+        except Exception as e:
+            logger.error(f"HTTP fetch failed for {url}: {str(e)}")
+            return {"success": False, "error": str(e), "url": url, "status": "http_fetch_failed"}
+
+    def detect_js_shell(self, html_content: str, expected_text: Optional[str] = None) -> Dict[str, Any]:
+        """Decide whether HTML is a client-rendered shell that needs a browser"""
+        soup = BeautifulSoup(html_content, 'html.parser')
+        noscript_text = " ".join(tag.get_text(" ", strip=True).lower() for tag in soup.find_all('noscript'))
+        for element in soup(["script", "style", "noscript", "template"]):
+            element.decompose()
+
+        text = soup.get_text(" ", strip=True)
+        text_lower = text.lower()
+        has_spa_marker = any(re.search(marker, html_content, re.I) for marker in SPA_MARKERS)
+
+        if len(text) < 200:
+            reason = f"almost no text ({len(text)} chars)"
+        elif "enable javascript" in noscript_text and len(text) < 1000:
+            reason = "page asks for JavaScript"
+        elif has_spa_marker and len(text) < 1000:
+            reason = "empty single-page-app mount point"
+        elif expected_text and not self._mentions(text_lower, expected_text) \
+                and not any(marker in text_lower for marker in JOB_TEXT_MARKERS):
+            reason = "no job text in the server-rendered HTML"
+        else:
+            return {"is_shell": False, "reason": "server-rendered content", "text_length": len(text)}
+
+        return {"is_shell": True, "reason": reason, "text_length": len(text)}
+
+    def _mentions(self, text_lower: str, expected_text: str) -> bool:
+        """Whether most words of the expected text appear in the page text"""
+        words = [word for word in re.findall(r'\w+', expected_text.lower()) if len(word) > 2]
+        if not words:
+            return True
+        return sum(1 for word in words if word in text_lower) >= max(1, len(words) // 2)
+
+    @staticmethod
+    def _domain(url: str) -> str:
+        return (urlparse(url).hostname or "").lower()
+
+    def preferred_mode(self, url: str) -> Optional[str]:
+        """Fetch mode remembered for the URL's domain, or None if not known yet"""
+        return self.domain_modes.get(self._domain(url))
+
+    def remember_mode(self, url: str, mode: str):
+        """Remember how pages on the URL's domain should be fetched"""
+        domain = self._domain(url)
+        if self.domain_modes.get(domain) != mode:
+            logger.info(f"Fetching {domain} via {mode} from now on")
+        self.domain_modes[domain] = mode
+
+    async def fetch_rendered_html(self, url: str, expected_text: Optional[str] = None) -> Dict[str, Any]:
+        """HTTP fetch that only succeeds when the page does not need a browser to render"""
+        fetch_result = await self.fetch_html(url)
+        if not fetch_result.get("success"):
+            # Bot walls usually let a real browser through
+            if fetch_result.get("status_code") in (401, 403):
+                self.remember_mode(url, "browser")
+            return fetch_result
+
+        shell = self.detect_js_shell(fetch_result["html_content"], expected_text)
+        if shell["is_shell"]:
+            self.stats["escalated"] += 1
+            self.remember_mode(url, "browser")
+            return {
+                "success": False,
+                "error": f"JS shell: {shell['reason']}",
+                "url": url,
+                "needs_browser": True,
+                "status": "http_fetch_js_shell"
+            }
+
+        self.stats["http_served"] += 1
+        self.remember_mode(url, "http")
+        return fetch_result
+
+    async def cleanup(self):
+        """Cleanup HTTP fetch tool resources"""
+        logger.info("Cleaning up HTTP Fetch Tool resources")
+        logger.info(f"HTTP fetch stats: {self.stats} ({len(self.domain_modes)} domains learned)")
+
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+        logger.info("HTTP Fetch Tool cleanup completed")
@@ -8,6 +8,8 @@ from fuzzywuzzy import fuzz
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 import re
+from utils.deadline import current_deadline
+from utils.llm_client import get_llm_client
 from utils.logger import setup_logger
 import json
 
@@ -27,23 +29,7 @@ class JobMatchingTool:
         logger.info("Finding careers page link")
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            links = []
-            
-            # Extract all links
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                text = link.get_text(strip=True).lower()
-                
-                # Convert relative URLs to absolute
-                if href.startswith('/') or not href.startswith(('http://', 'https://')):
-                    href = urljoin(base_url, href)
-                    
-                links.append({
-                    'url': href,
-                    'text': text,
-                    'href_original': link['href']
-                })
+            links = self._extract_links(html_content, base_url)
             
             # Write all links to links.json file
             try:
@@ -63,58 +49,21 @@ class JobMatchingTool:
                 logger.error(f"Failed to write links to file: {str(file_error)}")
             
             # Find best careers link using fuzzy matching
-            careers_keywords = ['career', 'job', 'hiring', 'opportunity', 'employment', 'join', 'work', 'talent', 'careers', 'karriere']
-            
             best_match = None
             best_score = 0
             
             for link in links:
-                text = link['text']
-                url = link['url'].lower()
-                
-                score = 0
-                
-                # Direct keyword matching
-                for keyword in careers_keywords:
-                    if keyword in text:
-                        score += 30
-                    if keyword in url:
-                        score += 25
-                        
-                # Fuzzy matching for variations
-                for keyword in careers_keywords:
-                    text_similarity = fuzz.partial_ratio(keyword, text)
-                    url_similarity = fuzz.partial_ratio(keyword, url)
-                    
-                    if text_similarity > 80:
-                        score += 20
-                    if url_similarity > 80:
-                        score += 15
-                
-                # Bonus for official indicators
-                official_words = ['official', 'corporate', 'company']
-                if any(word in text or word in url for word in official_words):
-                    score += 10
-                    
-                # Penalty for non-careers content
-                penalty_words = ['news', 'blog', 'contact', 'about', 'investor']
-                if any(word in text or word in url for word in penalty_words):
-                    score -= 15
-                
-                # Add score to link for debugging
-                link['score'] = score
+                link['score'] = self._score_careers_link(link)
                 
-                if score > best_score:
-                    best_score = score
+                if link['score'] > best_score:
+                    best_score = link['score']
                     best_match = link
                     
             if best_match and best_score > 20:
-                confidence = "high" if best_score > 60 else "medium" if best_score > 35 else "low"
-                
                 return {
                     "success": True,
                     "careers_url": best_match['url'],
-                    "confidence": confidence,
+                    "confidence": self._careers_confidence(best_score),
                     "score": best_score,
                     "reasoning": f"Best match found with score {best_score}",
                     "status": "careers_link_found"
@@ -139,6 +88,114 @@ class JobMatchingTool:
                 "status": "careers_link_failed"
             }
             
+    async def find_careers_candidates(self, html_content: str, base_url: str, top_k: int = 3) -> Dict[str, Any]:
+        """Rank the top-K careers page candidates, with /careers as the last resort - OpenAI Agents SDK compatible"""
+        logger.info(f"Finding top {top_k} careers page candidates")
+        
+        try:
+            candidates = []
+            seen_urls = set()
+            
+            links = self._extract_links(html_content, base_url)
+            for link in links:
+                link['score'] = self._score_careers_link(link)
+            links.sort(key=lambda link: link['score'], reverse=True)
+            
+            for link in links:
+                if len(candidates) >= top_k or link['score'] <= 20:
+                    break
+                url = link['url'].split('#')[0]
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+                candidates.append({
+                    "url": url,
+                    "text": link['text'],
+                    "score": link['score'],
+                    "confidence": self._careers_confidence(link['score'])
+                })
+                
+            fallback_url = urljoin(base_url, "/careers")
+            if len(candidates) < top_k and fallback_url not in seen_urls:
+                candidates.append({"url": fallback_url, "text": "", "score": 0, "confidence": "low"})
+                
+            return {
+                "success": True,
+                "candidates": candidates,
+                "status": "careers_candidates_found"
+            }
+            
+        except Exception as e:
+            logger.error(f"Careers candidate ranking failed: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+                "status": "careers_candidates_failed"
+            }
+            
+    def _extract_links(self, html_content: str, base_url: str) -> List[Dict[str, Any]]:
+        """Extract all links from HTML with absolute URLs"""
+        soup = BeautifulSoup(html_content, 'html.parser')
+        links = []
+        
+        for link in soup.find_all('a', href=True):
+            href = link['href']
+            text = link.get_text(strip=True).lower()
+            
+            # Convert relative URLs to absolute
+            if href.startswith('/') or not href.startswith(('http://', 'https://')):
+                href = urljoin(base_url, href)
+                
+            links.append({
+                'url': href,
+                'text': text,
+                'href_original': link['href']
+            })
+            
+        return links
+        
+    def _score_careers_link(self, link: Dict[str, Any]) -> int:
+        """Score how likely a link is to lead to the careers page"""
+        careers_keywords = ['career', 'job', 'hiring', 'opportunity', 'employment', 'join', 'work', 'talent', 'careers', 'karriere']
+        
+        text = link['text']
+        url = link['url'].lower()
+        
+        score = 0
+        
+        # Direct keyword matching
+        for keyword in careers_keywords:
+            if keyword in text:
+                score += 30
+            if keyword in url:
+                score += 25
+                
+        # Fuzzy matching for variations
+        for keyword in careers_keywords:
+            text_similarity = fuzz.partial_ratio(keyword, text)
+            url_similarity = fuzz.partial_ratio(keyword, url)
+            
+            if text_similarity > 80:
+                score += 20
+            if url_similarity > 80:
+                score += 15
+        
+        # Bonus for official indicators
+        official_words = ['official', 'corporate', 'company']
+        if any(word in text or word in url for word in official_words):
+            score += 10
+            
+        # Penalty for non-careers content
+        penalty_words = ['news', 'blog', 'contact', 'about', 'investor']
+        if any(word in text or word in url for word in penalty_words):
+            score -= 15
+            
+        return score
+        
+    def _careers_confidence(self, score: int) -> str:
+        """Convert careers link score to confidence level"""
+        return "high" if score > 60 else "medium" if score > 35 else "low"
+            
     async def find_best_match(self, job_links: List[Dict], job_title: str, location: str = None) -> Dict[str, Any]:
         """Find best job match using fuzzy matching - OpenAI Agents SDK compatible"""
         logger.info(f"Finding best job match for '{job_title}' from {len(job_links)} links")
@@ -242,9 +299,7 @@ class JobMatchingTool:
             
     async def extract_job_data(self, html_content: str, job_params: Dict[str, Any]) -> Dict[str, Any]:
         """Use GPT to extract job data from posting"""
-        from openai import AsyncOpenAI
-        
-        client = AsyncOpenAI()
+        client = get_llm_client()
         
         soup = BeautifulSoup(html_content, 'html.parser')
         for script in soup(["script", "style", "nav", "footer", "header"]):
@@ -266,7 +321,8 @@ class JobMatchingTool:
             response = await client.chat.completions.create(
                 model="gpt-5-nano",
                 messages=[{"role": "user", "content": prompt}],
-                temperature=1
+                temperature=1,
+                timeout=current_deadline().timeout(60)
             )
             
             import json
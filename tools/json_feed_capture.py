@@ -0,0 +1,203 @@
+"""
+JSON Feed Capture - Collects job listings from the JSON responses a careers page loads
+"""
+
+import asyncio
+import re
+from typing import Dict, Any, List, Optional
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+from playwright.async_api import Page, Response
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Payloads larger than this are not parsed (job feeds are well below it)
+MAX_PAYLOAD_BYTES = 5_000_000
+
+# Responses kept per page between navigations
+MAX_PAYLOADS_PER_PAGE = 50
+
+TITLE_KEYS = ["title", "jobTitle", "job_title", "positionTitle", "postingTitle", "name", "text"]
+URL_KEYS = ["absolute_url", "hostedUrl", "jobUrl", "job_url", "url", "canonicalPositionUrl",
+            "externalUrl", "detailUrl", "link", "externalPath", "applyUrl", "apply_url"]
+LOCATION_KEYS = ["location", "locationName", "city", "cityState", "locations", "primaryLocation", "jobLocation"]
+DESCRIPTION_KEYS = ["descriptionTeaser", "description", "summary", "shortDescription", "descriptionPlain"]
+# Keys that, next to a title, make an object look like a job rather than e.g. a menu item
+JOB_HINT_KEYS = {
+    "jobid", "job_id", "jobseqno", "reqid", "requisitionid", "requisition_id", "postingid", "positionid",
+    "location", "locations", "department", "departments", "team", "category", "categories", "employmenttype",
+    "posteddate", "postedon", "dateposted", "updated_at", "applyurl", "apply_url", "hostedurl", "absolute_url",
+    "joburl", "job_url", "workplacetype"
+}
+# Hint keys only a posting has (its id or apply/posting URL); offices and CMS entries share the others
+STRONG_HINT_KEYS = {
+    "jobid", "job_id", "jobseqno", "reqid", "requisitionid", "requisition_id", "postingid", "positionid",
+    "applyurl", "apply_url", "hostedurl", "absolute_url", "joburl", "job_url"
+}
+# Name of the key holding an array of jobs, e.g. {"jobs": [...]} or {"jobPostings": [...]}
+JOB_CONTAINER_PATTERN = re.compile(r"job|posting|requisition|position|opening|vacanc|career", re.IGNORECASE)
+
+class JSONFeedCapture:
+    def __init__(self, min_job_ratio: float = 0.6):
+        # An array counts as a job list when this share of its objects look like jobs
+        self.min_job_ratio = min_job_ratio
+        self._payloads: Dict[int, List[Dict[str, Any]]] = {}
+        self._pending: Dict[int, set] = {}
+        self.stats = {"responses_seen": 0, "payloads_captured": 0, "feeds_found": 0}
+
+    def attach(self, page: Page):
+        """Start capturing JSON responses of a page"""
+        page.on("response", lambda response: self._on_response(page, response))
+        # Pages are keyed by id(), which a new page may reuse once this one is gone
+        page.on("close", lambda closed: self._forget(closed))
+
+    def reset(self, page: Page):
+        """Forget what a page captured (called before it navigates somewhere new)"""
+        self._payloads.pop(id(page), None)
+
+    def _forget(self, page: Page):
+        """Drop everything held for a closed page"""
+        self._payloads.pop(id(page), None)
+        for task in self._pending.pop(id(page), set()):
+            task.cancel()
+
+    def _on_response(self, page: Page, response: Response):
+        try:
+            if response.request.resource_type not in ("xhr", "fetch"):
+                return
+            if "json" not in (response.headers.get("content-type") or ""):
+                return
+        except Exception:
+            return
+
+        self.stats["responses_seen"] += 1
+        task = asyncio.ensure_future(self._capture(page, response))
+        pending = self._pending.setdefault(id(page), set())
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    async def _capture(self, page: Page, response: Response):
+        try:
+            if int(response.headers.get("content-length") or 0) > MAX_PAYLOAD_BYTES:
+                return
+            payload = await response.json()
+        except Exception as e:
+            logger.debug(f"Could not read JSON from {response.url}: {str(e)}")
+            return
+
+        payloads = self._payloads.setdefault(id(page), [])
+        payloads.append({"url": response.url, "payload": payload})
+        del payloads[:-MAX_PAYLOADS_PER_PAGE]
+        self.stats["payloads_captured"] += 1
+
+    async def job_listings(self, page: Page, base_url: str, html_content: Optional[str] = None,
+                           settle_timeout: float = 2.0) -> List[Dict[str, Any]]:
+        """Job listings found in the page's captured JSON, shaped like LLM-extracted job links
+
+        Items without a URL in the feed are linked through the page's anchors with the same
+        title when html_content is given, and dropped otherwise.
+        """
+        pending = self._pending.get(id(page))
+        if pending:
+            await asyncio.wait(set(pending), timeout=settle_timeout)
+
+        listings = []
+        seen = set()
+        anchors = None
+
+        for captured in self._payloads.get(id(page), []):
+            for items in self._job_arrays(captured["payload"]):
+                for item in items:
+                    listing = self._to_listing(item, captured["url"], base_url)
+
+                    if not listing["url"] and html_content:
+                        if anchors is None:
+                            anchors = self._anchors_by_text(html_content, base_url)
+                        listing["url"] = anchors.get(listing["title"].strip().lower())
+
+                    if listing["url"] and listing["url"] not in seen:
+                        seen.add(listing["url"])
+                        listings.append(listing)
+
+        if listings:
+            self.stats["feeds_found"] += 1
+            logger.info(f"Found {len(listings)} job listings in captured JSON feeds")
+        return listings
+
+    def _job_arrays(self, payload: Any, depth: int = 0,
+                    container_key: Optional[str] = None) -> List[List[Dict[str, Any]]]:
+        """The job objects of arrays anywhere in the payload whose objects mostly look like jobs"""
+        if depth > 6:
+            return []
+
+        found = []
+        if isinstance(payload, list):
+            objects = [item for item in payload if isinstance(item, dict)]
+            in_job_container = bool(container_key and JOB_CONTAINER_PATTERN.search(container_key))
+            jobs = [item for item in objects if self._looks_like_job(item, in_job_container)]
+            if objects and len(jobs) >= self.min_job_ratio * len(objects):
+                return [jobs]
+            for item in objects[:20]:
+                found.extend(self._job_arrays(item, depth + 1))
+        elif isinstance(payload, dict):
+            for key, value in payload.items():
+                if isinstance(value, (list, dict)):
+                    found.extend(self._job_arrays(value, depth + 1, str(key)))
+        return found
+
+    @staticmethod
+    def _looks_like_job(item: Dict[str, Any], in_job_container: bool = False) -> bool:
+        """A titled object with one job hint inside a job-named array, else two hints including an id/apply URL"""
+        if not any(isinstance(item.get(key), str) and item.get(key).strip() for key in TITLE_KEYS):
+            return False
+        hints = {key.lower() for key in item} & JOB_HINT_KEYS
+        if in_job_container:
+            return bool(hints)
+        return len(hints) >= 2 and bool(hints & STRONG_HINT_KEYS)
+
+    @staticmethod
+    def _first(item: Dict[str, Any], keys: List[str]) -> Any:
+        for key in keys:
+            value = item.get(key)
+            if value:
+                return value
+        return None
+
+    def _to_listing(self, item: Dict[str, Any], feed_url: str, base_url: str) -> Dict[str, Any]:
+        title = self._first(item, TITLE_KEYS)
+        url = self._first(item, URL_KEYS)
+        url = urljoin(base_url, url) if isinstance(url, str) else None
+
+        location = self._first(item, LOCATION_KEYS)
+        if isinstance(location, dict):
+            location = location.get("name") or location.get("city")
+        elif isinstance(location, list):
+            location = ", ".join(str(entry.get("name", entry) if isinstance(entry, dict) else entry) for entry in location)
+
+        description = self._first(item, DESCRIPTION_KEYS)
+        if isinstance(description, str):
+            description = re.sub(r"<[^>]+>", " ", description)[:500].strip()
+
+        return {
+            "title": title.strip(),
+            "url": url,
+            "location": location if isinstance(location, str) else None,
+            "description": description if isinstance(description, str) else "",
+            "source": "json_feed",
+            "feed_url": feed_url
+        }
+
+    @staticmethod
+    def _anchors_by_text(html_content: str, base_url: str) -> Dict[str, str]:
+        soup = BeautifulSoup(html_content, 'html.parser')
+        anchors = {}
+        for link in soup.find_all('a', href=True):
+            text = link.get_text(" ", strip=True).lower()
+            if text and text not in anchors:
+                anchors[text] = urljoin(base_url, link['href'])
+        return anchors
+
+    def get_stats(self) -> Dict[str, Any]:
+        """JSON responses seen and job feeds found"""
+        return dict(self.stats)
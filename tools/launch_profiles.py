@@ -0,0 +1,79 @@
+"""
+Launch Profiles - Named browser settings bundles for WebNavigationTool
+"""
+
+import os
+from typing import Dict, Any, Optional
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+PROFILE_ENV_VAR = "ROTIFER_PROFILE"
+
+BASE_LAUNCH_ARGS = ['--no-sandbox', '--disable-dev-shm-usage']
+
+LAUNCH_PROFILES = {
+    # Visible, slowed-down browser that renders pages fully (only trackers blocked), for watching a run
+    "debug": {
+        "headless": False,
+        "slow_mo": 100,
+        "launch_args": BASE_LAUNCH_ARGS,
+        "viewport": {'width': 1920, 'height': 1080},
+        "default_timeout_ms": 30000,
+        "navigation_timeout_ms": 30000,
+        "readiness_max_wait": 5.0,
+        "block_requests": True,
+        "blocked_resource_types": [],
+        "pages_per_context": 2,
+        "recycle_after_navigations": 500,
+        "max_browser_rss_mb": None
+    },
+    # Headless, no artificial delay, images/fonts/media and trackers blocked
+    "production": {
+        "headless": True,
+        "slow_mo": 0,
+        "launch_args": BASE_LAUNCH_ARGS + [
+            '--disable-gpu', '--disable-extensions', '--mute-audio',
+            '--disable-background-networking', '--disable-default-apps', '--no-first-run'
+        ],
+        "viewport": {'width': 1366, 'height': 900},
+        "default_timeout_ms": 20000,
+        "navigation_timeout_ms": 20000,
+        "readiness_max_wait": 4.0,
+        "block_requests": True,
+        "blocked_resource_types": ["image", "media", "font"],
+        "pages_per_context": 2,
+        "recycle_after_navigations": 200,
+        "max_browser_rss_mb": 2048
+    },
+    # Production plus a capped renderer count and V8 heap, stylesheets blocked, fewer contexts
+    "low-memory": {
+        "headless": True,
+        "slow_mo": 0,
+        "launch_args": BASE_LAUNCH_ARGS + [
+            '--disable-gpu', '--disable-extensions', '--mute-audio',
+            '--disable-background-networking', '--disable-default-apps', '--no-first-run',
+            '--renderer-process-limit=2', '--js-flags=--max-old-space-size=256',
+            '--disable-features=site-per-process'
+        ],
+        "viewport": {'width': 1024, 'height': 768},
+        "default_timeout_ms": 20000,
+        "navigation_timeout_ms": 20000,
+        "readiness_max_wait": 4.0,
+        "block_requests": True,
+        "blocked_resource_types": ["image", "media", "font", "stylesheet"],
+        "pages_per_context": 4,
+        "recycle_after_navigations": 100,
+        "max_browser_rss_mb": 1024
+    }
+}
+
+
+def get_launch_profile(name: Optional[str] = None, fallback: str = "debug") -> Dict[str, Any]:
+    """Resolve a profile by name, then the ROTIFER_PROFILE env var, then the fallback"""
+    profile_name = name or os.getenv(PROFILE_ENV_VAR) or fallback
+
+    if profile_name not in LAUNCH_PROFILES:
+        raise ValueError(f"Unknown launch profile '{profile_name}' (expected one of: {', '.join(LAUNCH_PROFILES)})")
+
+    return {"name": profile_name, **LAUNCH_PROFILES[profile_name]}
@@ -0,0 +1,217 @@
+"""
+Listing Crawler - Walks paginated, "load more" and infinite-scroll job listings
+"""
+
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+from urllib.parse import urljoin, urlparse, parse_qsl, urlencode, urlunparse
+from bs4 import BeautifulSoup
+from utils.deadline import current_deadline
+from utils.logger import setup_logger
+from utils.storage_state_store import url_domain
+
+logger = setup_logger(__name__)
+
+NEXT_LINK_SELECTORS = [
+    "a[rel='next']",
+    "link[rel='next']",
+    "a[aria-label*='next' i]",
+    "li.next a",
+    ".pagination-next a",
+    "a.next"
+]
+
+NEXT_LINK_TEXTS = {"next", "next page", "next ›", "next »", "›", "»", "siguiente", "suivant", "weiter", "próxima"}
+
+LOAD_MORE_SELECTORS = [
+    "[data-ph-at-id='load-more-jobs-button']",
+    "button[class*='load-more' i]",
+    "button[class*='loadmore' i]",
+    "button:has-text('Load more')",
+    "button:has-text('Show more')",
+    "button:has-text('More jobs')",
+    "button:has-text('View more')",
+    "a:has-text('Load more')",
+    "a:has-text('Show more jobs')"
+]
+
+PAGE_PARAMS = ["page", "p", "pg", "pagenumber", "page_number", "currentpage"]
+OFFSET_PARAMS = ["start", "offset", "from", "startrow"]
+
+SCROLL_HEIGHT_SCRIPT = "document.documentElement.scrollHeight"
+SCROLL_TO_BOTTOM_SCRIPT = "window.scrollTo(0, document.documentElement.scrollHeight)"
+
+class ListingCrawler:
+    def __init__(self, web_navigator, max_steps: int = 10, max_items: int = 500):
+        self.web_navigator = web_navigator
+        self.max_steps = max_steps
+        self.max_items = max_items
+        self.stats = {"crawls": 0, "steps": 0, "items": 0}
+
+    async def crawl(self, extract: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> Dict[str, Any]:
+        """Extract listings from the current page, then keep advancing while new ones appear
+
+        extract() returns the listings visible in the current page state; items are
+        deduplicated by URL across steps.
+        """
+        self.stats["crawls"] += 1
+        items: List[Dict[str, Any]] = []
+        seen_urls = set()
+        visited_pages = {self.web_navigator.current_url}
+        steps = []
+        strategy = None
+
+        def add(new_items: List[Dict[str, Any]]) -> int:
+            added = 0
+            for item in new_items or []:
+                url = item.get("url")
+                key = url or item.get("title")
+                if key and key not in seen_urls:
+                    seen_urls.add(key)
+                    items.append(item)
+                    added += 1
+            return added
+
+        add(await extract())
+        per_page = len(items)
+
+        while len(steps) < self.max_steps and len(items) < self.max_items:
+            if current_deadline().expired:
+                logger.info("Listing crawl stopped by the request deadline")
+                break
+
+            step = await self._advance(strategy, visited_pages, per_page)
+            if not step:
+                break
+            strategy = step
+
+            added = add(await extract())
+            steps.append({"strategy": step, "url": self.web_navigator.current_url, "new_items": added})
+            self.stats["steps"] += 1
+            logger.info(f"Listing crawl step {len(steps)} via {step}: {added} new items ({len(items)} total)")
+
+            if added == 0:
+                break
+
+        self.stats["items"] += len(items)
+        return {
+            "success": True,
+            "items": items,
+            "total_found": len(items),
+            "steps": steps,
+            "strategy": strategy,
+            "status": "listing_crawl_completed"
+        }
+
+    async def _advance(self, preferred: Optional[str], visited_pages: set, per_page: int) -> Optional[str]:
+        """Move to the next batch of listings; returns the strategy that worked"""
+        strategies = {
+            "next_link": lambda: self._follow_next_link(visited_pages),
+            "load_more": self._click_load_more,
+            "page_param": lambda: self._follow_page_param(visited_pages, per_page),
+            "infinite_scroll": self._scroll_for_more
+        }
+
+        # The strategy that worked last time is tried first
+        order = ([preferred] if preferred else []) + [name for name in strategies if name != preferred]
+        for name in order:
+            try:
+                if await strategies[name]():
+                    return name
+            except Exception as e:
+                logger.debug(f"Listing strategy {name} failed: {str(e)}")
+        return None
+
+    async def _navigate(self, url: str, visited_pages: set) -> bool:
+        if not url or url in visited_pages:
+            return False
+        visited_pages.add(url)
+        result = await self.web_navigator.navigate_to_url(url)
+        return bool(result.get("success"))
+
+    async def _follow_next_link(self, visited_pages: set) -> bool:
+        html_content = await self.web_navigator.get_page_html()
+        return await self._navigate(self._next_link(html_content, self.web_navigator.current_url), visited_pages)
+
+    @staticmethod
+    def _next_link(html_content: str, base_url: str) -> Optional[str]:
+        """href of the page's "next page" link on the listing's own host, if it has one"""
+        soup = BeautifulSoup(html_content, 'html.parser')
+        domain = url_domain(base_url)
+
+        def on_host(href: Optional[str]) -> Optional[str]:
+            if not href or href.startswith(('#', 'javascript:')):
+                return None
+            url = urljoin(base_url, href)
+            # A "next" link to another site (a blog, a partner board) is not the listing's next page
+            return url if url_domain(url) == domain else None
+
+        for selector in NEXT_LINK_SELECTORS:
+            for link in soup.select(selector):
+                url = on_host(link.get('href'))
+                if url:
+                    return url
+
+        for link in soup.find_all('a', href=True):
+            if link.get_text(" ", strip=True).lower() in NEXT_LINK_TEXTS:
+                url = on_host(link['href'])
+                if url:
+                    return url
+        return None
+
+    async def _click_load_more(self) -> bool:
+        page = self.web_navigator.page
+        for selector in LOAD_MORE_SELECTORS:
+            button = page.locator(selector).first
+            if await button.count() and await button.is_visible() and await button.is_enabled():
+                result = await self.web_navigator.interact_with_element("click", selector)
+                return bool(result.get("success"))
+        return False
+
+    async def _follow_page_param(self, visited_pages: set, per_page: int) -> bool:
+        html_content = await self.web_navigator.get_page_html()
+        return await self._navigate(
+            self._page_param_url(self.web_navigator.current_url, html_content, per_page), visited_pages
+        )
+
+    @staticmethod
+    def _page_param_url(current_url: str, html_content: str, per_page: int) -> Optional[str]:
+        """Next page's URL from a page-number or offset query parameter"""
+        parsed = urlparse(current_url)
+        query = parse_qsl(parsed.query, keep_blank_values=True)
+
+        for index, (name, value) in enumerate(query):
+            if not value.isdigit():
+                continue
+            if name.lower() in PAGE_PARAMS:
+                next_value = int(value) + 1
+            elif name.lower() in OFFSET_PARAMS and per_page:
+                next_value = int(value) + per_page
+            else:
+                continue
+            query[index] = (name, str(next_value))
+            return urlunparse(parsed._replace(query=urlencode(query)))
+
+        # Page 1 often has no parameter; look for a link to page 2 of the same path
+        soup = BeautifulSoup(html_content, 'html.parser')
+        for link in soup.find_all('a', href=True):
+            target = urlparse(urljoin(current_url, link['href']))
+            if target.path != parsed.path:
+                continue
+            params = {name.lower(): value for name, value in parse_qsl(target.query)}
+            if any(params.get(name) == "2" for name in PAGE_PARAMS):
+                return urlunparse(target)
+        return None
+
+    async def _scroll_for_more(self) -> bool:
+        """Scroll to the bottom and report whether the page grew"""
+        page = self.web_navigator.page
+        height_before = await page.evaluate(SCROLL_HEIGHT_SCRIPT)
+
+        await self.web_navigator.evaluate_javascript(SCROLL_TO_BOTTOM_SCRIPT)
+        await self.web_navigator.readiness.wait(page, max_wait=3)
+
+        return await page.evaluate(SCROLL_HEIGHT_SCRIPT) > height_before
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Crawls, steps taken and listings collected"""
+        return dict(self.stats)
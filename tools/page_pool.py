@@ -0,0 +1,265 @@
+"""
+Page Pool - Pre-warmed Playwright pages leased out to concurrent tasks
+"""
+
+import asyncio
+import itertools
+import time
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+from playwright.async_api import Browser, BrowserContext, Page
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class PageLease:
+    """A page checked out for exclusive use by one task, with its own navigation state"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, page: Optional[Page] = None, context: Optional[BrowserContext] = None):
+        self.lease_id = next(self._ids)
+        self.page = page
+        self.context = context
+        self.current_url = None
+        # (document id, DOM version, html) of the last page.content() taken through this lease
+        self.snapshot = None
+        self.acquired_at = time.monotonic()
+
+class PagePool:
+    def __init__(self, browser: Browser, context_options: Dict[str, Any],
+                 configure_page: Callable[[Page], Awaitable[None]],
+                 size: int = 4, pages_per_context: int = 2, prewarm: int = 2,
+                 configure_context: Optional[Callable[[BrowserContext], Awaitable[None]]] = None,
+                 max_navigations_per_context: Optional[int] = None):
+        self.browser = browser
+        self.context_options = context_options
+        self.configure_page = configure_page
+        self.configure_context = configure_context
+        self.size = max(1, size)
+        self.pages_per_context = max(1, pages_per_context)
+        self.prewarm = min(prewarm, self.size)
+        # Contexts are replaced after this many navigations across their pages (None = never)
+        self.max_navigations_per_context = max_navigations_per_context
+
+        self.contexts: List[BrowserContext] = []
+        self._context_pages: Dict[int, int] = {}  # id(context) -> open pages
+        self._context_navigations: Dict[int, int] = {}  # id(context) -> navigations so far
+        self._retiring = set()  # id(context) of contexts closed once their pages are returned
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._in_use: Dict[int, PageLease] = {}
+        self._total_pages = 0
+        self._waiting = 0
+        self._lock = asyncio.Lock()
+        self._closed = False
+
+        self.stats = {
+            "acquisitions": 0,
+            "pages_created": 0,
+            "pages_discarded": 0,
+            "contexts_recycled": 0,
+            "peak_in_use": 0,
+            "total_wait_seconds": 0.0,
+            "waits": 0
+        }
+
+    async def start(self):
+        """Pre-warm pages so the first leases do not pay page creation"""
+        if self.prewarm <= 0:
+            return
+
+        self._total_pages += self.prewarm
+        pages = await asyncio.gather(*(self._create_page() for _ in range(self.prewarm)), return_exceptions=True)
+        for result in pages:
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to pre-warm page: {str(result)}")
+            else:
+                self._idle.put_nowait(result)
+
+        logger.info(f"Page pool pre-warmed {self._idle.qsize()} pages (size {self.size})")
+
+    async def _context_for_new_page(self) -> BrowserContext:
+        """Pick a context with free page capacity, opening a new one if needed"""
+        for context in self.contexts:
+            if id(context) not in self._retiring and self._context_pages.get(id(context), 0) < self.pages_per_context:
+                return context
+
+        context = await self.browser.new_context(**self.context_options)
+        if self.configure_context:
+            await self.configure_context(context)
+        self.contexts.append(context)
+        self._context_pages[id(context)] = 0
+        self._context_navigations[id(context)] = 0
+        return context
+
+    async def _create_page(self) -> PageLease:
+        """Create a configured page in a slot already reserved in _total_pages"""
+        try:
+            async with self._lock:
+                context = await self._context_for_new_page()
+                self._context_pages[id(context)] += 1
+        except Exception:
+            self._total_pages -= 1
+            raise
+
+        try:
+            page = await context.new_page()
+            await self.configure_page(page)
+        except Exception:
+            self._forget_page(context)
+            raise
+
+        self.stats["pages_created"] += 1
+        return PageLease(page, context)
+
+    def _forget_page(self, context: BrowserContext):
+        """Drop a page from the capacity bookkeeping"""
+        self._total_pages -= 1
+        self._context_pages[id(context)] = max(0, self._context_pages.get(id(context), 1) - 1)
+
+    async def _discard(self, pooled: PageLease):
+        """Close a page for good and close its context if it was retiring and is now empty"""
+        if not self._closed and not pooled.page.is_closed():
+            try:
+                await pooled.page.close()
+            except Exception as e:
+                logger.debug(f"Failed to close discarded page: {str(e)}")
+
+        self._forget_page(pooled.context)
+        self.stats["pages_discarded"] += 1
+
+        context = pooled.context
+        if self._closed or id(context) not in self._retiring or self._context_pages.get(id(context), 0):
+            return
+
+        self._retiring.discard(id(context))
+        self._context_pages.pop(id(context), None)
+        self._context_navigations.pop(id(context), None)
+        if context in self.contexts:
+            self.contexts.remove(context)
+        try:
+            await context.close()
+        except Exception as e:
+            logger.debug(f"Failed to close retired context: {str(e)}")
+        self.stats["contexts_recycled"] += 1
+
+    def note_navigation(self, lease: PageLease):
+        """Count a navigation against the lease's context"""
+        if id(lease.context) in self._context_navigations:
+            self._context_navigations[id(lease.context)] += 1
+
+    def needs_recycle(self, lease: PageLease) -> bool:
+        """Whether the lease's context is retiring or has used up its navigations"""
+        if id(lease.context) in self._retiring:
+            return True
+        limit = self.max_navigations_per_context
+        return bool(limit) and self._context_navigations.get(id(lease.context), 0) >= limit
+
+    async def recycle(self, lease: PageLease):
+        """Give a held lease a fresh page in a fresh context and retire its old context"""
+        self._retiring.add(id(lease.context))
+        await self._discard(PageLease(lease.page, lease.context))
+
+        self._total_pages += 1
+        fresh = await self._create_page()
+        lease.page = fresh.page
+        lease.context = fresh.context
+        lease.current_url = None
+        lease.snapshot = None
+
+    def retire_all(self):
+        """Retire every context; each is replaced as its pages come back or navigate again"""
+        self._retiring.update(id(context) for context in self.contexts)
+
+    async def rebind(self, browser: Browser):
+        """Open new contexts on a relaunched browser; pages of the old one are discarded as they turn up"""
+        self.browser = browser
+        self.retire_all()
+        while not self._idle.empty():
+            await self._discard(self._idle.get_nowait())
+
+    async def acquire(self, timeout: Optional[float] = None) -> PageLease:
+        """Lease an idle page, creating one if the pool has spare capacity"""
+        if self._closed:
+            raise RuntimeError("Page pool is closed")
+
+        started = time.monotonic()
+
+        if self._idle.empty() and self._total_pages < self.size:
+            # Reserve the slot before awaiting so concurrent acquires cannot overshoot
+            self._total_pages += 1
+            pooled = await self._create_page()
+        else:
+            if self._idle.empty():
+                self.stats["waits"] += 1
+            self._waiting += 1
+            try:
+                pooled = await asyncio.wait_for(self._idle.get(), timeout)
+            finally:
+                self._waiting -= 1
+
+        # Recycle pages that crashed or were closed while idle, and pages of retiring contexts
+        if pooled.page.is_closed() or id(pooled.context) in self._retiring:
+            await self._discard(pooled)
+            return await self.acquire(timeout)
+
+        lease = PageLease(pooled.page, pooled.context)
+        self._in_use[lease.lease_id] = lease
+
+        self.stats["acquisitions"] += 1
+        self.stats["total_wait_seconds"] += time.monotonic() - started
+        self.stats["peak_in_use"] = max(self.stats["peak_in_use"], len(self._in_use))
+        return lease
+
+    async def release(self, lease: PageLease):
+        """Return a leased page to the pool"""
+        self._in_use.pop(lease.lease_id, None)
+
+        if self._closed or lease.page.is_closed() or id(lease.context) in self._retiring:
+            await self._discard(lease)
+
+            # A waiter is blocked on the idle queue; hand it a replacement page
+            if not self._closed and self._waiting:
+                self._total_pages += 1
+                try:
+                    self._idle.put_nowait(await self._create_page())
+                except Exception as e:
+                    logger.warning(f"Failed to replace discarded page: {str(e)}")
+            return
+
+        self._idle.put_nowait(PageLease(lease.page, lease.context))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Report pool utilization"""
+        in_use = len(self._in_use)
+        acquisitions = self.stats["acquisitions"]
+
+        return {
+            "size": self.size,
+            "contexts": len(self.contexts),
+            "open_pages": self._total_pages,
+            "in_use": in_use,
+            "idle": self._idle.qsize(),
+            "utilization": round(in_use / self.size, 2),
+            "peak_in_use": self.stats["peak_in_use"],
+            "acquisitions": acquisitions,
+            "waits": self.stats["waits"],
+            "avg_wait_ms": round(self.stats["total_wait_seconds"] * 1000 / acquisitions, 1) if acquisitions else 0.0,
+            "pages_created": self.stats["pages_created"],
+            "pages_discarded": self.stats["pages_discarded"],
+            "contexts_recycled": self.stats["contexts_recycled"]
+        }
+
+    async def close(self):
+        """Close every context owned by the pool"""
+        self._closed = True
+
+        for context in self.contexts:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"Failed to close pooled context: {str(e)}")
+
+        self.contexts = []
+        self._context_pages = {}
+        self._context_navigations = {}
+        self._retiring = set()
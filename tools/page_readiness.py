@@ -0,0 +1,110 @@
+"""
+Page Readiness - Decides when a page is done loading instead of sleeping a fixed time
+"""
+
+import asyncio
+import time
+from typing import Dict, Any, List, Optional
+from playwright.async_api import Page
+from utils.deadline import current_deadline
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Resolves once the DOM has gone quietMs without a mutation (or after maxMs)
+DOM_QUIET_SCRIPT = """
+([quietMs, maxMs]) => new Promise(resolve => {
+    const start = performance.now();
+    let quietTimer = null;
+    let capTimer = null;
+    let observer = null;
+    const done = (settled) => {
+        if (observer) observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(capTimer);
+        resolve({settled, waited: performance.now() - start});
+    };
+    observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => done(true), quietMs);
+    });
+    observer.observe(document.documentElement || document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    quietTimer = setTimeout(() => done(true), quietMs);
+    capTimer = setTimeout(() => done(false), maxMs);
+})
+"""
+
+class PageReadiness:
+    def __init__(self, max_wait: float = 5.0, dom_quiet_ms: int = 300, network_idle: bool = True):
+        self.max_wait = max_wait
+        self.dom_quiet_ms = dom_quiet_ms
+        self.network_idle = network_idle
+
+        self.stats = {"waits": 0, "selector": 0, "settled": 0, "timeout": 0, "waited_seconds": 0.0}
+
+    async def wait(self, page: Page, selector_hints: Optional[List[str]] = None,
+                   max_wait: Optional[float] = None) -> Dict[str, Any]:
+        """Wait until a selector hint appears or network and DOM have settled, bounded by max_wait"""
+        started = time.monotonic()
+        budget = max(0.0, current_deadline().timeout(max_wait if max_wait is not None else self.max_wait))
+
+        waiters = [asyncio.ensure_future(self._settled(page, budget))]
+        if selector_hints:
+            waiters.append(asyncio.ensure_future(self._selector_present(page, selector_hints, budget)))
+
+        reason = "timeout"
+        try:
+            pending = set(waiters)
+            end = started + budget
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=max(0.0, end - time.monotonic()),
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                finished = [task.result() for task in done if not task.exception() and task.result()]
+                if finished:
+                    reason = finished[0]
+                    break
+        finally:
+            for task in waiters:
+                task.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+
+        waited = time.monotonic() - started
+        self.stats["waits"] += 1
+        self.stats[reason] += 1
+        self.stats["waited_seconds"] += waited
+
+        return {"ready": reason != "timeout", "reason": reason, "waited_seconds": round(waited, 2)}
+
+    async def _settled(self, page: Page, budget: float) -> Optional[str]:
+        """Network quiet, then no DOM mutations for dom_quiet_ms"""
+        budget_ms = max(1, int(budget * 1000))
+
+        if self.network_idle:
+            try:
+                await page.wait_for_load_state("networkidle", timeout=max(1, budget_ms // 2))
+            except Exception:
+                # Pages with long-polling or beacons never go idle; leave half the budget for the DOM check
+                pass
+
+        try:
+            result = await page.evaluate(DOM_QUIET_SCRIPT, [self.dom_quiet_ms, budget_ms])
+        except Exception:
+            # The document was replaced mid-check (redirect or client navigation); check the new one
+            await page.wait_for_load_state("domcontentloaded", timeout=budget_ms)
+            result = await page.evaluate(DOM_QUIET_SCRIPT, [self.dom_quiet_ms, budget_ms])
+
+        return "settled" if result.get("settled") else None
+
+    async def _selector_present(self, page: Page, selector_hints: List[str], budget: float) -> Optional[str]:
+        """Any of the hinted selectors is in the DOM"""
+        await page.wait_for_selector(", ".join(selector_hints), state="attached",
+                                     timeout=max(1, int(budget * 1000)))
+        return "selector"
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Readiness outcomes and total time spent waiting"""
+        return {**self.stats, "waited_seconds": round(self.stats["waited_seconds"], 2)}
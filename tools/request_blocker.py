@@ -0,0 +1,91 @@
+"""
+Request Blocker - Aborts requests we never read (images, fonts, media, trackers) at the browser context
+"""
+
+from typing import Dict, Any, Iterable, Optional
+from urllib.parse import urlparse
+from playwright.async_api import BrowserContext, Route
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+DEFAULT_BLOCKED_HOSTS = {
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "adservice.google.com", "connect.facebook.net", "facebook.net", "hotjar.com", "segment.com",
+    "segment.io", "optimizely.com", "nr-data.net", "newrelic.com", "fullstory.com", "clarity.ms",
+    "bat.bing.com", "snap.licdn.com", "ads.linkedin.com", "mouseflow.com", "quantserve.com",
+    "scorecardresearch.com", "adsrvr.org", "criteo.com", "taboola.com", "outbrain.com"
+}
+
+# Rough transfer sizes used to estimate bytes saved, since aborted requests never report a size
+ESTIMATED_BYTES = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 35_000,
+    "script": 30_000,
+    "stylesheet": 15_000,
+    "xhr": 5_000,
+    "fetch": 5_000
+}
+
+class RequestBlocker:
+    def __init__(self, resource_types: Optional[Iterable[str]] = None, blocked_hosts: Optional[Iterable[str]] = None):
+        self.resource_types = set(DEFAULT_BLOCKED_RESOURCE_TYPES if resource_types is None else resource_types)
+        self.blocked_hosts = set(DEFAULT_BLOCKED_HOSTS if blocked_hosts is None else blocked_hosts)
+
+        self.stats = {
+            "requests": 0,
+            "blocked": 0,
+            "blocked_by_type": {},
+            "blocked_by_host": 0,
+            "estimated_bytes_saved": 0
+        }
+
+    async def install(self, context: BrowserContext):
+        """Route every request of a context through the blocker"""
+        await context.route("**/*", self._handle_route)
+
+    def _is_blocked_host(self, url: str) -> bool:
+        host = (urlparse(url).hostname or "").lower()
+        return any(host == blocked or host.endswith(f".{blocked}") for blocked in self.blocked_hosts)
+
+    def blocks(self, request) -> bool:
+        """Whether a request is one the blocker aborts"""
+        # Never block the page we are navigating to
+        if request.is_navigation_request():
+            return False
+        return request.resource_type in self.resource_types or self._is_blocked_host(request.url)
+
+    async def _handle_route(self, route: Route):
+        """Abort blocked requests, let everything else through"""
+        request = route.request
+        self.stats["requests"] += 1
+
+        if not self.blocks(request):
+            await route.continue_()
+            return
+
+        resource_type = request.resource_type
+        if resource_type in self.resource_types:
+            self.stats["blocked_by_type"][resource_type] = self.stats["blocked_by_type"].get(resource_type, 0) + 1
+        else:
+            self.stats["blocked_by_host"] += 1
+
+        self.stats["blocked"] += 1
+        self.stats["estimated_bytes_saved"] += ESTIMATED_BYTES.get(resource_type, 10_000)
+
+        try:
+            await route.abort("blockedbyclient")
+        except Exception as e:
+            # The page may already be gone; the request no longer matters
+            logger.debug(f"Failed to abort {request.url}: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Blocked request counts and estimated bandwidth saved"""
+        return {
+            **self.stats,
+            "blocked_by_type": dict(self.stats["blocked_by_type"]),
+            "estimated_mb_saved": round(self.stats["estimated_bytes_saved"] / 1_000_000, 2)
+        }
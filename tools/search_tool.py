@@ -9,6 +9,8 @@ from bs4 import BeautifulSoup
 from urllib.parse import urlencode, urlparse, parse_qs, unquote
 import re
 from fuzzywuzzy import fuzz
+from utils.deadline import current_deadline
+from utils.har_archive import http_get
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -151,17 +153,17 @@ class SearchTool:
             
             url = f"{search_url}?{urlencode(params)}"
             
-            async with session.get(url) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    results = self._parse_search_results(html, max_results)
-                    quality_results = self._filter_quality_results(results)
-                    
-                    logger.info(f"Found {len(quality_results)} quality search results for: {query}")
-                    return quality_results
-                else:
-                    logger.error(f"Search request failed with status: {response.status}")
-                    return []
+            timeout = aiohttp.ClientTimeout(total=max(0.001, current_deadline().timeout(30)))
+            response = await http_get(session, url, timeout=timeout)
+            if response.status == 200:
+                results = self._parse_search_results(response.text, max_results)
+                quality_results = self._filter_quality_results(results)
+                
+                logger.info(f"Found {len(quality_results)} quality search results for: {query}")
+                return quality_results
+            else:
+                logger.error(f"Search request failed with status: {response.status}")
+                return []
                     
         except asyncio.TimeoutError:
             logger.error(f"Search timeout for query: {query}")
@@ -3,122 +3,534 @@ Web Navigation Tool - Playwright-based navigation for OpenAI Agents SDK
 """
 
 import asyncio
-from typing import Dict, Any, Optional
+import json
+import time
+import weakref
+from contextlib import asynccontextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from tools.browser_watchdog import BrowserWatchdog
+from tools.consent_handler import ConsentHandler
+from tools.json_feed_capture import JSONFeedCapture
+from tools.launch_profiles import get_launch_profile
+from tools.page_pool import PageLease, PagePool
+from tools.page_readiness import PageReadiness
+from tools.request_blocker import RequestBlocker
+from utils.deadline import DeadlineExceeded, current_deadline
+from utils.har_archive import get_har_archive
+from utils.politeness import get_politeness_scheduler
+from utils.storage_state_store import StorageStateStore, url_domain
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Restores saved localStorage entries for one origin before the page's own scripts run
+LOCAL_STORAGE_INIT_SCRIPT = """
+(saved => {
+    if (location.origin !== saved.origin) return;
+    try {
+        for (const item of saved.localStorage) {
+            if (localStorage.getItem(item.name) === null) localStorage.setItem(item.name, item.value);
+        }
+    } catch (e) {}
+})(%s)
+"""
+
+# Gives every loaded document an id and counts its DOM mutations, so snapshots can be reused safely
+DOM_VERSION_SCRIPT = """
+(() => {
+    if (window.__rotiferDom) return;
+    window.__rotiferDom = {id: Math.random().toString(36).slice(2), version: 0};
+    new MutationObserver(() => { window.__rotiferDom.version += 1; })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+})();
+"""
+
+DOM_STATE_EXPRESSION = "window.__rotiferDom ? [window.__rotiferDom.id, window.__rotiferDom.version] : null"
+
+# Navigation errors that mean the page's renderer or the whole browser is gone
+CRASH_MARKERS = ("crash", "target closed", "has been closed", "browser has disconnected")
+
 class WebNavigationTool:
-    def __init__(self, headless: bool = False, slow_mo: int = 100):
+    def __init__(self, headless: Optional[bool] = None, slow_mo: Optional[int] = None, browser: Optional[Browser] = None,
+                 pool_size: int = 4, pages_per_context: Optional[int] = None, prewarm_pages: int = 2,
+                 block_requests: Optional[bool] = None, profile: Optional[str] = None,
+                 state_dir: Optional[str] = "browser_state", browser_host: Optional["WebNavigationTool"] = None,
+                 recycle_after_navigations: Optional[int] = None, max_browser_rss_mb: Optional[float] = None):
+        # Launch profile (debug/production/low-memory); explicit arguments override it
+        self.profile = get_launch_profile(profile)
+        
+        # The default lease backs self.page / self.current_url outside of lease_page()
+        self._default_lease = PageLease()
+        self._active_lease = ContextVar(f"active_lease_{id(self)}", default=None)
+        
         self.playwright = None
-        self.browser = None
+        # A shared browser can come with the tool that launched it, which relaunches it after a crash
+        self.browser_host = browser_host
+        if browser is None and browser_host:
+            browser = browser_host.browser
+        self.browser = browser
         self.context = None
         self.page = None
-        self.headless = headless
-        self.slow_mo = slow_mo
+        self.headless = self.profile["headless"] if headless is None else headless
+        self.slow_mo = self.profile["slow_mo"] if slow_mo is None else slow_mo
+        self.launch_args = self.profile["launch_args"]
+        self.default_timeout_ms = self.profile["default_timeout_ms"]
+        self.navigation_timeout_ms = self.profile["navigation_timeout_ms"]
         self.current_url = None
+        # A browser passed in is shared with other tools and owned by the caller
+        self.owns_browser = browser is None
         
-    async def initialize(self):
-        """Initialize Playwright browser for OpenAI Agents SDK usage"""
-        logger.info("Initializing Web Navigation Tool for OpenAI Agents SDK")
+        self.context_options = {
+            "user_agent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            "viewport": self.profile["viewport"]
+        }
         
-        try:
-            self.playwright = await async_playwright().start()
+        # Extra pages for concurrent work, handed out through lease_page()
+        self.page_pool = None
+        self.pool_size = pool_size
+        self.pages_per_context = pages_per_context or self.profile["pages_per_context"]
+        self.prewarm_pages = prewarm_pages
+        
+        # Aborts images, fonts, media and trackers on every context we open
+        if block_requests is None:
+            block_requests = self.profile["block_requests"]
+        self.request_blocker = RequestBlocker(self.profile["blocked_resource_types"]) if block_requests else None
+        
+        # Decides when a page has finished loading after navigation or interaction
+        self.readiness = PageReadiness(max_wait=self.profile["readiness_max_wait"])
+        
+        # Cookies/localStorage and consent results per domain, reused across runs (state_dir=None disables)
+        self.state_store = StorageStateStore(state_dir) if state_dir else None
+        self.consent_handler = ConsentHandler()
+        self._consent_results = {}
+        self._state_applied = weakref.WeakKeyDictionary()  # context -> domains restored into it
+        self._state_saved = set()
+        
+        # Job lists in the JSON (XHR/fetch) responses each page loads
+        self.json_feeds = JSONFeedCapture()
+        
+        # page.content() calls served from the lease's snapshot vs. serialized again
+        self.snapshot_stats = {"hits": 0, "misses": 0}
+        self._frame_snapshots = {}
+        
+        # Contexts are replaced after this many navigations, or all of them once the browser
+        # process tree goes over max_browser_rss_mb (needs psutil); a crashed browser is relaunched
+        self.recycle_after_navigations = recycle_after_navigations or self.profile["recycle_after_navigations"]
+        self.watchdog = BrowserWatchdog(max_browser_rss_mb or self.profile["max_browser_rss_mb"])
+        self._default_navigations = 0
+        self._retire_default_context = False
+        self._relaunch_lock = asyncio.Lock()
+        self.recycle_stats = {"pages_recycled": 0, "page_crashes": 0, "browser_relaunches": 0, "crash_retries": 0}
+        
+        # Browser start is shared so concurrent first users wait on the same launch
+        self._start_task = None
+        self.startup_seconds = None
+        
+    def _lease(self) -> PageLease:
+        """Lease bound to the current task, or the default lease"""
+        return self._active_lease.get() or self._default_lease
+        
+    @property
+    def page(self) -> Optional[Page]:
+        return self._lease().page
+        
+    @page.setter
+    def page(self, page: Optional[Page]):
+        self._lease().page = page
+        
+    @property
+    def current_url(self) -> Optional[str]:
+        return self._lease().current_url
+        
+    @current_url.setter
+    def current_url(self, url: Optional[str]):
+        self._lease().current_url = url
+        
+    async def initialize(self, lazy: bool = False):
+        """Initialize Playwright browser for OpenAI Agents SDK usage
+        
+        With lazy=True the browser is launched on first use instead of here.
+        """
+        logger.info(f"Initializing Web Navigation Tool for OpenAI Agents SDK (profile: {self.profile['name']})")
+        
+        if lazy:
+            logger.info("Web Navigation Tool browser start deferred until first use")
+            return
             
-            self.browser = await self.playwright.chromium.launch(
-                headless=self.headless,
-                slow_mo=self.slow_mo,
-                args=['--no-sandbox', '--disable-dev-shm-usage']
-            )
+        await self._ensure_started()
+        
+    def warm_up(self):
+        """Start launching the browser in the background without waiting for it"""
+        if not self._start_task:
+            self._start_task = asyncio.ensure_future(self._start())
+            
+    async def _ensure_started(self):
+        """Launch the browser if nobody has yet, and wait until it is ready"""
+        self.warm_up()
+        await asyncio.shield(self._start_task)
+        
+    @property
+    def started(self) -> bool:
+        return bool(self._start_task and self._start_task.done() and not self._start_task.exception())
+        
+    async def _start(self):
+        """Launch (or attach to) the browser, open the default page and pre-warm the pool"""
+        started = time.monotonic()
+        
+        try:
+            if self.owns_browser:
+                self.playwright = await async_playwright().start()
+                self.browser = await self._launch_browser()
             
-            self.context = await self.browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                viewport={'width': 1920, 'height': 1080}
-            )
+            self.context = await self.browser.new_context(**self.context_options)
+            await self._configure_context(self.context)
             
             self.page = await self.context.new_page()
-            self.page.set_default_timeout(30000)
-            await self.page.set_extra_http_headers({
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120 Safari/537.36"
-            })
-
+            await self._configure_page(self.page)
+            
+            self.page_pool = PagePool(
+                self.browser,
+                self.context_options,
+                self._configure_page,
+                size=self.pool_size,
+                pages_per_context=self.pages_per_context,
+                prewarm=self.prewarm_pages,
+                configure_context=self._configure_context,
+                max_navigations_per_context=self.recycle_after_navigations
+            )
+            await self.page_pool.start()
             
-            logger.info("Web Navigation Tool initialized successfully")
+            self.startup_seconds = round(time.monotonic() - started, 2)
+            logger.info(f"Web Navigation Tool initialized successfully in {self.startup_seconds}s")
             
         except Exception as e:
             logger.error(f"Failed to initialize Web Navigation Tool: {str(e)}")
             raise
             
-    async def navigate_to_url(self, url: str) -> Dict[str, Any]:
-        """Navigate to specific URL - OpenAI Agents SDK compatible"""
-        logger.info(f"Navigating to: {url}")
+    async def _launch_browser(self) -> Browser:
+        return await self.playwright.chromium.launch(
+            headless=self.headless,
+            slow_mo=self.slow_mo,
+            args=self.launch_args
+        )
         
-        try:
-            # Ensure URL has protocol
-            if not url.startswith(('http://', 'https://')):
-                url = f"https://{url}"
-            
-            logger.info(f"[MDEBUG] URL: {url}")
-            await self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
-            self.current_url = self.page.url
+    async def relaunch_browser(self):
+        """Replace a disconnected browser (a no-op if someone already did)"""
+        async with self._relaunch_lock:
+            if self.browser and self.browser.is_connected():
+                return
+                
+            if self.owns_browser:
+                self.browser = await self._launch_browser()
+            elif self.browser_host:
+                await self.browser_host.relaunch_browser()
+                self.browser = self.browser_host.browser
+            else:
+                raise RuntimeError("Shared browser disconnected and there is no browser host to relaunch it")
+                
+            self.recycle_stats["browser_relaunches"] += 1
+            logger.warning("Browser relaunched after it disconnected")
             
-            # Wait for page to stabilize
-            await asyncio.sleep(2)
+            if self.page_pool:
+                await self.page_pool.rebind(self.browser)
+            self._retire_default_context = True
             
-            page_title = await self.page.title()
+    async def _recycle_default_context(self):
+        """Move the default page to a fresh context and close the old one"""
+        old_context, old_page = self.context, self._default_lease.page
+        
+        self.context = await self.browser.new_context(**self.context_options)
+        await self._configure_context(self.context)
+        page = await self.context.new_page()
+        await self._configure_page(page)
+        
+        self._default_lease.page = page
+        self._default_lease.snapshot = None
+        self._default_navigations = 0
+        self._retire_default_context = False
+        self.recycle_stats["pages_recycled"] += 1
+        
+        for closable in (old_page, old_context):
+            try:
+                await closable.close()
+            except Exception as e:
+                logger.debug(f"Failed to close recycled default context: {str(e)}")
+                
+    async def _maybe_recycle(self):
+        """Swap the current page into a fresh context when its context is worn out or memory is high"""
+        if self.watchdog.over_limit():
+            if self.page_pool:
+                self.page_pool.retire_all()
+            self._retire_default_context = True
+            
+        lease = self._active_lease.get()
+        if lease:
+            if self.page_pool.needs_recycle(lease):
+                await self.page_pool.recycle(lease)
+                self.recycle_stats["pages_recycled"] += 1
+            self.page_pool.note_navigation(lease)
+        else:
+            limit = self.recycle_after_navigations
+            if self._retire_default_context or (limit and self._default_navigations >= limit):
+                await self._recycle_default_context()
+            self._default_navigations += 1
+            
+    def _is_crash(self, error: Exception) -> bool:
+        if self.browser and not self.browser.is_connected():
+            return True
+        if self.page is None or self.page.is_closed():
+            return True
+        return any(marker in str(error).lower() for marker in CRASH_MARKERS)
+        
+    async def _recover_from_crash(self) -> bool:
+        """Relaunch the browser if it is gone and give the current task a fresh page"""
+        try:
+            if not self.browser.is_connected():
+                await self.relaunch_browser()
+                
+            lease = self._active_lease.get()
+            if lease:
+                await self.page_pool.recycle(lease)
+            else:
+                await self._recycle_default_context()
+            self.recycle_stats["pages_recycled"] += 1
+            return True
             
-            result = {
-                "success": True,
-                "url": self.current_url,
-                "title": page_title,
-                "status": "navigated_successfully"
-            }
+        except Exception as e:
+            logger.error(f"Could not recover from browser crash: {str(e)}")
+            return False
             
-            logger.info(f"Navigation successful: {self.current_url}")
-            return result
+    def _on_page_crash(self, page: Page):
+        self.recycle_stats["page_crashes"] += 1
+        logger.warning(f"Page renderer crashed ({page.url})")
+        
+    async def _configure_context(self, context: BrowserContext):
+        """Install request blocking (and HAR record/replay, when active) on a new context"""
+        if self.request_blocker:
+            await self.request_blocker.install(context)
+            
+        har_archive = get_har_archive()
+        if har_archive:
+            # Blocked requests were never recorded; replay hands them back to the blocker to abort
+            await har_archive.install(context, self.request_blocker.blocks if self.request_blocker else None)
+            
+    async def _configure_page(self, page: Page):
+        """Apply default timeout, headers, DOM version tracking and JSON capture to a new page"""
+        page.set_default_timeout(self.default_timeout_ms)
+        page.on("crash", self._on_page_crash)
+        await page.add_init_script(script=DOM_VERSION_SCRIPT)
+        self.json_feeds.attach(page)
+        await page.set_extra_http_headers({
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120 Safari/537.36"
+        })
+        
+    @asynccontextmanager
+    async def lease_page(self, timeout: Optional[float] = None):
+        """Check out a pooled page for the current task.
+        
+        While the lease is held, self.page and self.current_url (and every tool
+        that goes through them) refer to the leased page in this task only.
+        """
+        deadline = current_deadline()
+        waits_on_deadline = timeout is None and deadline.expires_at is not None
+        if waits_on_deadline:
+            timeout = deadline.remaining()
+        await self._ensure_started()
+        try:
+            lease = await self.page_pool.acquire(timeout)
+        except asyncio.TimeoutError:
+            # Callers handle a spent budget, not a bare timeout from deep inside the pool
+            if waits_on_deadline:
+                raise DeadlineExceeded(f"Request budget of {deadline.budget_seconds}s exhausted while waiting for a page")
+            raise
+        token = self._active_lease.set(lease)
+        try:
+            yield lease
+        finally:
+            self._active_lease.reset(token)
+            await self.page_pool.release(lease)
+            
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get page pool utilization - OpenAI Agents SDK compatible"""
+        if not self.page_pool:
+            return {"success": False, "error": "Page pool not initialized", "status": "pool_stats_failed"}
+            
+        return {
+            "success": True,
+            **self.page_pool.get_stats(),
+            "status": "pool_stats_retrieved"
+        }
+            
+    async def _restore_domain_state(self, url: str):
+        """Load a domain's saved cookies and localStorage into the page's context (once per context)"""
+        if not self.state_store:
+            return
+            
+        domain = url_domain(url)
+        context = self.page.context
+        applied = self._state_applied.setdefault(context, set())
+        if domain in applied:
+            return
+        applied.add(domain)
+        
+        state = self.state_store.load(domain)
+        if not state:
+            return
             
+        try:
+            if state.get("cookies"):
+                await context.add_cookies(state["cookies"])
+            for origin in state.get("origins", []):
+                await context.add_init_script(script=LOCAL_STORAGE_INIT_SCRIPT % json.dumps(origin))
+            logger.info(f"Restored browser state for {domain} ({len(state.get('cookies', []))} cookies)")
         except Exception as e:
-            logger.error(f"Navigation failed to {url}: {str(e)}")
-            return {
-                "success": False,
-                "url": url,
-                "error": str(e),
-                "status": "navigation_failed"
-            }
+            logger.warning(f"Failed to restore browser state for {domain}: {str(e)}")
+            
+    async def _handle_consent_and_state(self, url: str) -> Dict[str, Any]:
+        """Dismiss a consent overlay (using the domain's cached result) and save the domain's state"""
+        domain = url_domain(url)
+        
+        if domain not in self._consent_results and self.state_store:
+            saved = self.state_store.load(domain)
+            if saved and saved.get("consent") is not None:
+                self._consent_results[domain] = saved["consent"]
+                
+        consent = await self.consent_handler.dismiss(self.page, self._consent_results.get(domain))
+        self._consent_results[domain] = {"selector": consent["selector"], "checked_at": consent["checked_at"]}
+        
+        # Save on the first visit of the run and whenever accepting changed the cookies
+        if self.state_store and (domain not in self._state_saved or consent["dismissed"]):
+            self._state_saved.add(domain)
+            try:
+                storage_state = await self.page.context.storage_state()
+                self.state_store.save(domain, storage_state, self._consent_results[domain])
+            except Exception as e:
+                logger.warning(f"Failed to save browser state for {domain}: {str(e)}")
+                
+        return consent
+        
+    def get_blocking_stats(self) -> Dict[str, Any]:
+        """Get blocked request counts - OpenAI Agents SDK compatible"""
+        if not self.request_blocker:
+            return {"success": False, "error": "Request blocking disabled", "status": "blocking_stats_failed"}
+            
+        return {
+            "success": True,
+            **self.request_blocker.get_stats(),
+            "status": "blocking_stats_retrieved"
+        }
+        
+    async def navigate_to_url(self, url: str, ready_selectors: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Navigate to specific URL - OpenAI Agents SDK compatible
+        
+        ready_selectors are hints: the page counts as loaded as soon as one of them is present.
+        If the page or browser crashes on the way, it is replaced and the navigation retried once.
+        """
+        logger.info(f"Navigating to: {url}")
+        
+        # Ensure URL has protocol
+        if not url.startswith(('http://', 'https://')):
+            url = f"https://{url}"
+            
+        for attempt in range(2):
+            try:
+                return await self._navigate(url, ready_selectors)
+                
+            except Exception as e:
+                if attempt == 0 and self.started and self._is_crash(e):
+                    logger.warning(f"Browser crashed while loading {url}; retrying on a fresh page")
+                    self.recycle_stats["crash_retries"] += 1
+                    if await self._recover_from_crash():
+                        continue
+                        
+                logger.error(f"Navigation failed to {url}: {str(e)}")
+                return {
+                    "success": False,
+                    "url": url,
+                    "error": str(e),
+                    "status": "navigation_failed"
+                }
+                
+    async def _navigate(self, url: str, ready_selectors: Optional[List[str]]) -> Dict[str, Any]:
+        logger.info(f"[MDEBUG] URL: {url}")
+        await self._ensure_started()
+        await self._maybe_recycle()
+        self._invalidate_snapshot()
+        self.json_feeds.reset(self.page)
+        deadline = current_deadline()
+        deadline.check("navigation")
+        await self._restore_domain_state(url)
+        
+        har_archive = get_har_archive()
+        if har_archive:
+            har_archive.bind_page(self.page)
+            
+        # Replayed pages come from disk like replayed aiohttp calls, so neither waits for host pacing
+        politeness = get_politeness_scheduler()
+        replaying = har_archive is not None and har_archive.mode == "replay"
+        async with (nullcontext() if replaying else politeness.slot(url)):
+            response = await self.page.goto(url, wait_until='domcontentloaded', timeout=deadline.timeout_ms(self.navigation_timeout_ms))
+        if response and not replaying:
+            politeness.note_response(url, response.status, response.headers)
+        
+        # Wait for page to stabilize
+        readiness = await self.readiness.wait(self.page, ready_selectors)
+        self.current_url = self.page.url
+        
+        consent = await self._handle_consent_and_state(self.current_url)
+        
+        page_title = await self.page.title()
+        
+        result = {
+            "success": True,
+            "url": self.current_url,
+            "title": page_title,
+            "readiness": readiness,
+            "consent_dismissed": consent["dismissed"],
+            "status": "navigated_successfully"
+        }
+        
+        logger.info(f"Navigation successful: {self.current_url}")
+        return result
             
     async def interact_with_element(self, action: str, selector: str, value: str = None) -> Dict[str, Any]:
         """Interact with page elements - OpenAI Agents SDK compatible"""
         logger.info(f"Performing {action} on element: {selector}")
+        deadline = current_deadline()
         
         try:
+            deadline.check("interaction")
+            self._invalidate_snapshot()
+            
             if action == "click":
-                await self.page.wait_for_selector(selector, timeout=10000)
-                await self.page.click(selector)
-                await asyncio.sleep(1)
+                await self.page.wait_for_selector(selector, timeout=deadline.timeout_ms(10000))
+                await self.page.click(selector, timeout=deadline.timeout_ms(self.default_timeout_ms))
+                await self.readiness.wait(self.page, max_wait=3)
                 
             elif action == "fill":
                 if not value:
                     return {"success": False, "error": "Value required for fill action"}
-                await self.page.wait_for_selector(selector, timeout=10000)
-                await self.page.fill(selector, value)
+                await self.page.wait_for_selector(selector, timeout=deadline.timeout_ms(10000))
+                await self.page.fill(selector, value, timeout=deadline.timeout_ms(self.default_timeout_ms))
                 
             elif action == "submit":
-                await self.page.wait_for_selector(selector, timeout=10000)
+                await self.page.wait_for_selector(selector, timeout=deadline.timeout_ms(10000))
                 
                 # Try multiple submit strategies
                 submit_successful = await self._try_submit_strategies(selector)
                 
                 if not submit_successful:
-                    await self.page.press(selector, "Enter")
+                    await self.page.press(selector, "Enter", timeout=deadline.timeout_ms(self.default_timeout_ms))
                     
-                await asyncio.sleep(3)  # Wait for results
+                await self.readiness.wait(self.page)  # Wait for results
                 
             elif action == "scroll":
                 scroll_amount = int(value) if value else 3
                 for _ in range(scroll_amount):
                     await self.page.keyboard.press("PageDown")
-                    await asyncio.sleep(0.5)
+                    await self.readiness.wait(self.page, max_wait=1)
                     
             else:
                 return {"success": False, "error": f"Unknown action: {action}"}
@@ -190,7 +602,7 @@ class WebNavigationTool:
     async def wait_for_element(self, selector: str, timeout: int = 10000) -> Dict[str, Any]:
         """Wait for element to appear - OpenAI Agents SDK compatible"""
         try:
-            await self.page.wait_for_selector(selector, timeout=timeout)
+            await self.page.wait_for_selector(selector, timeout=current_deadline().timeout_ms(timeout))
             return {
                 "success": True,
                 "selector": selector,
@@ -237,8 +649,10 @@ class WebNavigationTool:
     async def go_back(self) -> Dict[str, Any]:
         """Navigate back - OpenAI Agents SDK compatible"""
         try:
-            await self.page.go_back()
-            await asyncio.sleep(2)
+            deadline = current_deadline()
+            self._invalidate_snapshot()
+            await self.page.go_back(timeout=deadline.timeout_ms(self.navigation_timeout_ms))
+            await self.readiness.wait(self.page)
             
             return {
                 "success": True,
@@ -257,6 +671,7 @@ class WebNavigationTool:
     async def evaluate_javascript(self, script: str) -> Dict[str, Any]:
         """Evaluate JavaScript on page - OpenAI Agents SDK compatible"""
         try:
+            self._invalidate_snapshot()
             result = await self.page.evaluate(script)
             return {
                 "success": True,
@@ -293,26 +708,84 @@ class WebNavigationTool:
                 "status": "element_check_failed"
             }
             
+    def _invalidate_snapshot(self):
+        """Drop the current lease's HTML snapshot"""
+        self._lease().snapshot = None
+        
     async def get_page_html(self) -> str:
-        """Get raw HTML content"""
+        """Get raw HTML content
+        
+        The HTML is reused while the page shows the same document and its DOM has not
+        changed since, so one page state is only serialized once.
+        """
+        lease = self._lease()
         try:
-            return await self.page.content()
+            dom_state = await self._dom_state(self.page)
+            if dom_state and lease.snapshot and lease.snapshot[:2] == dom_state:
+                self.snapshot_stats["hits"] += 1
+                return lease.snapshot[2]
+                
+            # The version is read first, so a mutation during content() only causes an extra refresh
+            html_content = await self.page.content()
+            self.snapshot_stats["misses"] += 1
+            lease.snapshot = (*dom_state, html_content) if dom_state else None
+            return html_content
         except Exception as e:
             logger.error(f"Failed to get page HTML: {str(e)}")
             raise
             
+    async def get_frame_html(self, frame) -> str:
+        """Get a child frame's HTML, reused while the frame's document and DOM are unchanged"""
+        dom_state = await self._dom_state(frame)
+        cached = self._frame_snapshots.get(id(frame))
+        if dom_state and cached and cached[:2] == dom_state:
+            self.snapshot_stats["hits"] += 1
+            return cached[2]
+            
+        html_content = await frame.content()
+        self.snapshot_stats["misses"] += 1
+        if dom_state:
+            if len(self._frame_snapshots) >= 256:
+                self._frame_snapshots.clear()
+            self._frame_snapshots[id(frame)] = (*dom_state, html_content)
+        return html_content
+        
+    async def _dom_state(self, target) -> Optional[tuple]:
+        """(document id, DOM version) of a page or frame, or None if it cannot be read"""
+        try:
+            dom_state = await target.evaluate(DOM_STATE_EXPRESSION)
+            return tuple(dom_state) if dom_state else None
+        except Exception:
+            return None
+            
     async def cleanup(self):
         """Close browser and cleanup resources"""
         logger.info("Cleaning up Web Navigation Tool")
         
         try:
+            # A launch still in flight finishes first so nothing it opens is leaked
+            if self._start_task and not self._start_task.done():
+                await asyncio.wait({self._start_task})
+                
             if self.page:
                 await self.page.close()
                 
+            logger.info(f"Page readiness stats: {self.readiness.get_stats()}")
+            if self.request_blocker:
+                logger.info(f"Request blocking stats: {self.request_blocker.get_stats()}")
+            logger.info(f"Consent handling stats: {self.consent_handler.get_stats()}")
+            logger.info(f"HTML snapshot stats: {self.snapshot_stats}")
+            logger.info(f"JSON feed capture stats: {self.json_feeds.get_stats()}")
+            logger.info(f"Browser recycling stats: {self.recycle_stats}, memory: {self.watchdog.get_stats()}")
+            
+            if self.page_pool:
+                logger.info(f"Page pool stats: {self.page_pool.get_stats()}")
+                await self.page_pool.close()
+                
             if self.context:
                 await self.context.close()
                 
-            if self.browser:
+            if self.browser and self.owns_browser:
                 await self.browser.close()
                 
             if self.playwright:
@@ -0,0 +1,91 @@
+"""
+Batch I/O helpers - Load job requests and write per-request results
+"""
+
+import csv
+import json
+from pathlib import Path
+from typing import Dict, Any, List
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+JOB_PARAM_FIELDS = ["job_title", "company_name", "company_domain", "location"]
+
+
+def normalize_job_params(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a raw row into the job_params shape used by LeadAgent"""
+    job_params = {}
+    for field in JOB_PARAM_FIELDS:
+        value = raw.get(field)
+        if isinstance(value, str):
+            value = value.strip()
+        job_params[field] = value if value else None
+    return job_params
+
+
+def load_job_requests(path: str) -> List[Dict[str, Any]]:
+    """Load job requests from a JSONL or CSV file"""
+    file_path = Path(path)
+    suffix = file_path.suffix.lower()
+
+    if suffix == ".csv":
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+    elif suffix in (".jsonl", ".ndjson"):
+        rows = []
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    logger.error(f"Skipping invalid JSON on line {line_number}: {str(e)}")
+    else:
+        raise ValueError(f"Unsupported batch file type: {suffix} (expected .jsonl or .csv)")
+
+    requests = []
+    for index, row in enumerate(rows):
+        job_params = normalize_job_params(row)
+
+        if not job_params["job_title"]:
+            logger.warning(f"Skipping request {index}: job_title is required")
+            continue
+        if not job_params["company_name"] and not job_params["company_domain"]:
+            logger.warning(f"Skipping request {index}: company_name or company_domain is required")
+            continue
+
+        requests.append({
+            "request_id": str(row.get("request_id") or index),
+            "job_params": job_params
+        })
+
+    logger.info(f"Loaded {len(requests)} job requests from {path}")
+    return requests
+
+
+def append_result(path: str, record: Dict[str, Any]):
+    """Append a single result record to a JSONL output file"""
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def read_completed_request_ids(path: str) -> set:
+    """Request ids that already have a successful result in a JSONL output file"""
+    completed = set()
+    if not Path(path).exists():
+        return completed
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("success") and record.get("request_id") is not None:
+                completed.add(str(record["request_id"]))
+
+    return completed
@@ -0,0 +1,74 @@
+"""
+Checkpoint Store - Persists per-request workflow progress so batches can resume
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class CheckpointStore:
+    def __init__(self, directory: str = "checkpoints"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def request_key(job_params: Dict[str, Any]) -> str:
+        """Stable key for a request, derived from its job_params"""
+        normalized = {k: (v.strip().lower() if isinstance(v, str) else v) for k, v in job_params.items()}
+        payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def new_checkpoint(self, job_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Empty checkpoint for a request"""
+        return {
+            "key": self.request_key(job_params),
+            "job_params": job_params,
+            "workflow_steps": {},
+            "matches": None,
+            "postings": {},
+            "result": None,
+            "updated_at": time.time()
+        }
+
+    def load(self, job_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Load the checkpoint for a request, if one exists"""
+        path = self._path(self.request_key(job_params))
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {str(e)}")
+            return None
+
+    def save(self, checkpoint: Dict[str, Any]):
+        """Write a checkpoint atomically so a crash never leaves a half-written file"""
+        checkpoint["updated_at"] = time.time()
+        path = self._path(checkpoint["key"])
+        temp_path = path.with_suffix(f".json.{os.getpid()}.tmp")
+
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(checkpoint, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.error(f"Failed to save checkpoint {path}: {str(e)}")
+
+    def delete(self, job_params: Dict[str, Any]):
+        """Remove a request's checkpoint"""
+        path = self._path(self.request_key(job_params))
+        if path.exists():
+            os.remove(path)
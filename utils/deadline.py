@@ -0,0 +1,93 @@
+"""
+Deadline - End-to-end time budget shared by every step of a job request
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Awaitable, Any
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request runs out of its time budget"""
+
+
+class Deadline:
+    def __init__(self, budget_seconds: Optional[float] = None):
+        self.budget_seconds = budget_seconds
+        self.started_at = time.monotonic()
+        # Only None is unbounded: a zero budget is already used up
+        self.expires_at = self.started_at + budget_seconds if budget_seconds is not None else None
+
+    def remaining(self) -> float:
+        """Seconds left in the budget (infinite when unbounded)"""
+        if self.expires_at is None:
+            return float("inf")
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def timeout(self, default: float) -> float:
+        """A step's own timeout, clipped to the remaining budget"""
+        return min(default, self.remaining())
+
+    def timeout_ms(self, default_ms: int) -> int:
+        """Same as timeout() in milliseconds, for Playwright (never 0, which means no timeout)"""
+        return max(1, int(min(default_ms, self.remaining() * 1000)))
+
+    def check(self, step: str = ""):
+        """Raise DeadlineExceeded if the budget is used up"""
+        if self.expired:
+            raise DeadlineExceeded(f"Request budget of {self.budget_seconds}s exhausted{f' during {step}' if step else ''}")
+
+    async def sleep(self, seconds: float):
+        """Sleep, but never past the deadline"""
+        await asyncio.sleep(max(0.0, self.timeout(seconds)))
+
+    async def run(self, awaitable: Awaitable[Any], step: str = "") -> Any:
+        """Await a step, cancelling it when the budget runs out"""
+        if self.expired and asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        self.check(step)
+        if self.expires_at is None:
+            return await awaitable
+
+        # asyncio.wait rather than wait_for: wait_for can swallow a cancel that races the step finishing
+        task = asyncio.ensure_future(awaitable)
+        try:
+            done, _ = await asyncio.wait({task}, timeout=self.remaining())
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+            
+        if task in done:
+            return task.result()
+            
+        task.cancel()
+        await asyncio.wait({task})
+        raise DeadlineExceeded(f"Request budget of {self.budget_seconds}s exhausted{f' during {step}' if step else ''}")
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("current_deadline", default=None)
+_UNBOUNDED = Deadline()
+
+
+def current_deadline() -> Deadline:
+    """Deadline of the request running in this task (unbounded outside of a request)"""
+    return _current_deadline.get() or _UNBOUNDED
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline):
+    """Make a deadline visible to every agent and tool called within the block"""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
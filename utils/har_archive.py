@@ -0,0 +1,369 @@
+"""
+HAR Archive - Records each request's network traffic to HAR files and replays it offline
+"""
+
+import base64
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from utils.logger import setup_logger
+from utils.politeness import get_politeness_scheduler
+
+logger = setup_logger(__name__)
+
+HAR_MODES = ("record", "replay")
+
+# Traffic outside any request scope (e.g. warm-up) is filed under this key
+UNSCOPED_KEY = "unscoped"
+
+# Headers that describe the original transfer rather than the (already decoded) body we store
+_TRANSFER_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+_TEXT_MIME_PREFIXES = ("text/", "application/json", "application/javascript", "application/xml",
+                       "application/xhtml", "application/ld+json", "image/svg")
+
+_current_key: ContextVar[Optional[str]] = ContextVar("har_key", default=None)
+_archive = None
+
+
+def body_hash(body: Optional[bytes]) -> str:
+    """Short digest telling apart requests to one URL that differ only in their body"""
+    return hashlib.sha256(body).hexdigest()[:16] if body else ""
+
+
+class ReplayMiss(Exception):
+    """Raised in replay mode when a request was never recorded"""
+
+
+class HttpResponse:
+    """The parts of an HTTP response the tools read, live or replayed"""
+
+    def __init__(self, url: str, status: int, headers: Dict[str, str], body: bytes, charset: Optional[str] = None):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.charset = charset or "utf-8"
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.charset, errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+def current_har_key() -> str:
+    """HAR key of the request running in this task"""
+    return _current_key.get() or UNSCOPED_KEY
+
+
+@contextmanager
+def har_scope(key: Optional[str]):
+    """File all traffic made in this block (and tasks started from it) under a request's key"""
+    token = _current_key.set(key)
+    try:
+        yield key
+    finally:
+        _current_key.reset(token)
+
+
+def configure_har_archive(mode: Optional[str], directory: str = "har",
+                          match_any_request: Optional[bool] = None) -> Optional["HarArchive"]:
+    """Set the process-wide archive ("record", "replay" or None to go to the network normally)
+
+    match_any_request (default: ROTIFER_HAR_MATCH_ANY=1) lets replay serve a URL missing from the
+    request's own HAR from any HAR in the directory, which loads all of them into memory.
+    """
+    global _archive
+    if mode and mode not in HAR_MODES:
+        raise ValueError(f"Unknown HAR mode '{mode}' (expected one of: {', '.join(HAR_MODES)})")
+    if match_any_request is None:
+        match_any_request = os.environ.get("ROTIFER_HAR_MATCH_ANY") == "1"
+
+    _archive = HarArchive(mode, directory, match_any_request) if mode else None
+    return _archive
+
+
+def get_har_archive() -> Optional["HarArchive"]:
+    """The process-wide archive, or None when recording/replay is off"""
+    return _archive
+
+
+async def http_request(session, method: str, url: str, **kwargs) -> HttpResponse:
+    """Request through an aiohttp session, recorded or replayed when a HAR archive is active"""
+    archive = get_har_archive()
+    if archive and archive.mode == "replay":
+        return archive.replay_http(method, url)
+
+    scheduler = get_politeness_scheduler()
+    async with scheduler.slot(url):
+        started = time.time()
+        async with session.request(method, url, **kwargs) as response:
+            body = await response.read()
+            result = HttpResponse(str(response.url), response.status, dict(response.headers), body, response.charset)
+    scheduler.note_response(url, result.status, result.headers)
+
+    if archive:
+        archive.record(current_har_key(), method, url, result.status, result.headers, result.body,
+                       started, source="http", final_url=result.url)
+    return result
+
+
+async def http_get(session, url: str, **kwargs) -> HttpResponse:
+    """GET through an aiohttp session, recorded or replayed when a HAR archive is active"""
+    return await http_request(session, "GET", url, **kwargs)
+
+
+class HarArchive:
+    def __init__(self, mode: str, directory: str = "har", match_any_request: bool = False):
+        self.mode = mode
+        self.match_any_request = match_any_request
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._recorded: Dict[str, List[Dict[str, Any]]] = {}
+        self._dirty = set()
+        # Keys whose finished request was written and dropped from memory; later saves append to the file
+        self._released = set()
+        self._page_keys: Dict[int, str] = {}
+
+        # Replay: entries per key, plus every key merged for requests seen under another key
+        self._replay: Dict[str, Dict[Tuple[str, str, str], List[Dict[str, Any]]]] = {}
+        self._replay_all: Optional[Dict[Tuple[str, str, str], List[Dict[str, Any]]]] = None
+        self._served: Dict[Tuple[str, str, str, str], int] = {}
+
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0}
+        logger.info(f"HAR archive in {mode} mode at {self.directory}")
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.har"
+
+    # --- browser side ---
+
+    async def install(self, context, blocked: Optional[Callable[[Any], bool]] = None):
+        """Record or replay every request of a Playwright context
+
+        blocked tells which requests the context's request blocker aborts; they never reach the
+        network while recording, so replay passes them on to the blocker instead of looking them up.
+        """
+        if self.mode == "record":
+            context.on("requestfinished", self._record_browser_request)
+        else:
+            # Registered after request blocking, so replay decides before anything reaches the network
+            await context.route("**/*", lambda route: self._replay_route(route, blocked))
+
+    def bind_page(self, page):
+        """Attribute a page's upcoming traffic to the request running in this task"""
+        if id(page) not in self._page_keys:
+            page.on("close", lambda closed: self._page_keys.pop(id(closed), None))
+        self._page_keys[id(page)] = current_har_key()
+
+    def _key_for_request(self, request) -> str:
+        try:
+            return self._page_keys.get(id(request.frame.page), UNSCOPED_KEY)
+        except Exception:
+            # Service worker requests have no frame
+            return UNSCOPED_KEY
+
+    async def _record_browser_request(self, request):
+        started = time.time()
+        try:
+            response = await request.response()
+            if not response:
+                return
+            headers = await response.all_headers()
+            try:
+                body = await response.body()
+            except Exception:
+                body = b""  # redirects have no body
+
+            timing = request.timing or {}
+            elapsed_ms = max(0.0, timing.get("responseEnd", 0.0))
+            self.record(self._key_for_request(request), request.method, request.url, response.status, headers,
+                        body, started - elapsed_ms / 1000, source="browser", elapsed_ms=elapsed_ms,
+                        status_text=response.status_text)
+        except Exception as e:
+            logger.debug(f"Failed to record {request.url}: {str(e)}")
+
+    async def _replay_route(self, route, blocked: Optional[Callable[[Any], bool]] = None):
+        request = route.request
+        if blocked and blocked(request):
+            await route.fallback()
+            return
+
+        entry = self._lookup(self._key_for_request(request), request.method, request.url)
+        if not entry:
+            await route.abort("internetdisconnected")
+            return
+
+        response = entry["response"]
+        await route.fulfill(
+            status=response["status"],
+            headers={header["name"]: header["value"] for header in response["headers"]
+                     if header["name"].lower() not in _TRANSFER_HEADERS},
+            body=self._entry_body(entry)
+        )
+
+    # --- aiohttp side ---
+
+    def replay_http(self, method: str, url: str, request_body: Optional[bytes] = None) -> HttpResponse:
+        """Serve a recorded aiohttp (or LLM) response"""
+        entry = self._lookup(current_har_key(), method, url, body_hash(request_body))
+        if not entry:
+            raise ReplayMiss(f"No recorded response for {method} {url}")
+
+        response = entry["response"]
+        headers = {header["name"]: header["value"] for header in response["headers"]}
+        return HttpResponse(entry.get("_finalUrl", url), response["status"], headers, self._entry_body(entry))
+
+    # --- recording ---
+
+    def record(self, key: str, method: str, url: str, status: int, headers: Dict[str, str], body: bytes,
+               started: float, source: str, elapsed_ms: Optional[float] = None,
+               status_text: str = "", final_url: Optional[str] = None, request_body: Optional[bytes] = None):
+        """Add one request/response pair to a request's HAR"""
+        if elapsed_ms is None:
+            elapsed_ms = (time.time() - started) * 1000
+
+        mime_type = next((value for name, value in headers.items() if name.lower() == "content-type"), "")
+        content = {"size": len(body), "mimeType": mime_type}
+        try:
+            if not mime_type.lower().startswith(_TEXT_MIME_PREFIXES):
+                raise ValueError("binary body")
+            content["text"] = body.decode("utf-8")
+        except ValueError:
+            # Binary or non-UTF-8 bodies are stored byte for byte
+            content["text"] = base64.b64encode(body).decode("ascii")
+            content["encoding"] = "base64"
+
+        entry = {
+            "startedDateTime": datetime.fromtimestamp(started, timezone.utc).isoformat(),
+            "time": round(elapsed_ms, 1),
+            "request": {
+                "method": method, "url": url, "httpVersion": "HTTP/1.1",
+                "headers": [], "queryString": [], "cookies": [], "headersSize": -1, "bodySize": -1
+            },
+            "response": {
+                "status": status, "statusText": status_text, "httpVersion": "HTTP/1.1",
+                "headers": [{"name": name, "value": value} for name, value in headers.items()],
+                "cookies": [], "content": content,
+                "redirectURL": next((value for name, value in headers.items() if name.lower() == "location"), ""),
+                "headersSize": -1, "bodySize": len(body)
+            },
+            "cache": {},
+            "timings": {"send": 0, "wait": round(elapsed_ms, 1), "receive": 0},
+            "_source": source
+        }
+        if final_url and final_url != url:
+            entry["_finalUrl"] = final_url
+        if request_body:
+            # Replay matches these requests on the body too (e.g. one LLM endpoint, many prompts)
+            entry["request"]["postData"] = {"mimeType": "application/json", "text": request_body.decode("utf-8")}
+            entry["request"]["bodySize"] = len(request_body)
+            entry["_bodyHash"] = body_hash(request_body)
+
+        self._recorded.setdefault(key, []).append(entry)
+        self._dirty.add(key)
+        self.stats["recorded"] += 1
+
+    def save(self, key: str):
+        """Write a request's HAR file atomically"""
+        if key not in self._dirty:
+            return
+
+        path = self._path(key)
+        entries = self._recorded.get(key, [])
+        if key in self._released and path.exists():
+            # Responses that finished after their request was released join what was written then
+            entries = self._load(path) + entries
+        entries = sorted(entries, key=lambda entry: entry["startedDateTime"])
+        har = {"log": {"version": "1.2", "creator": {"name": "rotifer", "version": "1.0"}, "entries": entries}}
+
+        temp_path = path.with_suffix(f".har.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(har, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+            self._dirty.discard(key)
+            logger.info(f"Saved {len(entries)} HAR entries to {path}")
+        except Exception as e:
+            logger.error(f"Failed to save HAR {path}: {str(e)}")
+
+    def save_all(self):
+        """Write every request's HAR that has unsaved entries"""
+        for key in list(self._dirty):
+            self.save(key)
+
+    def finish(self, key: str):
+        """Write a finished request's HAR and drop what was held in memory for it"""
+        if self.mode == "record":
+            self.save(key)
+            if key in self._dirty:
+                return  # keep the entries so save_all can retry
+            if self._recorded.pop(key, None) is not None:
+                self._released.add(key)
+        else:
+            self._replay.pop(key, None)
+            for served_key in [served_key for served_key in self._served if served_key[0] == key]:
+                del self._served[served_key]
+
+    # --- replay lookup ---
+
+    @staticmethod
+    def _index(entries: List[Dict[str, Any]]) -> Dict[Tuple[str, str, str], List[Dict[str, Any]]]:
+        index = {}
+        for entry in entries:
+            request = entry["request"]
+            index.setdefault((request["method"], request["url"], entry.get("_bodyHash", "")), []).append(entry)
+        return index
+
+    def _load(self, path: Path) -> List[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["log"]["entries"]
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable HAR {path}: {str(e)}")
+            return []
+
+    def _lookup(self, key: str, method: str, url: str, request_hash: str = "") -> Optional[Dict[str, Any]]:
+        """Recorded entry for a request; repeats of one URL are served in recorded order"""
+        if key not in self._replay:
+            path = self._path(key)
+            self._replay[key] = self._index(self._load(path)) if path.exists() else {}
+
+        candidates = self._replay[key].get((method, url, request_hash))
+        if not candidates and self.match_any_request:
+            if self._replay_all is None:
+                self._replay_all = self._index([entry for path in sorted(self.directory.glob("*.har"))
+                                                for entry in self._load(path)])
+            candidates = self._replay_all.get((method, url, request_hash))
+
+        if not candidates:
+            self.stats["misses"] += 1
+            logger.warning(f"HAR replay miss: {method} {url}")
+            return None
+
+        served = self._served.get((key, method, url, request_hash), 0)
+        self._served[(key, method, url, request_hash)] = served + 1
+        self.stats["replayed"] += 1
+        return candidates[min(served, len(candidates) - 1)]
+
+    @staticmethod
+    def _entry_body(entry: Dict[str, Any]) -> bytes:
+        content = entry["response"]["content"]
+        text = content.get("text", "")
+        if content.get("encoding") == "base64":
+            return base64.b64decode(text)
+        return text.encode("utf-8")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Recorded, replayed and missed request counts"""
+        return {"mode": self.mode, **self.stats}
@@ -0,0 +1,105 @@
+"""
+Hedging - Start a backup attempt when the primary one runs slower than usual
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def hedge_slots(fan_out: int, share: float = 0.1) -> int:
+    """Extra pooled pages so backups of up to `share` of a fan-out can start without waiting for a primary"""
+    return math.ceil(share * fan_out)
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies"""
+
+    def __init__(self, window: int = 100):
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Latency at percentile p (0-1), or None without samples"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(p * len(ordered)))
+        return ordered[index]
+
+
+class HedgePolicy:
+    def __init__(self, percentile: float = 0.9, window: int = 100, min_samples: int = 5,
+                 initial_delay: float = 8.0, min_delay: float = 1.0):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.latencies = LatencyTracker(window)
+
+        self.stats = {"calls": 0, "hedged": 0, "backup_wins": 0, "primary_failures": 0}
+
+    def hedge_delay(self) -> float:
+        """How long the primary gets before a backup is started"""
+        if len(self.latencies.samples) < self.min_samples:
+            return self.initial_delay
+        return max(self.min_delay, self.latencies.percentile(self.percentile))
+
+    async def run(self, primary: Callable[[], Awaitable[Any]], backup: Callable[[], Awaitable[Any]],
+                  label: str = "") -> Any:
+        """Run primary; start backup if it is slow or fails, return whichever succeeds first"""
+        self.stats["calls"] += 1
+        started = time.monotonic()
+        delay = self.hedge_delay()
+
+        primary_task = asyncio.ensure_future(primary())
+        tasks = [primary_task]
+
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+
+            if not done or primary_task.exception():
+                if done:
+                    self.stats["primary_failures"] += 1
+                    logger.info(f"Primary attempt failed, starting backup{f' for {label}' if label else ''}")
+                else:
+                    logger.info(f"Primary attempt slower than {delay:.1f}s, hedging{f' {label}' if label else ''}")
+                self.stats["hedged"] += 1
+                tasks.append(asyncio.ensure_future(backup()))
+
+            pending = {task for task in tasks if not task.done() or not task.exception()}
+            error = primary_task.exception() if primary_task.done() else None
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception():
+                        error = task.exception()
+                        continue
+                    if task is primary_task:
+                        self.latencies.record(time.monotonic() - started)
+                    else:
+                        self.stats["backup_wins"] += 1
+                    return task.result()
+
+            raise error
+
+        finally:
+            # A primary cut short still tells us it took at least this long
+            if not primary_task.done():
+                self.latencies.record(time.monotonic() - started)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hedging counters and the current hedge delay"""
+        return {**self.stats, "hedge_delay_seconds": round(self.hedge_delay(), 2)}
@@ -0,0 +1,80 @@
+"""
+LLM Client - Shared OpenAI client, created on first use
+"""
+
+import json
+import time
+
+from utils.har_archive import current_har_key, get_har_archive
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Endpoint LLM calls are filed under in HAR archives
+LLM_ENDPOINT = "https://api.openai.com/v1/chat/completions"
+
+_client = None
+
+
+def _openai_client():
+    global _client
+    if _client is None:
+        # Imported here so startup doesn't pay for the openai package until an LLM call is made
+        from openai import AsyncOpenAI
+
+        started = time.monotonic()
+        _client = AsyncOpenAI()
+        logger.info(f"OpenAI client created in {time.monotonic() - started:.2f}s")
+    return _client
+
+
+class _ArchivedCompletions:
+    """chat.completions that records each call into the HAR archive, or answers it from there"""
+
+    def __init__(self, archive):
+        self.archive = archive
+
+    async def create(self, **kwargs):
+        from openai.types.chat import ChatCompletion
+
+        # The timeout doesn't change the answer, so it is left out of what replay matches on
+        request_body = json.dumps({name: value for name, value in kwargs.items() if name != "timeout"},
+                                  sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        if self.archive.mode == "replay":
+            response = self.archive.replay_http("POST", LLM_ENDPOINT, request_body)
+            return ChatCompletion.model_validate_json(response.body)
+
+        started = time.time()
+        completion = await _openai_client().chat.completions.create(**kwargs)
+        self.archive.record(current_har_key(), "POST", LLM_ENDPOINT, 200, {"content-type": "application/json"},
+                            completion.model_dump_json().encode("utf-8"), started, source="llm",
+                            request_body=request_body)
+        return completion
+
+
+class _ArchivedChat:
+    def __init__(self, archive):
+        self.completions = _ArchivedCompletions(archive)
+
+
+class _ArchivedLLMClient:
+    """Stand-in for AsyncOpenAI while a HAR archive is active; replay needs no network or API key"""
+
+    def __init__(self, archive):
+        self.chat = _ArchivedChat(archive)
+
+
+def get_llm_client():
+    """Return the process-wide AsyncOpenAI client, creating it on first call"""
+    archive = get_har_archive()
+    if archive:
+        return _ArchivedLLMClient(archive)
+    return _openai_client()
+
+
+async def close_llm_client():
+    """Close the shared client (its connection pool) if it was ever created"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -0,0 +1,210 @@
+"""
+Politeness - Per-host concurrency and rate limits shared by every fetch in the process
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+from utils.deadline import current_deadline
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Statuses that mean the host wants us to slow down
+THROTTLE_STATUSES = {429, 503}
+
+# Hosts every worker process hits whatever companies it was given: the search engine and the ATS APIs
+SHARED_HOSTS = [
+    "duckduckgo.com",
+    "html.duckduckgo.com",
+    "boards-api.greenhouse.io",
+    "api.lever.co",
+    "api.eu.lever.co",
+    "api.smartrecruiters.com"
+]
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, with bursts of up to `burst`"""
+
+    def __init__(self, rate: Optional[float], burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait for a token; waiters are served in arrival order"""
+        if not self.rate:
+            return
+
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostState:
+    """Limits and counters for one host"""
+
+    def __init__(self, rate: Optional[float], burst: int, max_concurrency: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.slots = asyncio.Semaphore(max(1, max_concurrency))
+        self.blocked_until = 0.0
+        self.queued = 0
+        self.in_flight = 0
+        self.stats = {"requests": 0, "throttled": 0, "peak_queued": 0, "total_wait_seconds": 0.0}
+
+
+class PolitenessScheduler:
+    def __init__(self, rate_per_second: Optional[float] = 2.0, burst: int = 4, max_concurrency: int = 4,
+                 host_limits: Optional[Dict[str, Dict[str, Any]]] = None,
+                 default_backoff: float = 5.0, max_backoff: float = 120.0):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        # Per-host overrides, e.g. {"boards-api.greenhouse.io": {"rate_per_second": 5, "max_concurrency": 8}}
+        self.host_limits = host_limits or {}
+        self.default_backoff = default_backoff
+        self.max_backoff = max_backoff
+        self.hosts: Dict[str, HostState] = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return (urlparse(url).hostname or "").lower()
+
+    def _state(self, host: str) -> HostState:
+        if host not in self.hosts:
+            limits = self.host_limits.get(host, {})
+            self.hosts[host] = HostState(
+                limits.get("rate_per_second", self.rate_per_second),
+                limits.get("burst", self.burst),
+                limits.get("max_concurrency", self.max_concurrency)
+            )
+        return self.hosts[host]
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Hold one of the host's request slots for the duration of a fetch"""
+        state = self._state(self.host_of(url))
+        started = time.monotonic()
+
+        state.queued += 1
+        state.stats["peak_queued"] = max(state.stats["peak_queued"], state.queued)
+        try:
+            await current_deadline().run(self._acquire(state), "waiting for host slot")
+        finally:
+            state.queued -= 1
+
+        state.in_flight += 1
+        state.stats["requests"] += 1
+        state.stats["total_wait_seconds"] += time.monotonic() - started
+        try:
+            yield
+        finally:
+            state.in_flight -= 1
+            state.slots.release()
+
+    async def _acquire(self, state: HostState):
+        await state.slots.acquire()
+        try:
+            # A Retry-After received while we queued still applies
+            while time.monotonic() < state.blocked_until:
+                await asyncio.sleep(state.blocked_until - time.monotonic())
+            await state.bucket.acquire()
+        except BaseException:
+            state.slots.release()
+            raise
+
+    def note_response(self, url: str, status: Optional[int], headers: Optional[Dict[str, str]] = None):
+        """Pause a host that answered 429/503, for as long as its Retry-After asks"""
+        if status not in THROTTLE_STATUSES:
+            return
+
+        host = self.host_of(url)
+        state = self._state(host)
+        delay = self._retry_after(headers or {})
+        if delay is None:
+            delay = self.default_backoff
+        delay = min(delay, self.max_backoff)
+
+        state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+        state.stats["throttled"] += 1
+        logger.warning(f"{host} answered {status}; pausing requests to it for {delay:.1f}s")
+
+    @staticmethod
+    def _retry_after(headers: Dict[str, str]) -> Optional[float]:
+        """Seconds from a Retry-After header (delta-seconds or HTTP date)"""
+        value = next((value for name, value in headers.items() if name.lower() == "retry-after"), None)
+        if not value:
+            return None
+
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth, in-flight requests and throttling per host"""
+        return {
+            host: {
+                "queued": state.queued,
+                "in_flight": state.in_flight,
+                "peak_queued": state.stats["peak_queued"],
+                "requests": state.stats["requests"],
+                "throttled": state.stats["throttled"],
+                "avg_wait_ms": round(state.stats["total_wait_seconds"] * 1000 / state.stats["requests"], 1)
+                if state.stats["requests"] else 0.0,
+                "paused_for_seconds": round(max(0.0, state.blocked_until - time.monotonic()), 1)
+            }
+            for host, state in self.hosts.items()
+        }
+
+
+_scheduler = PolitenessScheduler()
+
+
+def configure_politeness(rate_per_second: Optional[float] = 2.0, max_concurrency: int = 4,
+                         **kwargs) -> PolitenessScheduler:
+    """Replace the process-wide scheduler (rate_per_second=None removes the rate limit)"""
+    global _scheduler
+    _scheduler = PolitenessScheduler(rate_per_second, max_concurrency=max_concurrency, **kwargs)
+    return _scheduler
+
+
+def split_shared_host_limits(rate_per_second: Optional[float], max_concurrency: int, processes: int,
+                             burst: int = 4) -> Dict[str, Dict[str, Any]]:
+    """host_limits giving each of `processes` workers an equal share of the shared hosts' budgets
+
+    Other hosts (company career sites) are only ever visited by one worker, so they keep the full limits.
+    """
+    processes = max(1, processes)
+    return {
+        host: {
+            "rate_per_second": rate_per_second / processes if rate_per_second else rate_per_second,
+            "burst": max(1, burst // processes),
+            "max_concurrency": max(1, max_concurrency // processes)
+        }
+        for host in SHARED_HOSTS
+    }
+
+
+def get_politeness_scheduler() -> PolitenessScheduler:
+    """The process-wide scheduler every fetch goes through"""
+    return _scheduler
@@ -0,0 +1,146 @@
+"""
+Search Template Store - Per-domain job search URL patterns learned from successful on-site searches
+"""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse, urlunparse, quote, quote_plus, unquote, unquote_plus
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Stands in for the search terms inside a stored template
+QUERY_PLACEHOLDER = "{query}"
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _slugify(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def _encode(job_title: str, encoding: str) -> str:
+    if encoding == "slug":
+        return _slugify(job_title)
+    if encoding == "percent":
+        return quote(job_title, safe="")
+    return quote_plus(job_title)
+
+
+def derive_template(search_url: str, job_title: str, start_url: Optional[str] = None) -> Optional[Dict[str, str]]:
+    """Turn a results URL into {"template", "encoding"} by locating the search terms in it
+
+    Parts already in start_url (the page the search started from) are fixed, e.g. the "jobs"
+    of /jobs/... when the title searched for was "jobs".
+    """
+    parsed = urlparse(search_url)
+    title = _normalize(job_title)
+    if not title:
+        return None
+
+    start = urlparse(start_url or "")
+    start_pairs = set(pair for pair in start.query.split("&") if pair)
+    start_segments = start.path.split("/")
+
+    # Query parameter holding the terms, e.g. /search-results?keywords=consultor%20sap%20fi
+    raw_pairs = [pair for pair in parsed.query.split("&") if pair]
+    for index, pair in enumerate(raw_pairs):
+        name, _, raw_value = pair.partition("=")
+        if pair in start_pairs:
+            continue
+        if _normalize(unquote_plus(raw_value)) == title:
+            encoding = "plus" if "+" in raw_value else "percent"
+            raw_pairs[index] = f"{name}={QUERY_PLACEHOLDER}"
+            query = "&".join(raw_pairs)
+            return {"template": urlunparse(parsed._replace(query=query, fragment="")), "encoding": encoding}
+
+    # Path segment holding the terms, e.g. /jobs/search/consultor-sap-fi
+    segments = parsed.path.split("/")
+    for index, segment in enumerate(segments):
+        if not segment or (index < len(start_segments) and start_segments[index] == segment):
+            continue
+        if _normalize(unquote(segment)) == title:
+            encoding = "percent"
+        elif segment.lower() == _slugify(job_title):
+            encoding = "slug"
+        else:
+            continue
+        segments[index] = QUERY_PLACEHOLDER
+        return {"template": urlunparse(parsed._replace(path="/".join(segments), fragment="")), "encoding": encoding}
+
+    return None
+
+
+class SearchTemplateStore:
+    def __init__(self, path: str = "search_templates.json"):
+        self.path = Path(path)
+        self._templates: Dict[str, Dict[str, Any]] = self._read()
+        self.stats = {"learned": 0, "used": 0, "forgotten": 0}
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable search templates {self.path}: {str(e)}")
+            return {}
+
+    def _write(self, domain: str, entry: Optional[Dict[str, Any]]):
+        """Update one domain on disk, keeping what other processes wrote meanwhile"""
+        templates = self._read()
+        if entry is None:
+            templates.pop(domain, None)
+        else:
+            templates[domain] = entry
+        self._templates = templates
+
+        temp_path = self.path.with_suffix(f".json.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(templates, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            logger.error(f"Failed to save search templates {self.path}: {str(e)}")
+
+    def build_url(self, domain: str, job_title: str) -> Optional[str]:
+        """Results URL for a job title on a domain whose search was learned before, or None"""
+        entry = self._templates.get(domain)
+        if not entry:
+            return None
+        self.stats["used"] += 1
+        return entry["template"].replace(QUERY_PLACEHOLDER, _encode(job_title, entry["encoding"]))
+
+    def learn(self, domain: str, search_url: str, job_title: str, start_url: Optional[str] = None) -> bool:
+        """Remember the URL pattern of a search that worked; False if the terms are not in the URL"""
+        derived = derive_template(search_url, job_title, start_url)
+        if not derived:
+            return False
+
+        entry = self._templates.get(domain)
+        if entry and entry["template"] == derived["template"]:
+            return True
+
+        self._write(domain, {**derived, "example": search_url, "learned_at": time.time()})
+        self.stats["learned"] += 1
+        logger.info(f"Learned search URL template for {domain}: {derived['template']}")
+        return True
+
+    def forget(self, domain: str):
+        """Drop a domain's template after it stopped working"""
+        if domain in self._templates:
+            self._write(domain, None)
+            self.stats["forgotten"] += 1
+            logger.info(f"Forgot search URL template for {domain}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Templates known, learned, used and forgotten"""
+        return {"templates": len(self._templates), **self.stats}
@@ -0,0 +1,75 @@
+"""
+Storage State Store - Per-domain browser cookies, localStorage and consent results kept across runs
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def url_domain(url: str) -> str:
+    """Hostname of a URL without a leading www."""
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _matches_domain(host: str, domain: str) -> bool:
+    host = host.lstrip(".").lower()
+    return host == domain or host.endswith(f".{domain}") or domain.endswith(f".{host}")
+
+
+class StorageStateStore:
+    def __init__(self, directory: str = "browser_state"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._cache: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def _path(self, domain: str) -> Path:
+        return self.directory / f"{domain}.json"
+
+    def load(self, domain: str) -> Optional[Dict[str, Any]]:
+        """Saved state for a domain: {"cookies", "origins", "consent"}, or None"""
+        if domain in self._cache:
+            return self._cache[domain]
+
+        state = None
+        path = self._path(domain)
+        if path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable browser state {path}: {str(e)}")
+
+        self._cache[domain] = state
+        return state
+
+    def save(self, domain: str, storage_state: Dict[str, Any], consent: Optional[Dict[str, Any]] = None):
+        """Keep the cookies and localStorage of a context that belong to a domain"""
+        previous = self.load(domain) or {}
+        state = {
+            "domain": domain,
+            "cookies": [cookie for cookie in storage_state.get("cookies", [])
+                        if _matches_domain(cookie.get("domain", ""), domain)],
+            "origins": [origin for origin in storage_state.get("origins", [])
+                        if _matches_domain(urlparse(origin.get("origin", "")).hostname or "", domain)],
+            "consent": consent if consent is not None else previous.get("consent"),
+            "updated_at": time.time()
+        }
+
+        path = self._path(domain)
+        temp_path = path.with_suffix(f".json.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+            self._cache[domain] = state
+        except Exception as e:
+            logger.error(f"Failed to save browser state {path}: {str(e)}")